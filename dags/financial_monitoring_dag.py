@@ -5,54 +5,117 @@ Monitors Bosch company stock data using yfinance
 
 from datetime import datetime, timedelta
 from airflow import DAG
-from airflow.operators.python import PythonOperator
+from airflow.decorators import task
+from airflow.operators.empty import EmptyOperator
 from airflow.operators.bash import BashOperator
 from airflow.sensors.filesystem import FileSensor
-from airflow.models import Variable
+from airflow.utils.task_group import TaskGroup
+from airflow.utils.module_loading import import_string
 import os
 import sys
+import json
+
+# Project directory; the scripts resolve logs/, expectations/ and validations/ against it
+DAGS_DIR = '/usr/local/airflow/dags'
 
 # Add scripts directory to path
-sys.path.append('/usr/local/airflow/dags/scripts')
+sys.path.append(os.path.join(DAGS_DIR, 'scripts'))
+
+# Symbols analyzed in parallel, one mapped task instance per symbol
+BOSCH_SYMBOLS = ['BOSCHLTD.BSE', 'BOSCHLTD.NSE', 'BOSCHLTD.NS', 'BOSCHLTD.BO']
+
+# Pools (see config/pools.json): a small one throttling yfinance requests and
+# a wide one for local post-processing, so neither starves the other
+YFINANCE_POOL = 'yfinance_pool'
+CPU_POOL = 'cpu_pool'
+
+# Monitor class, imported on first use so DAG parsing stays cheap
+_MONITOR_CLASS = None
+
+def _monitor_class():
+    """Import BoschStockMonitor once per worker process"""
+    global _MONITOR_CLASS
+    if _MONITOR_CLASS is None:
+        _MONITOR_CLASS = import_string('financial_data_monitor.BoschStockMonitor')
+    return _MONITOR_CLASS
+
+def warmup_kernels():
+    """Compile the indicator kernels ahead of the analysis tasks"""
+    _monitor_class().warmup()
+    return "Indicator kernels warmed up"
 
-def run_bosch_stock_analysis():
-    """Run Bosch stock analysis"""
-    from financial_data_monitor import BoschStockMonitor
+def fetch_and_analyze_symbol(symbol: str):
+    """Fetch and analyze a single Bosch symbol"""
+    monitor = _monitor_class()()
+    result = monitor.analyze_symbol(symbol)
     
-    monitor = BoschStockMonitor()
-    results = monitor.run_complete_analysis()
+    # Normalize numpy/pandas scalars so the result is XCom-serializable
+    return {
+        'symbol': symbol,
+        'result': json.loads(json.dumps(result, default=str)) if result else None
+    }
+
+def merge_analysis_results(symbol_analyses):
+    """Merge the per-symbol analyses into the combined results"""
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'symbols_analyzed': [],
+        'analysis_results': {},
+        'overall_summary': {}
+    }
     
-    # Store results in Airflow Variable for other tasks
-    Variable.set("bosch_analysis_results", results, serialize_json=True)
+    for symbol_analysis in symbol_analyses or []:
+        if not symbol_analysis or not symbol_analysis.get('result'):
+            continue
+        results['symbols_analyzed'].append(symbol_analysis['symbol'])
+        results['analysis_results'][symbol_analysis['symbol']] = symbol_analysis['result']
     
-    return results
-
-def check_financial_alerts():
-    """Check for financial alerts and send notifications"""
-    from financial_data_monitor import BoschStockMonitor
-    from send_alerts import AlertManager, Alert, AlertType, AlertSeverity
+    monitor = _monitor_class()()
     
-    # Get analysis results
-    results = Variable.get("bosch_analysis_results", deserialize_json=True)
+    # Only the path of the persisted results goes through XCom
+    return monitor.finalize_results(results)['results_path']
+
+def load_analysis_results(results_path):
+    """Load the combined results persisted by analyze_bosch_stocks"""
+    if not results_path or not os.path.exists(results_path):
+        return None
     
+    with open(results_path) as f:
+        return json.load(f)
+
+def check_financial_alerts(results_path):
+    """Check for financial alerts and send notifications"""
+    results = load_analysis_results(results_path)
     if not results or 'analysis_results' not in results:
         return "No analysis results available"
     
+    # Only symbols that raised alerts need any work
+    symbol_alerts = {
+        symbol: analysis.get('anomalies', {}).get('alerts', [])
+        for symbol, analysis in results['analysis_results'].items()
+    }
+    symbol_alerts = {symbol: alerts for symbol, alerts in symbol_alerts.items() if alerts}
+    if not symbol_alerts:
+        return "No financial alerts raised"
+    
+    from send_alerts import AlertManager, Alert, AlertType, AlertSeverity
+    
     alert_manager = AlertManager()
-    alerts_sent = 0
+    alerts_to_send = []
     
-    # Check each symbol for alerts
-    for symbol, analysis in results['analysis_results'].items():
-        anomalies = analysis.get('anomalies', {})
-        
-        for alert_data in anomalies.get('alerts', []):
+    # All alerts of one check share the same timestamp
+    now = datetime.now()
+    
+    # Create alerts for each symbol
+    for symbol, symbol_alert_data in symbol_alerts.items():
+        for alert_data in symbol_alert_data:
             # Create alert
             alert = Alert(
                 type=AlertType.DATA_QUALITY,  # Using data quality type for financial alerts
                 severity=AlertSeverity.HIGH if alert_data['severity'] == 'high' else AlertSeverity.MEDIUM,
                 title=f"Bosch Stock Alert - {symbol}",
                 message=alert_data['message'],
-                timestamp=datetime.now(),
+                timestamp=now,
                 metadata={
                     'symbol': symbol,
                     'alert_type': alert_data['type'],
@@ -60,22 +123,19 @@ def check_financial_alerts():
                     'threshold': alert_data['threshold']
                 }
             )
-            
-            # Send alert
-            alert_results = alert_manager.send_alert(alert)
-            if any(alert_results.values()):
-                alerts_sent += 1
+            alerts_to_send.append(alert)
+    
+    # Send all alerts in one batch, one notification per channel
+    alert_results = alert_manager.send_alerts(alerts_to_send)
+    alerts_sent = sum(1 for channel_results in alert_results if any(channel_results.values()))
     
     return f"Sent {alerts_sent} financial alerts"
 
-def generate_financial_report():
+def generate_financial_report(results_path):
     """Generate comprehensive financial report"""
-    from financial_data_monitor import BoschStockMonitor
     from generate_quality_report import QualityReportGenerator
     
-    # Get analysis results
-    results = Variable.get("bosch_analysis_results", deserialize_json=True)
-    
+    results = load_analysis_results(results_path)
     if not results:
         return "No analysis results available for report generation"
     
@@ -94,6 +154,20 @@ def generate_financial_report():
     
     return f"Financial report generated: {report_path}"
 
+def run_data_quality_check():
+    """Run the data quality checks inside the worker process"""
+    # The checks module uses paths relative to the project directory, as the
+    # former `cd /usr/local/airflow/dags && python ...` command did
+    cwd = os.getcwd()
+    os.chdir(DAGS_DIR)
+    try:
+        from data_quality_checks import run_quality_checks
+        
+        results = run_quality_checks()
+    finally:
+        os.chdir(cwd)
+    return f"Data quality checks {results['overall_status']}"
+
 # DAG configuration
 default_args = {
     'owner': 'data_team',
@@ -101,9 +175,11 @@ default_args = {
     'start_date': datetime(2024, 1, 1),
     'email_on_failure': True,
     'email_on_retry': False,
-    'retries': 2,
-    'retry_delay': timedelta(minutes=5),
-    'catchup': False
+    # Retry transient Yahoo errors quickly: delay roughly doubles from 30s, capped at 5 minutes
+    'retries': 3,
+    'retry_delay': timedelta(seconds=30),
+    'retry_exponential_backoff': True,
+    'max_retry_delay': timedelta(minutes=5)
 }
 
 dag = DAG(
@@ -111,19 +187,37 @@ dag = DAG(
     default_args=default_args,
     description='Monitor Bosch company stock data',
     schedule_interval='0 9,15 * * 1-5',  # Run at 9 AM and 3 PM on weekdays
+    catchup=False,  # Never backfill missed intervals after downtime
     max_active_runs=1,
+    max_active_tasks=16,
     tags=['financial', 'monitoring', 'bosch', 'yfinance']
 )
 
-# Task 1: Run Bosch stock analysis
-analyze_bosch_stocks = PythonOperator(
-    task_id='analyze_bosch_stocks',
-    python_callable=run_bosch_stock_analysis,
+# Task 0: Populate the Numba cache before the analysis runs
+warmup = task(
+    warmup_kernels,
+    task_id='warmup_kernels',
+    pool=CPU_POOL,
     dag=dag,
     doc_md="""
-    ## Analyze Bosch Stocks
+    ## Warm Up Kernels
     
-    This task fetches and analyzes Bosch company stock data from multiple exchanges:
+    This task imports the stock monitor, compiling its Numba indicator kernels
+    and writing them to the persistent `NUMBA_CACHE_DIR` so the analysis tasks
+    load compiled code instead of paying the JIT cost on the critical path.
+    """
+)()
+
+# Task 1: Run Bosch stock analysis, fanned out per symbol
+analyze_symbol = task(
+    fetch_and_analyze_symbol,
+    task_id='analyze_symbol',
+    pool=YFINANCE_POOL,
+    dag=dag,
+    doc_md="""
+    ## Analyze Symbol
+    
+    This mapped task fetches and analyzes one Bosch symbol per task instance:
     - BOSCHLTD.BSE (Bombay Stock Exchange)
     - BOSCHLTD.NSE (National Stock Exchange)
     
@@ -132,13 +226,38 @@ analyze_bosch_stocks = PythonOperator(
     - Company information
     - Anomaly detection
     - Risk assessment
+    
+    Instances run concurrently, throttled by the `yfinance_pool` pool.
+    """
+).expand(symbol=BOSCH_SYMBOLS)
+
+analyze_bosch_stocks = task(
+    merge_analysis_results,
+    task_id='analyze_bosch_stocks',
+    dag=dag,
+    doc_md="""
+    ## Merge Bosch Stock Analysis
+    
+    This task merges the per-symbol analyses into the combined results
+    and generates the overall summary across all exchanges. The results
+    are written to `data/financial` and only their path is pushed to XCom.
     """
+)(analyze_symbol)
+
+# Post-processing tasks load the merged results from the path in XCom
+postprocess = TaskGroup(
+    group_id='postprocess',
+    prefix_group_id=False,
+    tooltip='Alerting, reporting and data quality on the merged analysis',
+    dag=dag
 )
 
 # Task 2: Check for alerts
-check_alerts = PythonOperator(
+check_alerts = task(
+    check_financial_alerts,
     task_id='check_financial_alerts',
-    python_callable=check_financial_alerts,
+    pool=CPU_POOL,
+    task_group=postprocess,
     dag=dag,
     doc_md="""
     ## Check Financial Alerts
@@ -150,13 +269,16 @@ check_alerts = PythonOperator(
     - High volatility alerts
     
     Alerts are sent via email, Slack, Teams, and PagerDuty based on severity.
+    When no alerts are raised the task returns before building any alerts.
     """
-)
+)(analyze_bosch_stocks)
 
 # Task 3: Generate financial report
-generate_report = PythonOperator(
+generate_report = task(
+    generate_financial_report,
     task_id='generate_financial_report',
-    python_callable=generate_financial_report,
+    pool=CPU_POOL,
+    task_group=postprocess,
     dag=dag,
     doc_md="""
     ## Generate Financial Report
@@ -168,15 +290,14 @@ generate_report = PythonOperator(
     - Trading recommendations
     - Interactive charts
     """
-)
+)(analyze_bosch_stocks)
 
 # Task 4: Data quality checks
-data_quality_check = BashOperator(
+data_quality_check = task(
+    run_data_quality_check,
     task_id='data_quality_check',
-    bash_command="""
-    cd /usr/local/airflow/dags
-    python scripts/data_quality_checks.py
-    """,
+    pool=CPU_POOL,
+    task_group=postprocess,
     dag=dag,
     doc_md="""
     ## Data Quality Check
@@ -187,15 +308,22 @@ data_quality_check = BashOperator(
     - Data accuracy
     - Anomaly detection
     """
-)
+)()
 
 # Task 5: Archive old data
 archive_old_data = BashOperator(
     task_id='archive_old_data',
     bash_command="""
     cd /usr/local/airflow/dags/data/financial
-    find . -name "*.csv" -mtime +30 -exec gzip {} \;
-    find . -name "*.json" -mtime +30 -exec gzip {} \;
+    if command -v pigz >/dev/null 2>&1; then
+        COMPRESS="pigz --best"; BATCH=16
+    else
+        COMPRESS="gzip"; BATCH=1
+    fi
+    for ext in csv json; do
+        find . -name "*.$ext" -mtime +30 -size +4k -print0
+    done |
+        xargs -0 -r -P "$(nproc)" -n "$BATCH" $COMPRESS
     """,
     dag=dag,
     doc_md="""
@@ -204,19 +332,22 @@ archive_old_data = BashOperator(
     This task archives old financial data files to save storage space:
     - Compresses CSV files older than 30 days
     - Compresses JSON files older than 30 days
+    - Skips files under 4 KB where compression does not pay off
+    - Compresses in parallel across all cores (pigz when available)
     - Maintains data for historical analysis
     """
 )
 
 # Task 6: Update data catalog
-update_data_catalog = PythonOperator(
+# Join point only: an EmptyOperator never occupies a worker slot
+update_data_catalog = EmptyOperator(
     task_id='update_data_catalog',
-    python_callable=lambda: "Data catalog updated with latest financial data",
     dag=dag,
     doc_md="""
     ## Update Data Catalog
     
-    This task updates the data catalog with metadata about the latest financial data:
+    Marks the point where the report and data quality checks have finished and
+    the latest financial data is ready to be cataloged with:
     - Data lineage information
     - Data quality metrics
     - Schema information
@@ -224,9 +355,8 @@ update_data_catalog = PythonOperator(
     """
 )
 
-# Task dependencies
-analyze_bosch_stocks >> check_alerts
-analyze_bosch_stocks >> generate_report
+# Task dependencies (XCom arguments already wire analysis -> alerts/report)
+warmup >> analyze_symbol
 analyze_bosch_stocks >> data_quality_check
 generate_report >> update_data_catalog
 data_quality_check >> update_data_catalog
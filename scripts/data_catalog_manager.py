@@ -5,17 +5,29 @@ Manages data catalog, metadata, and governance information
 """
 
 import os
+import io
 import sys
+import csv
 import json
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Set
-import pandas as pd
+from typing import Dict, Any, List, NamedTuple, Optional, Set, Union
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import yaml
 import sqlite3
+import zipfile
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from math import fsum
+from collections import OrderedDict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +40,177 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Bounds of the in-memory asset and search result caches
+ASSET_CACHE_SIZE = 4096
+SEARCH_CACHE_SIZE = 256
+
+# Rows formatted per export chunk, and chunks buffered per table ahead of the writer
+EXPORT_CHUNK_ROWS = 10000
+EXPORT_QUEUE_CHUNKS = 4
+
+# Statements are module constants so each SQL text is parsed once and then
+# served from the connection's statement cache
+
+# Insert statements shared by the single-row and bulk catalog writers
+# Assets and users are upserted in place: REPLACE would delete the old row first, which
+# foreign keys from access records and metrics forbid
+_SQL_INSERT_ASSET = '''
+    INSERT INTO data_assets (
+        id, name, description, schema_name, table_name, classification,
+        owner, steward, created_at, updated_at, last_accessed,
+        quality_level, quality_score, columns, tags, business_glossary,
+        usage_statistics, lineage, compliance_info, metadata
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (id) DO UPDATE SET
+        name = excluded.name,
+        description = excluded.description,
+        schema_name = excluded.schema_name,
+        table_name = excluded.table_name,
+        classification = excluded.classification,
+        owner = excluded.owner,
+        steward = excluded.steward,
+        created_at = excluded.created_at,
+        updated_at = excluded.updated_at,
+        last_accessed = excluded.last_accessed,
+        quality_level = excluded.quality_level,
+        quality_score = excluded.quality_score,
+        columns = excluded.columns,
+        tags = excluded.tags,
+        business_glossary = excluded.business_glossary,
+        usage_statistics = excluded.usage_statistics,
+        lineage = excluded.lineage,
+        compliance_info = excluded.compliance_info,
+        metadata = excluded.metadata
+'''
+
+_SQL_INSERT_USER = '''
+    INSERT INTO data_users (
+        id, name, email, role, department, access_level,
+        created_at, last_login, permissions, metadata
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (id) DO UPDATE SET
+        name = excluded.name,
+        email = excluded.email,
+        role = excluded.role,
+        department = excluded.department,
+        access_level = excluded.access_level,
+        created_at = excluded.created_at,
+        last_login = excluded.last_login,
+        permissions = excluded.permissions,
+        metadata = excluded.metadata
+'''
+
+_SQL_INSERT_ACCESS = '''
+    INSERT OR REPLACE INTO data_access (
+        id, user_id, asset_id, access_type, granted_at,
+        expires_at, granted_by, purpose, metadata
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Per-connection settings: WAL lets readers run alongside the writer, and SQLite only
+# enforces the schema's foreign keys on connections that switch them on
+_SQL_CONNECTION_PRAGMAS = '''
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA foreign_keys=ON;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-64000;
+'''
+
+# Column projections: every field for a DataAsset, the listing fields for an AssetSummary
+_ASSET_COLS_FULL = '''
+    id, name, description, schema_name, table_name, classification,
+    owner, steward, created_at, updated_at, last_accessed,
+    quality_level, quality_score, columns, tags, business_glossary,
+    usage_statistics, lineage, compliance_info, metadata
+'''
+_ASSET_COLS_LIGHT = 'id, name, classification, quality_level, owner'
+
+_SQL_SELECT_ASSET = f'SELECT {_ASSET_COLS_FULL} FROM data_assets WHERE id = ?'
+
+# Metrics missing from the latest report; the reported names arrive as one JSON array
+_SQL_DELETE_STALE_METRICS = '''
+    DELETE FROM data_quality_metrics
+    WHERE asset_id = ? AND metric_name NOT IN (SELECT value FROM json_each(?))
+'''
+
+_SQL_UPSERT_METRIC = '''
+    INSERT INTO data_quality_metrics (
+        asset_id, metric_name, metric_value, threshold,
+        status, measured_at, metadata
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (asset_id, metric_name) DO UPDATE SET
+        metric_value = excluded.metric_value,
+        threshold = excluded.threshold,
+        status = excluded.status,
+        measured_at = excluded.measured_at,
+        metadata = excluded.metadata
+'''
+
+_SQL_UPDATE_ASSET_QUALITY = '''
+    UPDATE data_assets
+    SET quality_score = ?, quality_level = ?, updated_at = ?
+    WHERE id = ?
+'''
+
+# Every catalog report statistic in one row; groupings come back as JSON objects
+# built by SQLite (NULL keys are labelled 'null', as json.dump would write them)
+_SQL_CATALOG_REPORT = '''
+    SELECT
+        (SELECT COUNT(*) FROM data_assets),
+        (SELECT COUNT(*) FROM data_users),
+        (SELECT COUNT(*) FROM data_access),
+        (SELECT AVG(metric_value) FROM data_quality_metrics),
+        (SELECT json_group_object(IFNULL(classification, 'null'), c) FROM (
+            SELECT classification, COUNT(*) AS c FROM data_assets GROUP BY classification
+        )),
+        (SELECT json_group_object(IFNULL(quality_level, 'null'), c) FROM (
+            SELECT quality_level, COUNT(*) AS c FROM data_assets GROUP BY quality_level
+        )),
+        (SELECT json_group_object(IFNULL(role, 'null'), c) FROM (
+            SELECT role, COUNT(*) AS c FROM data_users GROUP BY role
+        )),
+        (SELECT json_group_object(IFNULL(access_type, 'null'), c) FROM (
+            SELECT access_type, COUNT(*) AS c FROM data_access GROUP BY access_type
+        ))
+'''
+
+def _to_epoch_us(value: datetime) -> int:
+    """Convert a datetime to integer microseconds since the epoch for storage"""
+    return round(value.timestamp() * 1_000_000)
+
+def _from_epoch_us(value) -> Optional[datetime]:
+    """Convert stored epoch microseconds (or a legacy ISO string) to a datetime"""
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, str) and not value.lstrip('-').isdigit():
+        return datetime.fromisoformat(value)
+    
+    micros = int(value)
+    return datetime.fromtimestamp(micros // 1_000_000) + timedelta(microseconds=micros % 1_000_000)
+
+def _json_default(value):
+    """Serialize converted timestamps as ISO strings in exports"""
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+if orjson is not None:
+    def _dumps(value) -> str:
+        """Serialize a value to compact JSON text with orjson"""
+        return orjson.dumps(value, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    _loads = orjson.loads
+else:
+    def _dumps(value) -> str:
+        """Serialize a value to compact JSON text"""
+        return json.dumps(value, default=_json_default, separators=(',', ':'))
+    
+    _loads = json.loads
+
+# Timestamps are stored as INTEGER microseconds in TIMESTAMP_US columns; rows carried
+# over from older catalogs may still hold ISO text
+sqlite3.register_converter('TIMESTAMP_US', lambda raw: _from_epoch_us(raw.decode()))
+
 class DataClassification(Enum):
     """Data classification levels"""
     PUBLIC = "public"
@@ -45,6 +228,15 @@ class DataQualityLevel(Enum):
 @dataclass
 class DataAsset:
     """Represents a data asset in the catalog"""
+    # Slots instead of a per-instance __dict__ (dataclass(slots=True) needs Python 3.10);
+    # _raw_json holds JSON columns the catalog has not parsed yet
+    __slots__ = (
+        'id', 'name', 'description', 'schema', 'table', 'classification', 'owner',
+        'steward', 'created_at', 'updated_at', 'last_accessed', 'quality_level',
+        'quality_score', 'columns', 'tags', 'business_glossary', 'usage_statistics',
+        'lineage', 'compliance_info', 'metadata', '_raw_json'
+    )
+    
     id: str
     name: str
     description: str
@@ -65,10 +257,26 @@ class DataAsset:
     lineage: Dict[str, Any]
     compliance_info: Dict[str, Any]
     metadata: Dict[str, Any]
+    
+    def __getattr__(self, name):
+        """Parse a JSON column deferred by the catalog on first access"""
+        raw_json = getattr(self, '_raw_json', None) if name != '_raw_json' else None
+        if not raw_json or name not in raw_json:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        
+        raw, default = raw_json[name]
+        value = _loads(raw) if raw else default()
+        setattr(self, name, value)
+        return value
 
 @dataclass
 class DataUser:
     """Represents a data user"""
+    __slots__ = (
+        'id', 'name', 'email', 'role', 'department', 'access_level',
+        'created_at', 'last_login', 'permissions', 'metadata'
+    )
+    
     id: str
     name: str
     email: str
@@ -83,6 +291,11 @@ class DataUser:
 @dataclass
 class DataAccess:
     """Represents data access record"""
+    __slots__ = (
+        'id', 'user_id', 'asset_id', 'access_type', 'granted_at',
+        'expires_at', 'granted_by', 'purpose', 'metadata'
+    )
+    
     id: str
     user_id: str
     asset_id: str
@@ -93,6 +306,14 @@ class DataAccess:
     purpose: str
     metadata: Dict[str, Any]
 
+class AssetSummary(NamedTuple):
+    """Lightweight view of a data asset returned by catalog searches"""
+    id: str
+    name: str
+    classification: DataClassification
+    quality_level: DataQualityLevel
+    owner: str
+
 class DataCatalogManager:
     """Comprehensive data catalog management system"""
     
@@ -101,6 +322,15 @@ class DataCatalogManager:
         self.catalog_dir = os.path.dirname(catalog_db_path)
         os.makedirs(self.catalog_dir, exist_ok=True)
         
+        # One long-lived connection shared by all methods; the lock serializes
+        # access so a write transaction never interleaves with another call
+        self._conn = sqlite3.connect(
+            catalog_db_path, check_same_thread=False, detect_types=sqlite3.PARSE_DECLTYPES,
+            cached_statements=256
+        )
+        self._conn.executescript(_SQL_CONNECTION_PRAGMAS)
+        self._lock = threading.RLock()
+        
         # Initialize database
         self._init_database()
         
@@ -110,8 +340,7 @@ class DataCatalogManager:
     def _init_database(self):
         """Initialize SQLite database for catalog"""
         try:
-            conn = sqlite3.connect(self.catalog_db_path)
-            cursor = conn.cursor()
+            cursor = self._conn.cursor()
             
             # Create tables
             cursor.execute('''
@@ -124,9 +353,9 @@ class DataCatalogManager:
                     classification TEXT,
                     owner TEXT,
                     steward TEXT,
-                    created_at TEXT,
-                    updated_at TEXT,
-                    last_accessed TEXT,
+                    created_at TIMESTAMP_US,
+                    updated_at TIMESTAMP_US,
+                    last_accessed TIMESTAMP_US,
                     quality_level TEXT,
                     quality_score REAL,
                     columns TEXT,
@@ -147,8 +376,8 @@ class DataCatalogManager:
                     role TEXT,
                     department TEXT,
                     access_level TEXT,
-                    created_at TEXT,
-                    last_login TEXT,
+                    created_at TIMESTAMP_US,
+                    last_login TIMESTAMP_US,
                     permissions TEXT,
                     metadata TEXT
                 )
@@ -160,8 +389,8 @@ class DataCatalogManager:
                     user_id TEXT,
                     asset_id TEXT,
                     access_type TEXT,
-                    granted_at TEXT,
-                    expires_at TEXT,
+                    granted_at TIMESTAMP_US,
+                    expires_at TIMESTAMP_US,
                     granted_by TEXT,
                     purpose TEXT,
                     metadata TEXT,
@@ -170,20 +399,36 @@ class DataCatalogManager:
                 )
             ''')
             
+            # Older catalogs keyed metrics by a synthetic id; move them aside to re-key below
+            cursor.execute("SELECT 1 FROM pragma_table_info('data_quality_metrics') WHERE name = 'id'")
+            legacy_metrics = cursor.fetchone() is not None
+            if legacy_metrics:
+                cursor.execute('ALTER TABLE data_quality_metrics RENAME TO data_quality_metrics_legacy')
+            
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS data_quality_metrics (
-                    id TEXT PRIMARY KEY,
                     asset_id TEXT,
                     metric_name TEXT,
                     metric_value REAL,
                     threshold REAL,
                     status TEXT,
-                    measured_at TEXT,
+                    measured_at TIMESTAMP_US,
                     metadata TEXT,
+                    PRIMARY KEY (asset_id, metric_name),
                     FOREIGN KEY (asset_id) REFERENCES data_assets (id)
                 )
             ''')
             
+            if legacy_metrics:
+                cursor.execute('''
+                    INSERT OR REPLACE INTO data_quality_metrics
+                    SELECT asset_id, metric_name, metric_value, threshold, status, measured_at, metadata
+                    FROM data_quality_metrics_legacy
+                    WHERE asset_id IN (SELECT id FROM data_assets)
+                    ORDER BY measured_at
+                ''')
+                cursor.execute('DROP TABLE data_quality_metrics_legacy')
+            
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS data_lineage (
                     id TEXT PRIMARY KEY,
@@ -191,15 +436,26 @@ class DataCatalogManager:
                     target_asset_id TEXT,
                     transformation_type TEXT,
                     transformation_logic TEXT,
-                    created_at TEXT,
+                    created_at TIMESTAMP_US,
                     metadata TEXT,
                     FOREIGN KEY (source_asset_id) REFERENCES data_assets (id),
                     FOREIGN KEY (target_asset_id) REFERENCES data_assets (id)
                 )
             ''')
             
-            conn.commit()
-            conn.close()
+            # Indexes for search filters, report grouping and access lookups
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_assets_classification ON data_assets (classification)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_assets_owner ON data_assets (owner)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_assets_quality ON data_assets (quality_level)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_role ON data_users (role)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_access_user ON data_access (user_id)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_access_asset ON data_access (asset_id)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_access_type ON data_access (access_type)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_lineage_src ON data_lineage (source_asset_id, target_asset_id)')
+            
+            self._fts_enabled = self._init_search_index(cursor)
+            
+            self._conn.commit()
             
             logger.info("Data catalog database initialized successfully")
             
@@ -207,12 +463,66 @@ class DataCatalogManager:
             logger.error(f"Failed to initialize catalog database: {e}")
             raise
     
+    def _init_search_index(self, cursor) -> bool:
+        """Create the FTS5 full-text index over searchable asset columns"""
+        try:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'data_assets_fts'")
+            exists = cursor.fetchone() is not None
+            
+            # Trigram tokens keep the substring semantics of the old LIKE search
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS data_assets_fts USING fts5(
+                    name, description, schema_name, table_name, tags,
+                    content='data_assets', content_rowid='rowid', tokenize='trigram'
+                )
+            ''')
+            
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS data_assets_fts_insert AFTER INSERT ON data_assets BEGIN
+                    INSERT INTO data_assets_fts (rowid, name, description, schema_name, table_name, tags)
+                    VALUES (new.rowid, new.name, new.description, new.schema_name, new.table_name, new.tags);
+                END
+            ''')
+            
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS data_assets_fts_delete AFTER DELETE ON data_assets BEGIN
+                    INSERT INTO data_assets_fts (data_assets_fts, rowid, name, description, schema_name, table_name, tags)
+                    VALUES ('delete', old.rowid, old.name, old.description, old.schema_name, old.table_name, old.tags);
+                END
+            ''')
+            
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS data_assets_fts_update
+                AFTER UPDATE OF name, description, schema_name, table_name, tags ON data_assets BEGIN
+                    INSERT INTO data_assets_fts (data_assets_fts, rowid, name, description, schema_name, table_name, tags)
+                    VALUES ('delete', old.rowid, old.name, old.description, old.schema_name, old.table_name, old.tags);
+                    INSERT INTO data_assets_fts (rowid, name, description, schema_name, table_name, tags)
+                    VALUES (new.rowid, new.name, new.description, new.schema_name, new.table_name, new.tags);
+                END
+            ''')
+            
+            # Index assets of catalogs created before the search index existed
+            if not exists:
+                cursor.execute("INSERT INTO data_assets_fts (data_assets_fts) VALUES ('rebuild')")
+            
+            return True
+            
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 trigram search unavailable, falling back to LIKE search: {e}")
+            return False
+    
+    def close(self):
+        """Close the catalog database connection"""
+        with self._lock:
+            self._conn.close()
+    
     def _load_catalog_data(self):
         """Load existing catalog data"""
         try:
-            # This would typically load from the database
-            # For now, we'll initialize empty structures
-            self.assets: Dict[str, DataAsset] = {}
+            # Assets are loaded lazily: self.assets is an LRU read-through cache
+            # and search results are cached as asset IDs until the next write
+            self.assets: Dict[str, DataAsset] = OrderedDict()
+            self._search_cache: Dict[tuple, List[str]] = OrderedDict()
             self.users: Dict[str, DataUser] = {}
             self.access_records: Dict[str, DataAccess] = {}
             
@@ -224,31 +534,11 @@ class DataCatalogManager:
     def add_data_asset(self, asset: DataAsset) -> bool:
         """Add a data asset to the catalog"""
         try:
-            conn = sqlite3.connect(self.catalog_db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO data_assets (
-                    id, name, description, schema_name, table_name, classification,
-                    owner, steward, created_at, updated_at, last_accessed,
-                    quality_level, quality_score, columns, tags, business_glossary,
-                    usage_statistics, lineage, compliance_info, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                asset.id, asset.name, asset.description, asset.schema, asset.table,
-                asset.classification.value, asset.owner, asset.steward,
-                asset.created_at.isoformat(), asset.updated_at.isoformat(),
-                asset.last_accessed.isoformat(), asset.quality_level.value,
-                asset.quality_score, json.dumps(asset.columns),
-                json.dumps(asset.tags), json.dumps(asset.business_glossary),
-                json.dumps(asset.usage_statistics), json.dumps(asset.lineage),
-                json.dumps(asset.compliance_info), json.dumps(asset.metadata)
-            ))
-            
-            conn.commit()
-            conn.close()
+            with self._lock, self._conn:
+                self._conn.execute(_SQL_INSERT_ASSET, self._asset_to_row(asset))
+                self._search_cache.clear()
+                self._cache_asset(asset)
             
-            self.assets[asset.id] = asset
             logger.info(f"Added data asset: {asset.name}")
             return True
             
@@ -256,21 +546,60 @@ class DataCatalogManager:
             logger.error(f"Failed to add data asset {asset.name}: {e}")
             return False
     
-    def get_data_asset(self, asset_id: str) -> Optional[DataAsset]:
-        """Get a data asset by ID"""
+    def add_data_assets(self, assets: List[DataAsset]) -> bool:
+        """Add many data assets to the catalog in one transaction"""
         try:
-            conn = sqlite3.connect(self.catalog_db_path)
-            cursor = conn.cursor()
+            with self._lock, self._conn:
+                self._conn.executemany(_SQL_INSERT_ASSET, (self._asset_to_row(asset) for asset in assets))
+                self._search_cache.clear()
+                for asset in assets:
+                    self._cache_asset(asset)
             
-            cursor.execute('SELECT * FROM data_assets WHERE id = ?', (asset_id,))
-            row = cursor.fetchone()
+            logger.info(f"Added {len(assets)} data assets")
+            return True
             
-            if row:
-                asset = self._row_to_asset(row)
-                conn.close()
-                return asset
+        except Exception as e:
+            logger.error(f"Failed to add {len(assets)} data assets: {e}")
+            return False
+    
+    def _cache_asset(self, asset: DataAsset):
+        """Store an asset as the most recently used cache entry"""
+        self.assets[asset.id] = asset
+        self.assets.move_to_end(asset.id)
+        while len(self.assets) > ASSET_CACHE_SIZE:
+            self.assets.popitem(last=False)
+    
+    def _asset_to_row(self, asset: DataAsset) -> tuple:
+        """Convert DataAsset object to database row"""
+        return (
+            asset.id, asset.name, asset.description, asset.schema, asset.table,
+            asset.classification.value, asset.owner, asset.steward,
+            _to_epoch_us(asset.created_at), _to_epoch_us(asset.updated_at),
+            _to_epoch_us(asset.last_accessed), asset.quality_level.value,
+            asset.quality_score, _dumps(asset.columns),
+            _dumps(asset.tags), _dumps(asset.business_glossary),
+            _dumps(asset.usage_statistics), _dumps(asset.lineage),
+            _dumps(asset.compliance_info), _dumps(asset.metadata)
+        )
+    
+    def get_data_asset(self, asset_id: str) -> Optional[DataAsset]:
+        """Get a data asset by ID"""
+        try:
+            with self._lock:
+                if asset_id in self.assets:
+                    self.assets.move_to_end(asset_id)
+                    return self.assets[asset_id]
+                
+                cursor = self._conn.cursor()
+                
+                cursor.execute(_SQL_SELECT_ASSET, (asset_id,))
+                row = cursor.fetchone()
+                
+                if row:
+                    asset = self._row_to_asset(row)
+                    self._cache_asset(asset)
+                    return asset
             
-            conn.close()
             return None
             
         except Exception as e:
@@ -278,69 +607,102 @@ class DataCatalogManager:
             return None
     
     def _row_to_asset(self, row) -> DataAsset:
-        """Convert database row to DataAsset object"""
-        return DataAsset(
-            id=row[0],
-            name=row[1],
-            description=row[2],
-            schema=row[3],
-            table=row[4],
-            classification=DataClassification(row[5]),
-            owner=row[6],
-            steward=row[7],
-            created_at=datetime.fromisoformat(row[8]),
-            updated_at=datetime.fromisoformat(row[9]),
-            last_accessed=datetime.fromisoformat(row[10]),
-            quality_level=DataQualityLevel(row[11]),
-            quality_score=row[12],
-            columns=json.loads(row[13]) if row[13] else [],
-            tags=json.loads(row[14]) if row[14] else [],
-            business_glossary=json.loads(row[15]) if row[15] else {},
-            usage_statistics=json.loads(row[16]) if row[16] else {},
-            lineage=json.loads(row[17]) if row[17] else {},
-            compliance_info=json.loads(row[18]) if row[18] else {},
-            metadata=json.loads(row[19]) if row[19] else {}
-        )
+        """Convert database row to DataAsset object, deferring JSON parsing"""
+        # Bypass __init__ so the JSON columns stay unparsed until first accessed
+        asset = DataAsset.__new__(DataAsset)
+        asset.id = row[0]
+        asset.name = row[1]
+        asset.description = row[2]
+        asset.schema = row[3]
+        asset.table = row[4]
+        asset.classification = DataClassification(row[5])
+        asset.owner = row[6]
+        asset.steward = row[7]
+        asset.created_at = _from_epoch_us(row[8])
+        asset.updated_at = _from_epoch_us(row[9])
+        asset.last_accessed = _from_epoch_us(row[10])
+        asset.quality_level = DataQualityLevel(row[11])
+        asset.quality_score = row[12]
+        asset._raw_json = {
+            'columns': (row[13], list),
+            'tags': (row[14], list),
+            'business_glossary': (row[15], dict),
+            'usage_statistics': (row[16], dict),
+            'lineage': (row[17], dict),
+            'compliance_info': (row[18], dict),
+            'metadata': (row[19], dict)
+        }
+        return asset
     
-    def search_assets(self, query: str, filters: Dict[str, Any] = None) -> List[DataAsset]:
-        """Search data assets"""
+    def search_assets(self, query: str, filters: Dict[str, Any] = None,
+                      hydrate: bool = False) -> List[Union[AssetSummary, DataAsset]]:
+        """Search data assets, returning summaries or full assets when hydrate is set"""
         try:
-            conn = sqlite3.connect(self.catalog_db_path)
-            cursor = conn.cursor()
-            
-            # Build search query
-            search_conditions = []
-            params = []
-            
-            if query:
-                search_conditions.append("""
-                    (name LIKE ? OR description LIKE ? OR 
-                     schema_name LIKE ? OR table_name LIKE ? OR
-                     tags LIKE ?)
-                """)
-                query_param = f"%{query}%"
-                params.extend([query_param] * 5)
-            
-            if filters:
-                if 'classification' in filters:
-                    search_conditions.append("classification = ?")
-                    params.append(filters['classification'])
+            cache_key = (query, frozenset((filters or {}).items()), hydrate)
+            
+            with self._lock:
+                # Serve repeated searches from cache; full assets only while all hits are still cached
+                cached = self._search_cache.get(cache_key)
+                if cached is not None and not hydrate:
+                    self._search_cache.move_to_end(cache_key)
+                    return list(cached)
+                if cached is not None and all(asset_id in self.assets for asset_id in cached):
+                    self._search_cache.move_to_end(cache_key)
+                    return [self.assets[asset_id] for asset_id in cached]
                 
-                if 'owner' in filters:
-                    search_conditions.append("owner = ?")
-                    params.append(filters['owner'])
+                cursor = self._conn.cursor()
                 
-                if 'quality_level' in filters:
-                    search_conditions.append("quality_level = ?")
-                    params.append(filters['quality_level'])
-            
-            where_clause = " AND ".join(search_conditions) if search_conditions else "1=1"
-            
-            cursor.execute(f"SELECT * FROM data_assets WHERE {where_clause}", params)
-            rows = cursor.fetchall()
-            
-            assets = [self._row_to_asset(row) for row in rows]
-            conn.close()
+                # Build search query
+                search_conditions = []
+                params = []
+                
+                # Trigram matching needs at least three characters
+                if query and self._fts_enabled and len(query) >= 3:
+                    search_conditions.append(
+                        "rowid IN (SELECT rowid FROM data_assets_fts WHERE data_assets_fts MATCH ?)"
+                    )
+                    params.append('"' + query.replace('"', '""') + '"')
+                elif query:
+                    search_conditions.append("""
+                        (name LIKE ? OR description LIKE ? OR 
+                         schema_name LIKE ? OR table_name LIKE ? OR
+                         tags LIKE ?)
+                    """)
+                    query_param = f"%{query}%"
+                    params.extend([query_param] * 5)
+                
+                if filters:
+                    if 'classification' in filters:
+                        search_conditions.append("classification = ?")
+                        params.append(filters['classification'])
+                    
+                    if 'owner' in filters:
+                        search_conditions.append("owner = ?")
+                        params.append(filters['owner'])
+                    
+                    if 'quality_level' in filters:
+                        search_conditions.append("quality_level = ?")
+                        params.append(filters['quality_level'])
+                
+                where_clause = " AND ".join(search_conditions) if search_conditions else "1=1"
+                
+                columns = _ASSET_COLS_FULL if hydrate else _ASSET_COLS_LIGHT
+                cursor.execute(f"SELECT {columns} FROM data_assets WHERE {where_clause}", params)
+                rows = cursor.fetchall()
+                
+                if hydrate:
+                    assets = [self._row_to_asset(row) for row in rows]
+                    for asset in assets:
+                        self._cache_asset(asset)
+                    self._search_cache[cache_key] = [asset.id for asset in assets]
+                else:
+                    assets = [
+                        AssetSummary(row[0], row[1], DataClassification(row[2]), DataQualityLevel(row[3]), row[4])
+                        for row in rows
+                    ]
+                    self._search_cache[cache_key] = tuple(assets)
+                while len(self._search_cache) > SEARCH_CACHE_SIZE:
+                    self._search_cache.popitem(last=False)
             
             logger.info(f"Found {len(assets)} assets matching search criteria")
             return assets
@@ -352,23 +714,8 @@ class DataCatalogManager:
     def add_data_user(self, user: DataUser) -> bool:
         """Add a data user to the catalog"""
         try:
-            conn = sqlite3.connect(self.catalog_db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO data_users (
-                    id, name, email, role, department, access_level,
-                    created_at, last_login, permissions, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                user.id, user.name, user.email, user.role, user.department,
-                user.access_level, user.created_at.isoformat(),
-                user.last_login.isoformat(), json.dumps(user.permissions),
-                json.dumps(user.metadata)
-            ))
-            
-            conn.commit()
-            conn.close()
+            with self._lock, self._conn:
+                self._conn.execute(_SQL_INSERT_USER, self._user_to_row(user))
             
             self.users[user.id] = user
             logger.info(f"Added data user: {user.name}")
@@ -378,26 +725,35 @@ class DataCatalogManager:
             logger.error(f"Failed to add data user {user.name}: {e}")
             return False
     
+    def add_data_users(self, users: List[DataUser]) -> bool:
+        """Add many data users to the catalog in one transaction"""
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany(_SQL_INSERT_USER, (self._user_to_row(user) for user in users))
+            
+            for user in users:
+                self.users[user.id] = user
+            logger.info(f"Added {len(users)} data users")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to add {len(users)} data users: {e}")
+            return False
+    
+    def _user_to_row(self, user: DataUser) -> tuple:
+        """Convert DataUser object to database row"""
+        return (
+            user.id, user.name, user.email, user.role, user.department,
+            user.access_level, _to_epoch_us(user.created_at),
+            _to_epoch_us(user.last_login), _dumps(user.permissions),
+            _dumps(user.metadata)
+        )
+    
     def grant_data_access(self, access: DataAccess) -> bool:
         """Grant data access to a user"""
         try:
-            conn = sqlite3.connect(self.catalog_db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO data_access (
-                    id, user_id, asset_id, access_type, granted_at,
-                    expires_at, granted_by, purpose, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                access.id, access.user_id, access.asset_id, access.access_type,
-                access.granted_at.isoformat(),
-                access.expires_at.isoformat() if access.expires_at else None,
-                access.granted_by, access.purpose, json.dumps(access.metadata)
-            ))
-            
-            conn.commit()
-            conn.close()
+            with self._lock, self._conn:
+                self._conn.execute(_SQL_INSERT_ACCESS, self._access_to_row(access))
             
             self.access_records[access.id] = access
             logger.info(f"Granted {access.access_type} access to user {access.user_id} for asset {access.asset_id}")
@@ -407,41 +763,62 @@ class DataCatalogManager:
             logger.error(f"Failed to grant data access: {e}")
             return False
     
-    def update_quality_metrics(self, asset_id: str, metrics: Dict[str, Any]) -> bool:
-        """Update data quality metrics for an asset"""
+    def grant_data_accesses(self, accesses: List[DataAccess]) -> bool:
+        """Grant many data access records in one transaction"""
         try:
-            conn = sqlite3.connect(self.catalog_db_path)
-            cursor = conn.cursor()
-            
-            # Clear existing metrics
-            cursor.execute('DELETE FROM data_quality_metrics WHERE asset_id = ?', (asset_id,))
-            
-            # Insert new metrics
-            for metric_name, metric_data in metrics.items():
-                cursor.execute('''
-                    INSERT INTO data_quality_metrics (
-                        id, asset_id, metric_name, metric_value, threshold,
-                        status, measured_at, metadata
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    f"{asset_id}_{metric_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-                    asset_id, metric_name, metric_data.get('value', 0),
-                    metric_data.get('threshold', 0), metric_data.get('status', 'unknown'),
-                    datetime.now().isoformat(), json.dumps(metric_data.get('metadata', {}))
-                ))
-            
-            # Update asset quality score
-            overall_score = sum(metric_data.get('value', 0) for metric_data in metrics.values()) / len(metrics)
-            quality_level = self._calculate_quality_level(overall_score)
+            with self._lock, self._conn:
+                self._conn.executemany(_SQL_INSERT_ACCESS, (self._access_to_row(access) for access in accesses))
             
-            cursor.execute('''
-                UPDATE data_assets 
-                SET quality_score = ?, quality_level = ?, updated_at = ?
-                WHERE id = ?
-            ''', (overall_score, quality_level.value, datetime.now().isoformat(), asset_id))
+            for access in accesses:
+                self.access_records[access.id] = access
+            logger.info(f"Granted {len(accesses)} data access records")
+            return True
             
-            conn.commit()
-            conn.close()
+        except Exception as e:
+            logger.error(f"Failed to grant {len(accesses)} data access records: {e}")
+            return False
+    
+    def _access_to_row(self, access: DataAccess) -> tuple:
+        """Convert DataAccess object to database row"""
+        return (
+            access.id, access.user_id, access.asset_id, access.access_type,
+            _to_epoch_us(access.granted_at),
+            _to_epoch_us(access.expires_at) if access.expires_at else None,
+            access.granted_by, access.purpose, _dumps(access.metadata)
+        )
+    
+    def update_quality_metrics(self, asset_id: str, metrics: Dict[str, Any]) -> bool:
+        """Update data quality metrics for an asset"""
+        try:
+            with self._lock, self._conn:
+                cursor = self._conn.cursor()
+                
+                # Drop metrics that are no longer reported; the rest are upserted in place
+                cursor.execute(_SQL_DELETE_STALE_METRICS, (asset_id, _dumps(list(metrics))))
+                
+                measured_at_us = _to_epoch_us(datetime.now())
+                rows = [
+                    (
+                        asset_id, metric_name, metric_data.get('value', 0),
+                        metric_data.get('threshold', 0), metric_data.get('status', 'unknown'),
+                        measured_at_us, _dumps(metric_data.get('metadata', {}))
+                    )
+                    for metric_name, metric_data in metrics.items()
+                ]
+                cursor.executemany(_SQL_UPSERT_METRIC, rows)
+                
+                # Update asset quality score
+                overall_score = fsum(row[2] for row in rows) / len(rows) if rows else 0.0
+                quality_level = self._calculate_quality_level(overall_score)
+                
+                cursor.execute(
+                    _SQL_UPDATE_ASSET_QUALITY,
+                    (overall_score, quality_level.value, measured_at_us, asset_id)
+                )
+                
+                # The asset's score changed, so cached copies and searches are stale
+                self.assets.pop(asset_id, None)
+                self._search_cache.clear()
             
             logger.info(f"Updated quality metrics for asset {asset_id}")
             return True
@@ -464,38 +841,18 @@ class DataCatalogManager:
     def generate_catalog_report(self) -> Dict[str, Any]:
         """Generate comprehensive catalog report"""
         try:
-            conn = sqlite3.connect(self.catalog_db_path)
-            cursor = conn.cursor()
-            
-            # Get asset statistics
-            cursor.execute('SELECT COUNT(*) FROM data_assets')
-            total_assets = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT classification, COUNT(*) FROM data_assets GROUP BY classification')
-            assets_by_classification = dict(cursor.fetchall())
-            
-            cursor.execute('SELECT quality_level, COUNT(*) FROM data_assets GROUP BY quality_level')
-            assets_by_quality = dict(cursor.fetchall())
-            
-            # Get user statistics
-            cursor.execute('SELECT COUNT(*) FROM data_users')
-            total_users = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT role, COUNT(*) FROM data_users GROUP BY role')
-            users_by_role = dict(cursor.fetchall())
-            
-            # Get access statistics
-            cursor.execute('SELECT COUNT(*) FROM data_access')
-            total_access_records = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT access_type, COUNT(*) FROM data_access GROUP BY access_type')
-            access_by_type = dict(cursor.fetchall())
+            # All statistics in one statement; grouped counts arrive as JSON objects
+            with self._lock:
+                (
+                    total_assets, total_users, total_access_records, avg_quality_score,
+                    by_classification, by_quality, by_role, by_access_type
+                ) = self._conn.execute(_SQL_CATALOG_REPORT).fetchone()
             
-            # Get quality metrics
-            cursor.execute('SELECT AVG(metric_value) FROM data_quality_metrics')
-            avg_quality_score = cursor.fetchone()[0] or 0
-            
-            conn.close()
+            avg_quality_score = avg_quality_score or 0
+            assets_by_classification = _loads(by_classification)
+            assets_by_quality = _loads(by_quality)
+            users_by_role = _loads(by_role)
+            access_by_type = _loads(by_access_type)
             
             report = {
                 "timestamp": datetime.now().isoformat(),
@@ -538,65 +895,131 @@ class DataCatalogManager:
         
         return recommendations
     
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open a read-only connection for a worker thread"""
+        conn = sqlite3.connect(
+            Path(self.catalog_db_path).resolve().as_uri() + '?mode=ro',
+            uri=True, detect_types=sqlite3.PARSE_DECLTYPES
+        )
+        conn.execute('PRAGMA mmap_size=268435456')
+        return conn
+    
+    @staticmethod
+    def _json_chunks(cursor):
+        """Yield a table's rows as the items of a JSON array, one record per line"""
+        columns = [column[0] for column in cursor.description]
+        separator = '\n    '
+        rows = cursor.fetchmany(EXPORT_CHUNK_ROWS)
+        if not rows:
+            yield ']'
+            return
+        while rows:
+            yield separator + ',\n    '.join(_dumps(dict(zip(columns, row))) for row in rows)
+            separator = ',\n    '
+            rows = cursor.fetchmany(EXPORT_CHUNK_ROWS)
+        yield '\n  ]'
+    
+    @staticmethod
+    def _csv_chunks(cursor):
+        """Yield a table's rows as CSV text, starting with a header row"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow([column[0] for column in cursor.description])
+        rows = cursor.fetchmany(EXPORT_CHUNK_ROWS)
+        while True:
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            if not rows:
+                return
+            buffer.seek(0)
+            buffer.truncate()
+            rows = cursor.fetchmany(EXPORT_CHUNK_ROWS)
+    
+    def _format_table(self, table: str, format_chunks, chunks: queue.Queue, stop: threading.Event):
+        """Format a table on a read-only connection, queueing its chunks for the writer"""
+        conn = self._open_reader()
+        try:
+            for chunk in format_chunks(conn.execute(f"SELECT * FROM {table}")):
+                if stop.is_set():
+                    return
+                chunks.put(chunk)
+            chunks.put(None)
+        except Exception as e:
+            chunks.put(e)
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _queued_chunks(chunks: queue.Queue):
+        """Yield a table's chunks until its end marker, re-raising a worker error"""
+        for chunk in iter(chunks.get, None):
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+    
+    def _export_tables(self, tables: List[str], format_chunks, write_table):
+        """Format tables in parallel and hand their chunks to write_table in table order
+        
+        Each worker reads on its own read-only connection and blocks once its queue is
+        full, so memory stays bounded and only the calling thread writes the export.
+        """
+        queues = [queue.Queue(maxsize=EXPORT_QUEUE_CHUNKS) for _ in tables]
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+            for table, chunks in zip(tables, queues):
+                executor.submit(self._format_table, table, format_chunks, chunks, stop)
+            try:
+                for table, chunks in zip(tables, queues):
+                    write_table(table, self._queued_chunks(chunks))
+            finally:
+                # Unblock workers still waiting on a full queue if writing failed
+                stop.set()
+                for chunks in queues:
+                    while not chunks.empty():
+                        chunks.get_nowait()
+    
     def export_catalog(self, format: str = "json") -> str:
         """Export catalog data"""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            exported_at = datetime.now()
+            timestamp = exported_at.strftime("%Y%m%d_%H%M%S")
             
             if format == "json":
                 export_path = os.path.join(self.catalog_dir, f"catalog_export_{timestamp}.json")
                 
-                # Get all data
-                conn = sqlite3.connect(self.catalog_db_path)
-                
-                # Export assets
-                assets_df = pd.read_sql_query("SELECT * FROM data_assets", conn)
-                
-                # Export users
-                users_df = pd.read_sql_query("SELECT * FROM data_users", conn)
+                sections = [
+                    ("assets", "data_assets"),
+                    ("users", "data_users"),
+                    ("access_records", "data_access"),
+                    ("quality_metrics", "data_quality_metrics")
+                ]
                 
-                # Export access records
-                access_df = pd.read_sql_query("SELECT * FROM data_access", conn)
+                keys = {table: key for key, table in sections}
                 
-                # Export quality metrics
-                quality_df = pd.read_sql_query("SELECT * FROM data_quality_metrics", conn)
+                def write_section(table, chunks):
+                    f.write(f',\n  "{keys[table]}": [')
+                    f.writelines(chunks)
                 
-                conn.close()
-                
-                export_data = {
-                    "timestamp": datetime.now().isoformat(),
-                    "assets": assets_df.to_dict('records'),
-                    "users": users_df.to_dict('records'),
-                    "access_records": access_df.to_dict('records'),
-                    "quality_metrics": quality_df.to_dict('records')
-                }
-                
-                with open(export_path, 'w') as f:
-                    json.dump(export_data, f, indent=2, default=str)
+                # Serialize the tables in parallel on read-only connections and stream them
+                # into the file; holding the lock keeps this catalog's own writes out of the export
+                with self._lock, open(export_path, 'w') as f:
+                    f.write('{\n  "timestamp": ' + _dumps(exported_at.isoformat()))
+                    self._export_tables([table for _, table in sections], self._json_chunks, write_section)
+                    f.write('\n}\n')
                 
             elif format == "csv":
                 export_path = os.path.join(self.catalog_dir, f"catalog_export_{timestamp}.zip")
                 
-                conn = sqlite3.connect(self.catalog_db_path)
-                
-                # Export each table as CSV
+                # Format each table as CSV in parallel; only this thread streams into the archive
                 tables = ["data_assets", "data_users", "data_access", "data_quality_metrics"]
-                csv_files = []
-                
-                for table in tables:
-                    df = pd.read_sql_query(f"SELECT * FROM {table}", conn)
-                    csv_file = os.path.join(self.catalog_dir, f"{table}_{timestamp}.csv")
-                    df.to_csv(csv_file, index=False)
-                    csv_files.append(csv_file)
                 
-                conn.close()
+                def write_entry(table, chunks):
+                    with zipf.open(f"{table}_{timestamp}.csv", 'w') as raw, \
+                            io.TextIOWrapper(raw, encoding='utf-8', newline='') as f:
+                        f.writelines(chunks)
                 
-                # Create zip file
-                import zipfile
-                with zipfile.ZipFile(export_path, 'w') as zipf:
-                    for csv_file in csv_files:
-                        zipf.write(csv_file, os.path.basename(csv_file))
-                        os.remove(csv_file)  # Clean up individual CSV files
+                with self._lock, zipfile.ZipFile(export_path, 'w', compression=zipfile.ZIP_DEFLATED) as zipf:
+                    self._export_tables(tables, self._csv_chunks, write_entry)
                 
             else:
                 raise ValueError(f"Unsupported export format: {format}")
@@ -630,6 +1053,7 @@ def main():
             
         elif args.action == 'add-asset':
             # Example: Add a sample asset
+            now = datetime.now()
             sample_asset = DataAsset(
                 id="sample_asset_001",
                 name="Sample Data Asset",
@@ -639,9 +1063,9 @@ def main():
                 classification=DataClassification.INTERNAL,
                 owner="data_team",
                 steward="data_steward",
-                created_at=datetime.now(),
-                updated_at=datetime.now(),
-                last_accessed=datetime.now(),
+                created_at=now,
+                updated_at=now,
+                last_accessed=now,
                 quality_level=DataQualityLevel.GOOD,
                 quality_score=0.85,
                 columns=[{"name": "id", "type": "integer", "description": "Primary key"}],
@@ -7,54 +7,200 @@ Tracks data flow, transformations, and dependencies across the ETL pipeline
 import os
 import sys
 import json
+import re
+import pickle
+import hashlib
 import logging
+import logging.handlers
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, FrozenSet, List, Optional, Set, Tuple, Union
 import networkx as nx
 import pandas as pd
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
+from collections import defaultdict, deque
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
 import yaml
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import rustworkx as rx
+except ImportError:
+    rx = None
+
 # Configure logging
+_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+_file_handler = logging.FileHandler('logs/data_lineage.log')
+_file_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format=_LOG_FORMAT,
     handlers=[
-        logging.FileHandler('logs/data_lineage.log'),
+        # Buffer file writes; anything at WARNING or above flushes the batch immediately
+        logging.handlers.MemoryHandler(capacity=1024, flushLevel=logging.WARNING, target=_file_handler),
         logging.StreamHandler(sys.stdout)
     ]
 )
 logger = logging.getLogger(__name__)
 
-@dataclass
+# dbt ref('model') and source('source', 'table') calls, compiled once for every model scanned
+_REF_RE = re.compile(r"\{\{\s*ref\(['\"]([^'\"]+)['\"]\)\s*\}\}")
+_SOURCE_RE = re.compile(r"\{\{\s*source\(['\"]([^'\"]+)['\"]\s*,\s*['\"]([^'\"]+)['\"]\)\s*\}\}")
+
+# Below this many model files a process pool costs more to start than it saves
+SCAN_PARALLEL_MIN_FILES = 64
+
+def _extract_dbt_dependencies(model_content: str) -> List[str]:
+    """Extract ref() and source() dependencies from dbt model content"""
+    dependencies = set(_REF_RE.findall(model_content))
+    dependencies.update(f"{source_name}.{table_name}" for source_name, table_name in _SOURCE_RE.findall(model_content))
+    return list(dependencies)
+
+# Dependencies of already-seen model files by SHA-256 of their content, so unchanged
+# models skip the regex pass on rescans; process pool workers receive a copy at startup
+_known_dependencies: Dict[str, List[str]] = {}
+
+def _set_known_dependencies(known_dependencies: Dict[str, List[str]]):
+    """Install the dependency cache consulted by _parse_model in this process"""
+    global _known_dependencies
+    _known_dependencies = known_dependencies
+
+def _parse_model(model_file) -> tuple:
+    """Read and parse one dbt model file; top-level so process pool workers can run it"""
+    model_path, relative_path = model_file
+    model_name = os.path.basename(model_path)[:-4]  # Remove .sql extension
+    
+    # Determine model type based on directory
+    if relative_path.startswith('staging'):
+        model_type = 'staging'
+    elif relative_path.startswith('marts'):
+        model_type = 'mart'
+    else:
+        model_type = 'intermediate'
+    
+    with open(model_path, 'rb') as f:
+        raw_content = f.read()
+    model_content = raw_content.decode()
+    
+    digest = hashlib.sha256(raw_content).hexdigest()
+    dependencies = _known_dependencies.get(digest)
+    if dependencies is None:
+        dependencies = _extract_dbt_dependencies(model_content)
+    
+    return model_path, model_name, model_type, dependencies, model_content, digest
+
+# Lineage state lives in append-only changelogs; a log is rewritten once it holds
+# more than this many lines per live entity
+LOG_COMPACTION_RATIO = 2
+
+# Bumped whenever the pickled snapshot layout changes, so older snapshots are ignored
+SNAPSHOT_FORMAT = 2
+
+def _json_default(value):
+    """Serialize datetimes as ISO strings and dataclasses field by field"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, '__dataclass_fields__'):
+        return {field.name: getattr(value, field.name) for field in fields(value)}
+    return str(value)
+
+def _dumps(value, indent: bool = False) -> bytes:
+    """Encode a value as JSON; orjson handles dataclasses and datetimes natively"""
+    if orjson is not None:
+        return orjson.dumps(value, default=_json_default, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(
+        value, default=_json_default, indent=2 if indent else None,
+        separators=None if indent else (',', ':')
+    ).encode()
+
+def _encode_record(record: Dict[str, Any]) -> bytes:
+    """Encode one changelog record as a JSON line"""
+    return _dumps(record) + b"\n"
+
+def _decode_record(line: bytes) -> Dict[str, Any]:
+    """Decode one changelog record"""
+    return orjson.loads(line) if orjson is not None else json.loads(line)
+
+def _as_datetime(value: Union[str, datetime]) -> datetime:
+    """Parse a timestamp that may still be the ISO string it was loaded as"""
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+def _frozen_getstate(self) -> list:
+    """Field values in order, for pickling and copying a frozen slotted dataclass"""
+    return [getattr(self, field.name) for field in fields(self)]
+
+def _frozen_setstate(self, state: list):
+    """Restore field values past the frozen __setattr__, as dataclass(slots=True) does"""
+    for field, value in zip(fields(self), state):
+        object.__setattr__(self, field.name, value)
+
+@dataclass(frozen=True)
 class DataNode:
     """Represents a data node in the lineage graph"""
+    # Immutable and slotted (dataclass(slots=True) needs Python 3.10), so entities
+    # can be shared by the graph, caches and reports without copying
+    __slots__ = (
+        'name', 'node_type', 'schema', 'table', 'description', 'owner',
+        'created_at', 'updated_at', 'columns', 'tags', 'metadata'
+    )
     name: str
     node_type: str  # 'source', 'staging', 'intermediate', 'mart', 'external'
     schema: str
     table: str
     description: str
     owner: str
-    created_at: datetime
-    updated_at: datetime
+    created_at: Union[str, datetime]
+    updated_at: Union[str, datetime]
     columns: List[Dict[str, Any]]
     tags: List[str]
     metadata: Dict[str, Any]
+    
+    __getstate__ = _frozen_getstate
+    __setstate__ = _frozen_setstate
+    
+    @property
+    def created_at_dt(self) -> datetime:
+        """Created time as a datetime, parsed on demand"""
+        return _as_datetime(self.created_at)
+    
+    @property
+    def updated_at_dt(self) -> datetime:
+        """Updated time as a datetime, parsed on demand"""
+        return _as_datetime(self.updated_at)
 
-@dataclass
+@dataclass(frozen=True)
 class DataEdge:
     """Represents a relationship between data nodes"""
+    __slots__ = ('source', 'target', 'relationship_type', 'transformation_logic', 'created_at', 'metadata')
     source: str
     target: str
     relationship_type: str  # 'transforms', 'depends_on', 'feeds'
     transformation_logic: str
-    created_at: datetime
+    created_at: Union[str, datetime]
     metadata: Dict[str, Any]
+    
+    __getstate__ = _frozen_getstate
+    __setstate__ = _frozen_setstate
+    
+    @property
+    def created_at_dt(self) -> datetime:
+        """Created time as a datetime, parsed on demand"""
+        return _as_datetime(self.created_at)
 
-@dataclass
+@dataclass(frozen=True)
 class DataTransformation:
     """Represents a data transformation"""
+    __slots__ = (
+        'name', 'description', 'input_tables', 'output_tables', 'transformation_type',
+        'logic', 'owner', 'created_at', 'updated_at', 'dependencies', 'metadata'
+    )
     name: str
     description: str
     input_tables: List[str]
@@ -62,21 +208,70 @@ class DataTransformation:
     transformation_type: str  # 'sql', 'python', 'dbt_model'
     logic: str
     owner: str
-    created_at: datetime
-    updated_at: datetime
+    created_at: Union[str, datetime]
+    updated_at: Union[str, datetime]
     dependencies: List[str]
     metadata: Dict[str, Any]
+    
+    __getstate__ = _frozen_getstate
+    __setstate__ = _frozen_setstate
+    
+    @property
+    def created_at_dt(self) -> datetime:
+        """Created time as a datetime, parsed on demand"""
+        return _as_datetime(self.created_at)
+    
+    @property
+    def updated_at_dt(self) -> datetime:
+        """Updated time as a datetime, parsed on demand"""
+        return _as_datetime(self.updated_at)
+
+# Entity types of a JSON export, by section
+_EXPORT_TYPES = {"nodes": DataNode, "edges": DataEdge, "transformations": DataTransformation}
+
+# Pull a record's values out in field order with one C-level call, so entities are
+# built positionally rather than through keyword expansion
+_FIELD_GETTERS = {
+    entity_type: itemgetter(*(field.name for field in fields(entity_type)))
+    for entity_type in _EXPORT_TYPES.values()
+}
+
+def _from_record(entity_type, data):
+    """Build a lineage dataclass from a decoded record or a snapshot tuple"""
+    if isinstance(data, tuple):
+        return entity_type(*data)
+    return entity_type(*_FIELD_GETTERS[entity_type](data))
 
 class DataLineageTracker:
     """Comprehensive data lineage tracking system"""
     
     def __init__(self):
         self.lineage_dir = "data/lineage"
+        # Topology only; node and edge details live once, in self.nodes and self.edges
         self.graph = nx.DiGraph()
         self.nodes: Dict[str, DataNode] = {}
         self.edges: Dict[str, DataEdge] = {}
         self.transformations: Dict[str, DataTransformation] = {}
         
+        # Per-node edge indexes and memoized reachability; the caches are
+        # cleared and the version bumped whenever a node or edge is added
+        self._graph_version = 0
+        self._report_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+        self._in_edges: Dict[str, List[DataEdge]] = defaultdict(list)
+        self._out_edges: Dict[str, List[DataEdge]] = defaultdict(list)
+        self._anc_cache: Dict[str, FrozenSet[str]] = {}
+        self._desc_cache: Dict[str, FrozenSet[str]] = {}
+        
+        # Names of the transformations reading each table, for impact analysis
+        self._trans_by_input: Dict[str, List[str]] = defaultdict(list)
+        
+        # Keys changed since the last save, and the line count of each changelog
+        # (None until the log has been written in the current format)
+        self._dirty_nodes: Set[str] = set()
+        self._dirty_edges: Set[str] = set()
+        self._dirty_transformations: Set[str] = set()
+        self._log_lines: Dict[str, Optional[int]] = {"nodes": None, "edges": None, "transformations": None}
+        
         os.makedirs(self.lineage_dir, exist_ok=True)
         
         # Load existing lineage data
@@ -85,85 +280,156 @@ class DataLineageTracker:
     def _load_existing_lineage(self):
         """Load existing lineage data from files"""
         try:
+            # Timestamps stay ISO strings until read through the *_dt properties
+            
             # Load nodes
-            nodes_file = os.path.join(self.lineage_dir, "nodes.json")
-            if os.path.exists(nodes_file):
-                with open(nodes_file, 'r') as f:
-                    nodes_data = json.load(f)
-                    for node_data in nodes_data:
-                        node = DataNode(**node_data)
-                        node.created_at = datetime.fromisoformat(node.created_at)
-                        node.updated_at = datetime.fromisoformat(node.updated_at)
-                        self.nodes[node.name] = node
-                        self.graph.add_node(node.name, **asdict(node))
+            for node_data in self._read_log("nodes").values():
+                node = _from_record(DataNode, node_data)
+                self.nodes[node.name] = node
+                self.graph.add_node(node.name)
             
             # Load edges
-            edges_file = os.path.join(self.lineage_dir, "edges.json")
-            if os.path.exists(edges_file):
-                with open(edges_file, 'r') as f:
-                    edges_data = json.load(f)
-                    for edge_data in edges_data:
-                        edge = DataEdge(**edge_data)
-                        edge.created_at = datetime.fromisoformat(edge.created_at)
-                        self.edges[f"{edge.source}->{edge.target}"] = edge
-                        self.graph.add_edge(edge.source, edge.target, **asdict(edge))
+            for edge_data in self._read_log("edges").values():
+                edge = _from_record(DataEdge, edge_data)
+                self._index_edge(edge)
+                self.graph.add_edge(edge.source, edge.target)
             
             # Load transformations
-            transformations_file = os.path.join(self.lineage_dir, "transformations.json")
-            if os.path.exists(transformations_file):
-                with open(transformations_file, 'r') as f:
-                    transformations_data = json.load(f)
-                    for trans_data in transformations_data:
-                        transformation = DataTransformation(**trans_data)
-                        transformation.created_at = datetime.fromisoformat(transformation.created_at)
-                        transformation.updated_at = datetime.fromisoformat(transformation.updated_at)
-                        self.transformations[transformation.name] = transformation
+            for trans_data in self._read_log("transformations").values():
+                transformation = _from_record(DataTransformation, trans_data)
+                self._index_transformation(transformation)
             
             logger.info(f"Loaded {len(self.nodes)} nodes, {len(self.edges)} edges, {len(self.transformations)} transformations")
             
         except Exception as e:
             logger.error(f"Failed to load existing lineage data: {e}")
     
+    def _read_log(self, kind: str) -> Dict[str, Any]:
+        """Replay a lineage changelog into the latest record per key"""
+        records: Dict[str, Any] = {}
+        log_file = os.path.join(self.lineage_dir, f"{kind}.jsonl")
+        legacy_file = os.path.join(self.lineage_dir, f"{kind}.json")
+        
+        if os.path.exists(log_file):
+            records, lines, offset = self._read_snapshot(kind, log_file)
+            with open(log_file, 'rb') as f:
+                # Only the records appended since the snapshot need replaying
+                f.seek(offset)
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = _decode_record(line)
+                    lines += 1
+                    if record["op"] == "remove":
+                        records.pop(record["key"], None)
+                    else:
+                        records[record["key"]] = record["data"]
+            self._log_lines[kind] = lines
+        
+        elif os.path.exists(legacy_file):
+            # Snapshot files from before the changelog; the next save rewrites them as a log
+            with open(legacy_file, 'rb') as f:
+                for data in _decode_record(f.read()):
+                    key = f"{data['source']}->{data['target']}" if kind == "edges" else data["name"]
+                    records[key] = data
+        
+        return records
+    
+    def _read_snapshot(self, kind: str, log_file: str) -> Tuple[Dict[str, Any], int, int]:
+        """Load the binary snapshot of a changelog, if it still matches the log on disk"""
+        snapshot_file = os.path.join(self.lineage_dir, f"{kind}.pickle")
+        try:
+            with open(snapshot_file, 'rb') as f:
+                snapshot = pickle.load(f)
+            
+            # Compaction replaces the log file, so a snapshot of an older log is ignored,
+            # as is one taken before the dataclass fields or the snapshot format changed
+            log_stat = os.stat(log_file)
+            field_names = [field.name for field in fields(_EXPORT_TYPES[kind])]
+            if (snapshot.get("format") == SNAPSHOT_FORMAT and snapshot["inode"] == log_stat.st_ino
+                    and snapshot["offset"] <= log_stat.st_size and snapshot["fields"] == field_names):
+                return snapshot["entities"], snapshot["lines"], snapshot["offset"]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable lineage snapshot {snapshot_file}: {e}")
+        
+        return {}, 0, 0
+    
+    def _write_snapshot(self, kind: str, log_file: str, records: Dict[str, Dict[str, Any]]):
+        """Pickle the decoded records of a freshly compacted changelog for fast reloads"""
+        snapshot_file = os.path.join(self.lineage_dir, f"{kind}.pickle")
+        tmp_file = snapshot_file + ".tmp"
+        entity_type = _EXPORT_TYPES[kind]
+        get_values = _FIELD_GETTERS[entity_type]
+        
+        try:
+            log_stat = os.stat(log_file)
+            with open(tmp_file, 'wb') as f:
+                pickle.dump({
+                    "format": SNAPSHOT_FORMAT,
+                    "inode": log_stat.st_ino,
+                    "offset": log_stat.st_size,
+                    "lines": len(records),
+                    "fields": [field.name for field in fields(entity_type)],
+                    "entities": {key: get_values(data) for key, data in records.items()}
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, snapshot_file)
+        except Exception as e:
+            # The changelog is already durable; a missing snapshot only slows the next load
+            logger.warning(f"Failed to write lineage snapshot {snapshot_file}: {e}")
+    
     def _save_lineage_data(self):
-        """Save lineage data to files"""
+        """Save lineage changes to the append-only changelogs"""
         try:
-            # Save nodes
-            nodes_data = []
-            for node in self.nodes.values():
-                node_dict = asdict(node)
-                node_dict['created_at'] = node.created_at.isoformat()
-                node_dict['updated_at'] = node.updated_at.isoformat()
-                nodes_data.append(node_dict)
-            
-            with open(os.path.join(self.lineage_dir, "nodes.json"), 'w') as f:
-                json.dump(nodes_data, f, indent=2, default=str)
-            
-            # Save edges
-            edges_data = []
-            for edge in self.edges.values():
-                edge_dict = asdict(edge)
-                edge_dict['created_at'] = edge.created_at.isoformat()
-                edges_data.append(edge_dict)
-            
-            with open(os.path.join(self.lineage_dir, "edges.json"), 'w') as f:
-                json.dump(edges_data, f, indent=2, default=str)
-            
-            # Save transformations
-            transformations_data = []
-            for transformation in self.transformations.values():
-                trans_dict = asdict(transformation)
-                trans_dict['created_at'] = transformation.created_at.isoformat()
-                trans_dict['updated_at'] = transformation.updated_at.isoformat()
-                transformations_data.append(trans_dict)
-            
-            with open(os.path.join(self.lineage_dir, "transformations.json"), 'w') as f:
-                json.dump(transformations_data, f, indent=2, default=str)
+            self._write_log("nodes", self.nodes, self._dirty_nodes)
+            self._write_log("edges", self.edges, self._dirty_edges)
+            self._write_log("transformations", self.transformations, self._dirty_transformations)
             
             logger.info("Lineage data saved successfully")
             
         except Exception as e:
             logger.error(f"Failed to save lineage data: {e}")
     
+    def _write_log(self, kind: str, entities: Dict[str, Any], dirty: Set[str]):
+        """Append records for changed entities, compacting the log when it grows too long"""
+        lines = self._log_lines[kind]
+        
+        if lines is None or lines + len(dirty) > LOG_COMPACTION_RATIO * max(len(entities), 1):
+            self._compact(kind, entities)
+        elif dirty:
+            with open(os.path.join(self.lineage_dir, f"{kind}.jsonl"), 'ab') as f:
+                for key in dirty:
+                    if key in entities:
+                        f.write(_encode_record({"op": "upsert", "key": key, "data": entities[key]}))
+                    else:
+                        f.write(_encode_record({"op": "remove", "key": key}))
+            self._log_lines[kind] = lines + len(dirty)
+        
+        dirty.clear()
+    
+    def _compact(self, kind: str, entities: Dict[str, Any]):
+        """Rewrite a changelog with one record per live entity"""
+        log_file = os.path.join(self.lineage_dir, f"{kind}.jsonl")
+        tmp_file = log_file + ".tmp"
+        
+        # The snapshot holds the records as decoded from the log, so entities reloaded
+        # from it carry exactly the values a replay of the log would give
+        records = {}
+        with open(tmp_file, 'wb') as f:
+            for key, entity in entities.items():
+                line = _encode_record({"op": "upsert", "key": key, "data": entity})
+                f.write(line)
+                records[key] = _decode_record(line)["data"]
+        os.replace(tmp_file, log_file)
+        self._log_lines[kind] = len(entities)
+        self._write_snapshot(kind, log_file, records)
+        
+        # The log now supersedes any snapshot file from before the changelog
+        legacy_file = os.path.join(self.lineage_dir, f"{kind}.json")
+        if os.path.exists(legacy_file):
+            os.remove(legacy_file)
+    
     def add_data_node(self, name: str, node_type: str, schema: str, table: str, 
                      description: str, owner: str, columns: List[Dict[str, Any]], 
                      tags: List[str] = None, metadata: Dict[str, Any] = None) -> DataNode:
@@ -186,9 +452,11 @@ class DataLineageTracker:
             )
             
             self.nodes[name] = node
-            self.graph.add_node(name, **asdict(node))
+            self.graph.add_node(name)
+            self._dirty_nodes.add(name)
+            self._graph_changed()
             
-            logger.info(f"Added data node: {name}")
+            logger.debug("Added data node: %s", name)
             return node
             
         except Exception as e:
@@ -204,7 +472,6 @@ class DataLineageTracker:
             if target not in self.nodes:
                 raise ValueError(f"Target node {target} not found")
             
-            edge_key = f"{source}->{target}"
             now = datetime.now()
             
             edge = DataEdge(
@@ -216,22 +483,93 @@ class DataLineageTracker:
                 metadata=metadata or {}
             )
             
-            self.edges[edge_key] = edge
-            self.graph.add_edge(source, target, **asdict(edge))
+            self._index_edge(edge)
+            self.graph.add_edge(source, target)
+            self._dirty_edges.add(f"{source}->{target}")
+            self._graph_changed()
             
-            logger.info(f"Added data edge: {source} -> {target}")
+            logger.debug("Added data edge: %s -> %s", source, target)
             return edge
             
         except Exception as e:
             logger.error(f"Failed to add data edge {source} -> {target}: {e}")
             raise
     
+    def _index_edge(self, edge: DataEdge):
+        """Store an edge and keep the per-node edge indexes in step"""
+        edge_key = f"{edge.source}->{edge.target}"
+        previous = self.edges.get(edge_key)
+        self.edges[edge_key] = edge
+        
+        if previous is None:
+            self._out_edges[edge.source].append(edge)
+            self._in_edges[edge.target].append(edge)
+        else:
+            # Re-adding an edge replaces it in place
+            out_edges = self._out_edges[edge.source]
+            out_edges[out_edges.index(previous)] = edge
+            in_edges = self._in_edges[edge.target]
+            in_edges[in_edges.index(previous)] = edge
+    
+    def _index_transformation(self, transformation: DataTransformation):
+        """Store a transformation and keep the input-table reverse index in step"""
+        previous = self.transformations.get(transformation.name)
+        if previous is not None:
+            for input_table in dict.fromkeys(previous.input_tables):
+                self._trans_by_input[input_table].remove(previous.name)
+        
+        self.transformations[transformation.name] = transformation
+        for input_table in dict.fromkeys(transformation.input_tables):
+            self._trans_by_input[input_table].append(transformation.name)
+    
+    def _graph_changed(self):
+        """Bump the graph version and drop memoized ancestor/descendant sets"""
+        self._graph_version += 1
+        self._anc_cache.clear()
+        self._desc_cache.clear()
+    
+    def _reach(self, start: str, upstream: bool) -> FrozenSet[str]:
+        """Breadth-first walk of the edge indexes, excluding the start node"""
+        adjacency = self._in_edges if upstream else self._out_edges
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            for edge in adjacency.get(queue.popleft(), ()):
+                neighbour = edge.source if upstream else edge.target
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    queue.append(neighbour)
+        seen.discard(start)
+        return frozenset(seen)
+    
+    def _ancestors(self, node_name: str) -> FrozenSet[str]:
+        """All nodes upstream of a node, memoized until the graph changes"""
+        ancestors = self._anc_cache.get(node_name)
+        if ancestors is None:
+            ancestors = self._anc_cache[node_name] = self._reach(node_name, upstream=True)
+        return ancestors
+    
+    def _descendants(self, node_name: str) -> FrozenSet[str]:
+        """All nodes downstream of a node, memoized until the graph changes"""
+        descendants = self._desc_cache.get(node_name)
+        if descendants is None:
+            descendants = self._desc_cache[node_name] = self._reach(node_name, upstream=False)
+        return descendants
+    
     def add_transformation(self, name: str, description: str, input_tables: List[str],
                           output_tables: List[str], transformation_type: str, logic: str,
                           owner: str, dependencies: List[str] = None, 
                           metadata: Dict[str, Any] = None) -> DataTransformation:
         """Add a data transformation"""
         try:
+            # Validate every endpoint up front so a transformation is added whole or not at all
+            for input_table in input_tables:
+                if input_table not in self.nodes:
+                    raise ValueError(f"Source node {input_table} not found")
+            for output_table in output_tables:
+                if output_table not in self.nodes:
+                    raise ValueError(f"Target node {output_table} not found")
+            
             now = datetime.now()
             
             transformation = DataTransformation(
@@ -248,51 +586,63 @@ class DataLineageTracker:
                 metadata=metadata or {}
             )
             
-            self.transformations[name] = transformation
-            
-            # Add edges for transformation
-            for input_table in input_tables:
-                for output_table in output_tables:
-                    self.add_data_edge(
-                        input_table, output_table, "transforms",
-                        f"Transformation: {name}", {"transformation": name}
-                    )
-            
-            logger.info(f"Added transformation: {name}")
+            self._index_transformation(transformation)
+            self._dirty_transformations.add(name)
+            
+            # Add edges for transformation in one batch
+            new_edges = [
+                DataEdge(
+                    source=input_table,
+                    target=output_table,
+                    relationship_type="transforms",
+                    transformation_logic=f"Transformation: {name}",
+                    created_at=now,
+                    metadata={"transformation": name}
+                )
+                for input_table in input_tables
+                for output_table in output_tables
+            ]
+            for edge in new_edges:
+                self._index_edge(edge)
+                self._dirty_edges.add(f"{edge.source}->{edge.target}")
+            self.graph.add_edges_from((edge.source, edge.target) for edge in new_edges)
+            if new_edges:
+                self._graph_changed()
+            
+            logger.debug("Added transformation: %s (%d edges)", name, len(new_edges))
             return transformation
             
         except Exception as e:
             logger.error(f"Failed to add transformation {name}: {e}")
             raise
     
+    def _lineage_report(self, node_name: str, upstream: bool, max_depth: int) -> Dict[str, Any]:
+        """Build one direction of a lineage report from the memoized reachability sets"""
+        direction = "upstream" if upstream else "downstream"
+        reachable = self._ancestors(node_name) if upstream else self._descendants(node_name)
+        adjacency = self._in_edges if upstream else self._out_edges
+        nodes = self.nodes
+        
+        # Nodes and edges are shared with the tracker rather than copied
+        lineage_edges = list(adjacency.get(node_name, ()))
+        for name in reachable:
+            lineage_edges.extend(adjacency.get(name, ()))
+        
+        return {
+            "node": nodes[node_name],
+            f"{direction}_nodes": [nodes[name] for name in reachable if name in nodes],
+            f"{direction}_edges": lineage_edges,
+            "depth": len(reachable),
+            "max_depth": max_depth
+        }
+    
     def get_upstream_lineage(self, node_name: str, max_depth: int = 5) -> Dict[str, Any]:
         """Get upstream lineage for a node"""
         try:
             if node_name not in self.nodes:
                 return {"error": f"Node {node_name} not found"}
             
-            upstream_nodes = []
-            upstream_edges = []
-            
-            # Get all predecessors
-            predecessors = list(nx.ancestors(self.graph, node_name))
-            
-            for pred in predecessors:
-                if pred in self.nodes:
-                    upstream_nodes.append(self.nodes[pred])
-            
-            # Get edges connecting upstream nodes
-            for edge_key, edge in self.edges.items():
-                if edge.target == node_name or edge.target in predecessors:
-                    upstream_edges.append(edge)
-            
-            return {
-                "node": self.nodes[node_name],
-                "upstream_nodes": upstream_nodes,
-                "upstream_edges": upstream_edges,
-                "depth": len(predecessors),
-                "max_depth": max_depth
-            }
+            return self._lineage_report(node_name, upstream=True, max_depth=max_depth)
             
         except Exception as e:
             logger.error(f"Failed to get upstream lineage for {node_name}: {e}")
@@ -304,28 +654,7 @@ class DataLineageTracker:
             if node_name not in self.nodes:
                 return {"error": f"Node {node_name} not found"}
             
-            downstream_nodes = []
-            downstream_edges = []
-            
-            # Get all successors
-            successors = list(nx.descendants(self.graph, node_name))
-            
-            for succ in successors:
-                if succ in self.nodes:
-                    downstream_nodes.append(self.nodes[succ])
-            
-            # Get edges connecting downstream nodes
-            for edge_key, edge in self.edges.items():
-                if edge.source == node_name or edge.source in successors:
-                    downstream_edges.append(edge)
-            
-            return {
-                "node": self.nodes[node_name],
-                "downstream_nodes": downstream_nodes,
-                "downstream_edges": downstream_edges,
-                "depth": len(successors),
-                "max_depth": max_depth
-            }
+            return self._lineage_report(node_name, upstream=False, max_depth=max_depth)
             
         except Exception as e:
             logger.error(f"Failed to get downstream lineage for {node_name}: {e}")
@@ -334,14 +663,19 @@ class DataLineageTracker:
     def get_full_lineage(self, node_name: str) -> Dict[str, Any]:
         """Get complete lineage (upstream and downstream) for a node"""
         try:
-            upstream = self.get_upstream_lineage(node_name)
-            downstream = self.get_downstream_lineage(node_name)
+            if node_name not in self.nodes:
+                missing = {"error": f"Node {node_name} not found"}
+                return {"node": None, "upstream": missing, "downstream": dict(missing), "total_nodes": 1}
+            
+            # One existence check and one pair of reachability lookups serve both directions
+            upstream = self._lineage_report(node_name, upstream=True, max_depth=5)
+            downstream = self._lineage_report(node_name, upstream=False, max_depth=5)
             
             return {
-                "node": self.nodes[node_name] if node_name in self.nodes else None,
+                "node": upstream["node"],
                 "upstream": upstream,
                 "downstream": downstream,
-                "total_nodes": len(upstream.get("upstream_nodes", [])) + len(downstream.get("downstream_nodes", [])) + 1
+                "total_nodes": len(upstream["upstream_nodes"]) + len(downstream["downstream_nodes"]) + 1
             }
             
         except Exception as e:
@@ -365,14 +699,14 @@ class DataLineageTracker:
             
             # Get transformations that would be affected
             affected_transformations = []
-            for trans_name, transformation in self.transformations.items():
-                if node_name in transformation.input_tables:
-                    affected_transformations.append({
-                        "name": transformation.name,
-                        "description": transformation.description,
-                        "type": transformation.transformation_type,
-                        "owner": transformation.owner
-                    })
+            for trans_name in self._trans_by_input.get(node_name, ()):
+                transformation = self.transformations[trans_name]
+                affected_transformations.append({
+                    "name": transformation.name,
+                    "description": transformation.description,
+                    "type": transformation.transformation_type,
+                    "owner": transformation.owner
+                })
             
             return {
                 "source_node": node_name,
@@ -385,23 +719,79 @@ class DataLineageTracker:
             logger.error(f"Failed to find impact analysis for {node_name}: {e}")
             return {"error": str(e)}
     
+    def _rx_topology(self):
+        """Copy the graph topology into a rustworkx digraph, with the index-to-name list"""
+        names = list(self.graph)
+        index = {name: i for i, name in enumerate(names)}
+        rx_graph = rx.PyDiGraph(multigraph=False)
+        rx_graph.add_nodes_from(names)
+        rx_graph.add_edges_from_no_data([(index[source], index[target]) for source, target in self.graph.edges()])
+        return rx_graph, names
+    
+    def _graph_statistics(self) -> Dict[str, Any]:
+        """Graph-wide report statistics, recomputed only when the graph version changes"""
+        if self._report_cache is not None and self._report_cache[0] == self._graph_version:
+            return self._copy_statistics(self._report_cache[1])
+        
+        # Find top nodes by connections
+        node_degrees = dict(self.graph.degree())
+        sorted_nodes = sorted(node_degrees.items(), key=lambda x: x[1], reverse=True)
+        
+        # Find circular dependencies; lineage is normally a DAG, so check that before
+        # enumerating cycles. rustworkx runs the whole-graph algorithms natively when present
+        if rx is not None:
+            rx_graph, names = self._rx_topology()
+            connected_components = rx.number_weakly_connected_components(rx_graph)
+            cycles = [] if rx.is_directed_acyclic_graph(rx_graph) else [
+                [names[index] for index in cycle] for cycle in rx.simple_cycles(rx_graph)
+            ]
+        else:
+            connected_components = nx.number_weakly_connected_components(self.graph)
+            cycles = [] if nx.is_directed_acyclic_graph(self.graph) else list(nx.simple_cycles(self.graph))
+        
+        stats = {
+            "connected_components": connected_components,
+            "density": nx.density(self.graph),
+            "top_nodes": [
+                {"name": name, "connections": degree}
+                for name, degree in sorted_nodes[:10]
+            ],
+            # Orphaned nodes have no connections
+            "orphaned_nodes": [name for name, degree in node_degrees.items() if degree == 0],
+            "cycles": cycles
+        }
+        self._report_cache = (self._graph_version, stats)
+        return self._copy_statistics(stats)
+    
+    @staticmethod
+    def _copy_statistics(stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy cached statistics so callers cannot mutate the memoized report"""
+        return {
+            **stats,
+            "top_nodes": [dict(entry) for entry in stats["top_nodes"]],
+            "orphaned_nodes": list(stats["orphaned_nodes"]),
+            "cycles": [list(cycle) for cycle in stats["cycles"]]
+        }
+    
     def generate_lineage_report(self) -> Dict[str, Any]:
         """Generate comprehensive lineage report"""
         try:
+            graph_stats = self._graph_statistics()
+            
             report = {
                 "timestamp": datetime.now().isoformat(),
                 "summary": {
                     "total_nodes": len(self.nodes),
                     "total_edges": len(self.edges),
                     "total_transformations": len(self.transformations),
-                    "graph_connected_components": nx.number_weakly_connected_components(self.graph),
-                    "graph_density": nx.density(self.graph)
+                    "graph_connected_components": graph_stats["connected_components"],
+                    "graph_density": graph_stats["density"]
                 },
                 "nodes_by_type": {},
                 "transformations_by_type": {},
-                "top_nodes_by_connections": [],
-                "orphaned_nodes": [],
-                "circular_dependencies": []
+                "top_nodes_by_connections": graph_stats["top_nodes"],
+                "orphaned_nodes": graph_stats["orphaned_nodes"],
+                "circular_dependencies": graph_stats["cycles"]
             }
             
             # Group nodes by type
@@ -418,69 +808,143 @@ class DataLineageTracker:
                     report["transformations_by_type"][trans_type] = 0
                 report["transformations_by_type"][trans_type] += 1
             
-            # Find top nodes by connections
-            node_degrees = dict(self.graph.degree())
-            sorted_nodes = sorted(node_degrees.items(), key=lambda x: x[1], reverse=True)
-            report["top_nodes_by_connections"] = [
-                {"name": name, "connections": degree} 
-                for name, degree in sorted_nodes[:10]
-            ]
-            
-            # Find orphaned nodes (no connections)
-            orphaned = [name for name, degree in node_degrees.items() if degree == 0]
-            report["orphaned_nodes"] = orphaned
-            
-            # Find circular dependencies
-            try:
-                cycles = list(nx.simple_cycles(self.graph))
-                report["circular_dependencies"] = cycles
-            except:
-                report["circular_dependencies"] = []
-            
             return report
             
         except Exception as e:
             logger.error(f"Failed to generate lineage report: {e}")
             return {"error": str(e)}
     
-    def export_lineage_graph(self, format: str = "json") -> str:
+    @staticmethod
+    def _to_columns(entity_type, entities) -> Dict[str, List[Any]]:
+        """Transpose dataclass instances into one list per field"""
+        entities = list(entities)
+        return {
+            field.name: [getattr(entity, field.name) for entity in entities]
+            for field in fields(entity_type)
+        }
+    
+    @staticmethod
+    def _write_columns(f, entity_type, entities):
+        """Stream one column-oriented entity table, encoding a single field at a time"""
+        entities = list(entities)
+        f.write(b'{')
+        for position, field in enumerate(fields(entity_type)):
+            if position:
+                f.write(b',')
+            f.write(_dumps(field.name) + b':')
+            f.write(_dumps([getattr(entity, field.name) for entity in entities]))
+        f.write(b'}')
+    
+    @staticmethod
+    def load_lineage_export(export_path: str) -> Dict[str, List[Any]]:
+        """Read a JSON lineage export back into nodes, edges and transformations"""
+        with open(export_path, 'rb') as f:
+            graph_data = orjson.loads(f.read()) if orjson is not None else json.load(f)
+        
+        # Timestamps stay ISO strings, as for lineage loaded from the changelogs
+        loaded = {}
+        for kind, entity_type in _EXPORT_TYPES.items():
+            columns = graph_data[kind]
+            names = graph_data["schema"][kind]
+            loaded[kind] = [entity_type(*values) for values in zip(*(columns[name] for name in names))]
+        
+        return loaded
+    
+    @staticmethod
+    def _export_attributes(entity) -> Dict[str, Any]:
+        """Flatten a dataclass into the scalar attributes graph file writers accept"""
+        attributes = {}
+        for field in fields(entity):
+            value = getattr(entity, field.name)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            elif isinstance(value, (list, dict)):
+                value = json.dumps(value, default=str)
+            elif value is None:
+                value = ""
+            attributes[field.name] = value
+        return attributes
+    
+    def _build_export_graph(self) -> nx.DiGraph:
+        """Build a throwaway graph carrying serializable node and edge attributes"""
+        export_graph = nx.DiGraph()
+        export_graph.add_nodes_from((name, self._export_attributes(node)) for name, node in self.nodes.items())
+        export_graph.add_edges_from(
+            (edge.source, edge.target, self._export_attributes(edge)) for edge in self.edges.values()
+        )
+        return export_graph
+    
+    def _write_graphml(self, export_path: str):
+        """Write GraphML directly from the fixed node and edge schemas"""
+        node_keys = [(f"n{i}", field.name) for i, field in enumerate(fields(DataNode))]
+        edge_keys = [(f"e{i}", field.name) for i, field in enumerate(fields(DataEdge))]
+        
+        def data_elements(keys, attributes):
+            return "".join(f'<data key="{key}">{escape(attributes[name])}</data>' for key, name in keys)
+        
+        with open(export_path, 'w', encoding='utf-8') as f:
+            f.write(
+                '<?xml version="1.0" encoding="utf-8"?>\n'
+                '<graphml xmlns="http://graphml.graphdrawing.org/xmlns" '
+                'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+                'xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns '
+                'http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd">\n'
+            )
+            for domain, keys in (("node", node_keys), ("edge", edge_keys)):
+                f.writelines(
+                    f'<key id="{key}" for="{domain}" attr.name="{name}" attr.type="string"/>\n'
+                    for key, name in keys
+                )
+            f.write('<graph edgedefault="directed">\n')
+            
+            f.writelines(
+                f'<node id={quoteattr(name)}>{data_elements(node_keys, self._export_attributes(node))}</node>\n'
+                for name, node in self.nodes.items()
+            )
+            f.writelines(
+                f'<edge source={quoteattr(edge.source)} target={quoteattr(edge.target)}>'
+                f'{data_elements(edge_keys, self._export_attributes(edge))}</edge>\n'
+                for edge in self.edges.values()
+            )
+            f.write('</graph>\n</graphml>\n')
+    
+    def export_lineage_graph(self, format: str = "json", indent: bool = False) -> str:
         """Export lineage graph in various formats"""
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             
             if format == "json":
-                # Export as JSON
-                graph_data = {
-                    "nodes": [asdict(node) for node in self.nodes.values()],
-                    "edges": [asdict(edge) for edge in self.edges.values()],
-                    "transformations": [asdict(trans) for trans in self.transformations.values()]
+                # Export column-oriented: one array per field instead of one object per entity
+                schema = {
+                    kind: [field.name for field in fields(entity_type)]
+                    for kind, entity_type in _EXPORT_TYPES.items()
                 }
-                
-                # Convert datetime objects to strings
-                for node in graph_data["nodes"]:
-                    node["created_at"] = node["created_at"].isoformat()
-                    node["updated_at"] = node["updated_at"].isoformat()
-                
-                for edge in graph_data["edges"]:
-                    edge["created_at"] = edge["created_at"].isoformat()
-                
-                for trans in graph_data["transformations"]:
-                    trans["created_at"] = trans["created_at"].isoformat()
-                    trans["updated_at"] = trans["updated_at"].isoformat()
+                entities = {"nodes": self.nodes, "edges": self.edges, "transformations": self.transformations}
                 
                 export_path = os.path.join(self.lineage_dir, f"lineage_export_{timestamp}.json")
-                with open(export_path, 'w') as f:
-                    json.dump(graph_data, f, indent=2, default=str)
+                with open(export_path, 'wb') as f:
+                    if indent:
+                        graph_data = {"schema": schema}
+                        for kind, entity_type in _EXPORT_TYPES.items():
+                            graph_data[kind] = self._to_columns(entity_type, entities[kind].values())
+                        f.write(_dumps(graph_data, indent=True))
+                    else:
+                        # Compact exports are framed by hand so only one column is encoded at a time
+                        f.write(b'{"schema":' + _dumps(schema))
+                        for kind, entity_type in _EXPORT_TYPES.items():
+                            f.write(b',' + _dumps(kind) + b':')
+                            self._write_columns(f, entity_type, entities[kind].values())
+                        f.write(b'}')
                 
             elif format == "graphml":
                 # Export as GraphML
                 export_path = os.path.join(self.lineage_dir, f"lineage_export_{timestamp}.graphml")
-                nx.write_graphml(self.graph, export_path)
+                self._write_graphml(export_path)
                 
             elif format == "gexf":
                 # Export as GEXF
                 export_path = os.path.join(self.lineage_dir, f"lineage_export_{timestamp}.gexf")
-                nx.write_gexf(self.graph, export_path)
+                nx.write_gexf(self._build_export_graph(), export_path)
                 
             else:
                 raise ValueError(f"Unsupported export format: {format}")
@@ -492,6 +956,26 @@ class DataLineageTracker:
             logger.error(f"Failed to export lineage graph: {e}")
             return ""
     
+    def _load_dependency_cache(self) -> Dict[str, List[str]]:
+        """Load model dependencies cached by content hash from earlier scans"""
+        cache_file = os.path.join(self.lineage_dir, "dbt_dependencies.json")
+        try:
+            with open(cache_file, 'rb') as f:
+                return _decode_record(f.read())
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable dependency cache {cache_file}: {e}")
+            return {}
+    
+    def _save_dependency_cache(self, known_dependencies: Dict[str, List[str]]):
+        """Persist model dependencies by content hash for the next scan"""
+        cache_file = os.path.join(self.lineage_dir, "dbt_dependencies.json")
+        tmp_file = cache_file + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(_dumps(known_dependencies))
+        os.replace(tmp_file, cache_file)
+    
     def scan_dbt_project(self, project_dir: str = ".") -> Dict[str, Any]:
         """Scan dbt project and build lineage automatically"""
         try:
@@ -504,47 +988,39 @@ class DataLineageTracker:
             
             scanned_models = []
             
-            # Walk through models directory
-            for root, dirs, files in os.walk(models_dir):
-                for file in files:
-                    if file.endswith('.sql'):
-                        model_path = os.path.join(root, file)
-                        model_name = file[:-4]  # Remove .sql extension
-                        
-                        # Determine model type based on directory
-                        relative_path = os.path.relpath(root, models_dir)
-                        if relative_path.startswith('staging'):
-                            model_type = 'staging'
-                        elif relative_path.startswith('marts'):
-                            model_type = 'mart'
-                        else:
-                            model_type = 'intermediate'
-                        
-                        # Read model content
-                        with open(model_path, 'r') as f:
-                            model_content = f.read()
-                        
-                        # Extract dependencies (basic parsing)
-                        dependencies = self._extract_dbt_dependencies(model_content)
-                        
-                        # Add model as transformation
-                        transformation = self.add_transformation(
-                            name=model_name,
-                            description=f"dbt model: {model_name}",
-                            input_tables=dependencies,
-                            output_tables=[model_name],
-                            transformation_type="dbt_model",
-                            logic=model_content,
-                            owner="dbt",
-                            metadata={"file_path": model_path, "model_type": model_type}
-                        )
-                        
-                        scanned_models.append({
-                            "name": model_name,
-                            "type": model_type,
-                            "path": model_path,
-                            "dependencies": dependencies
-                        })
+            # Parse model files, across processes for large projects; the results are
+            # applied to the lineage state here, in this process only
+            model_files = list(self._iter_sql_files(models_dir))
+            known_dependencies = self._load_dependency_cache()
+            if len(model_files) >= SCAN_PARALLEL_MIN_FILES:
+                with ProcessPoolExecutor(initializer=_set_known_dependencies, initargs=(known_dependencies,)) as executor:
+                    parsed_models = list(executor.map(_parse_model, model_files, chunksize=16))
+            else:
+                _set_known_dependencies(known_dependencies)
+                parsed_models = [_parse_model(model_file) for model_file in model_files]
+            
+            # Keep only the models present in this scan, so the cache tracks the project
+            self._save_dependency_cache({parsed[5]: parsed[3] for parsed in parsed_models})
+            
+            for model_path, model_name, model_type, dependencies, model_content, _ in parsed_models:
+                # Add model as transformation
+                transformation = self.add_transformation(
+                    name=model_name,
+                    description=f"dbt model: {model_name}",
+                    input_tables=dependencies,
+                    output_tables=[model_name],
+                    transformation_type="dbt_model",
+                    logic=model_content,
+                    owner="dbt",
+                    metadata={"file_path": model_path, "model_type": model_type}
+                )
+                
+                scanned_models.append({
+                    "name": model_name,
+                    "type": model_type,
+                    "path": model_path,
+                    "dependencies": dependencies
+                })
             
             # Save lineage data
             self._save_lineage_data()
@@ -560,23 +1036,23 @@ class DataLineageTracker:
             logger.error(f"Failed to scan dbt project: {e}")
             return {"error": str(e)}
     
+    def _iter_sql_files(self, directory: str, relative_path: str = "."):
+        """Yield (path, directory relative to the models root) for every .sql file below directory"""
+        subdirectories = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    subdirectories.append(entry)
+                elif entry.name.endswith('.sql') and entry.is_file():
+                    yield entry.path, relative_path
+        
+        for entry in subdirectories:
+            child_path = entry.name if relative_path == "." else os.path.join(relative_path, entry.name)
+            yield from self._iter_sql_files(entry.path, child_path)
+    
     def _extract_dbt_dependencies(self, model_content: str) -> List[str]:
         """Extract dependencies from dbt model content"""
-        dependencies = []
-        
-        # Look for ref() functions
-        import re
-        ref_pattern = r"\{\{\s*ref\(['\"]([^'\"]+)['\"]\)\s*\}\}"
-        ref_matches = re.findall(ref_pattern, model_content)
-        dependencies.extend(ref_matches)
-        
-        # Look for source() functions
-        source_pattern = r"\{\{\s*source\(['\"]([^'\"]+)['\"],\s*['\"]([^'\"]+)['\"]\)\s*\}\}"
-        source_matches = re.findall(source_pattern, model_content)
-        for source_name, table_name in source_matches:
-            dependencies.append(f"{source_name}.{table_name}")
-        
-        return list(set(dependencies))  # Remove duplicates
+        return _extract_dbt_dependencies(model_content)
 
 def main():
     """Main execution function"""
@@ -5,47 +5,107 @@ Data Quality Monitoring Script using Great Expectations
 
 import os
 import sys
+import json
 import logging
+import logging.handlers
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Tuple
 
-import great_expectations as ge
-from great_expectations.core.batch import RuntimeBatchRequest
-from great_expectations.data_context import BaseDataContext
-from great_expectations.data_context.types.base import DataContextConfig, FilesystemStoreBackendDefaults
+# Great Expectations and the Snowflake connector are imported where they are first
+# used, so --help and callers that never build a monitor don't pay for loading them
+if TYPE_CHECKING:
+    from great_expectations.data_context import BaseDataContext
 
-import snowflake.connector
-from snowflake.connector import DictCursor
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/data_quality.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Configure logging on this module's logger only, and only once. Handlers are attached
+# directly rather than through dictConfig, which would close every other handler in
+# the process (e.g. Airflow's task log handlers when imported into a worker)
 logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    for _log_handler in (
+        logging.handlers.RotatingFileHandler('logs/data_quality.log', maxBytes=10 * 1024 * 1024, backupCount=5),
+        logging.StreamHandler(sys.stdout)
+    ):
+        _log_handler.setFormatter(_log_formatter)
+        logger.addHandler(_log_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+# Per-table checks wait on Snowflake round-trips, so they run on a small thread pool
+MAX_CHECK_WORKERS = 8
+
+FRESHNESS_CHECKS = {
+    'stg_tpch_orders': {
+        'table': 'stg_tpch_orders',
+        'date_column': 'order_date',
+        'max_delay_hours': 24
+    },
+    'fct_orders': {
+        'table': 'fct_orders', 
+        'date_column': 'order_date',
+        'max_delay_hours': 25
+    }
+}
+
+VOLUME_CHECKS = {
+    'stg_tpch_orders': {
+        'table': 'stg_tpch_orders',
+        'expected_min_rows': 1000,
+        'expected_max_rows': 1000000
+    },
+    'fct_orders': {
+        'table': 'fct_orders',
+        'expected_min_rows': 1000,
+        'expected_max_rows': 1000000
+    }
+}
+
+def _dumps_pretty(value) -> bytes:
+    """Serialize results to indented JSON, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(
+            value, default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(value, indent=2, default=str).encode()
 
 class DataQualityMonitor:
     """Comprehensive data quality monitoring using Great Expectations"""
     
-    def __init__(self):
+    def __init__(self, rebuild_suites: bool = False):
+        self.rebuild_suites = rebuild_suites
         self.context = self._setup_great_expectations()
         self.snowflake_conn = self._setup_snowflake_connection()
+        # One cursor serves every query issued from the calling thread
+        self._cursor = self.snowflake_conn.cursor()
         
-    def _setup_great_expectations(self) -> BaseDataContext:
+        # Snowflake connections must not be shared across threads mid-query, so each
+        # pool worker opens its own connection and cursor on first use and keeps them
+        self._pool = ThreadPoolExecutor(max_workers=MAX_CHECK_WORKERS, thread_name_prefix="quality-check")
+        self._thread_state = threading.local()
+        self._worker_conns = []
+        self._worker_conns_lock = threading.Lock()
+        
+    def _setup_great_expectations(self) -> "BaseDataContext":
         """Initialize Great Expectations context"""
+        from great_expectations.data_context import BaseDataContext
+        from great_expectations.data_context.types.base import DataContextConfig
+        
         try:
             data_context_config = DataContextConfig(
                 config_version=3.0,
                 datasources={
-                    "snowflake_datasource": {
+                    "pandas_datasource": {
                         "class_name": "Datasource",
                         "execution_engine": {
-                            "class_name": "SqlAlchemyExecutionEngine",
-                            "connection_string": self._get_connection_string()
+                            "class_name": "PandasExecutionEngine"
                         },
                         "data_connectors": {
                             "default_runtime_data_connector": {
@@ -105,6 +165,8 @@ class DataQualityMonitor:
     
     def _setup_snowflake_connection(self):
         """Setup Snowflake connection"""
+        import snowflake.connector
+        
         try:
             conn = snowflake.connector.connect(
                 user=os.getenv('SNOWFLAKE_USER'),
@@ -113,7 +175,9 @@ class DataQualityMonitor:
                 warehouse=os.getenv('SNOWFLAKE_WAREHOUSE'),
                 database=os.getenv('SNOWFLAKE_DATABASE'),
                 schema=os.getenv('SNOWFLAKE_SCHEMA'),
-                role='dbt_role'
+                role='dbt_role',
+                # Arrow results let fetch_pandas_all build frames without per-row Python objects
+                session_parameters={'PYTHON_CONNECTOR_QUERY_RESULT_FORMAT': 'ARROW'}
             )
             logger.info("Snowflake connection established successfully")
             return conn
@@ -122,165 +186,279 @@ class DataQualityMonitor:
             logger.error(f"Failed to connect to Snowflake: {e}")
             raise
     
-    def _get_connection_string(self) -> str:
-        """Get Snowflake connection string for Great Expectations"""
-        return (
-            f"snowflake://{os.getenv('SNOWFLAKE_USER')}:{os.getenv('SNOWFLAKE_PASSWORD')}"
-            f"@{os.getenv('SNOWFLAKE_ACCOUNT')}/{os.getenv('SNOWFLAKE_DATABASE')}"
-            f"/{os.getenv('SNOWFLAKE_SCHEMA')}?warehouse={os.getenv('SNOWFLAKE_WAREHOUSE')}"
-            f"&role=dbt_role"
-        )
+    def _worker_cursor(self):
+        """Get the calling pool thread's own Snowflake cursor"""
+        cursor = getattr(self._thread_state, 'cursor', None)
+        if cursor is None:
+            conn = self._setup_snowflake_connection()
+            cursor = self._thread_state.cursor = conn.cursor()
+            with self._worker_conns_lock:
+                self._worker_conns.append((conn, cursor))
+        return cursor
+    
+    def _table_metrics_sql(self) -> str:
+        """Build the query returning freshness and volume metrics for every checked table"""
+        date_columns = {config['table']: config['date_column'] for config in FRESHNESS_CHECKS.values()}
+        tables = dict.fromkeys([config['table'] for config in FRESHNESS_CHECKS.values()] +
+                               [config['table'] for config in VOLUME_CHECKS.values()])
+        
+        # Each table is scanned once for all of its aggregates, and one UNION ALL
+        # covers every table in a single round-trip
+        selects = []
+        for table in tables:
+            date_column = date_columns.get(table)
+            freshness = (
+                f"MAX({date_column}) as latest_date, "
+                f"DATEDIFF('hour', MAX({date_column}), CURRENT_TIMESTAMP()) as hours_old"
+                if date_column else "NULL as latest_date, NULL as hours_old"
+            )
+            selects.append(f"SELECT '{table}' as table_name, {freshness}, COUNT(*) as row_count FROM {table}")
+        
+        return " UNION ALL ".join(selects)
+    
+    def _query_table_metrics(self) -> Dict[str, Tuple]:
+        """Fetch freshness and volume metrics for every checked table in one query"""
+        try:
+            cursor = self._cursor
+            cursor.execute(self._table_metrics_sql())
+            # Rows are (table_name, latest_date, hours_old, row_count)
+            return {row[0]: row[1:] for row in cursor.fetchall()}
+            
+        except Exception as e:
+            # One bad table fails the whole batch; callers check tables separately to isolate it
+            logger.warning(f"Batched table metrics query failed, checking tables individually: {e}")
+            return {}
+    
+    def _submit_table_metrics(self) -> Optional[str]:
+        """Start the table metrics query without waiting for it, returning its query id"""
+        try:
+            return self._cursor.execute_async(self._table_metrics_sql())['queryId']
+        except Exception as e:
+            logger.warning(f"Failed to submit table metrics query, checking tables individually: {e}")
+            return None
+    
+    def _collect_table_metrics(self, query_id: Optional[str]) -> Dict[str, Tuple]:
+        """Wait for a submitted table metrics query and fetch its rows"""
+        if query_id is None:
+            return {}
+        
+        try:
+            cursor = self._cursor
+            cursor.get_results_from_sfqid(query_id)
+            # Rows are (table_name, latest_date, hours_old, row_count)
+            return {row[0]: row[1:] for row in cursor.fetchall()}
+            
+        except Exception as e:
+            logger.warning(f"Batched table metrics query failed, checking tables individually: {e}")
+            return {}
     
-    def check_data_freshness(self) -> Dict[str, Any]:
+    def check_data_freshness(self, table_metrics: Dict[str, Tuple] = None) -> Dict[str, Any]:
         """Check data freshness for all tables"""
         logger.info("Checking data freshness...")
         
-        freshness_checks = {
-            'stg_tpch_orders': {
-                'table': 'stg_tpch_orders',
-                'date_column': 'order_date',
-                'max_delay_hours': 24
-            },
-            'fct_orders': {
-                'table': 'fct_orders', 
-                'date_column': 'order_date',
-                'max_delay_hours': 25
-            }
-        }
+        if table_metrics is None:
+            table_metrics = self._query_table_metrics()
+        # An empty result means the batched query failed
+        if not table_metrics:
+            return dict(self._pool.map(lambda item: self._run_single_freshness(*item), FRESHNESS_CHECKS.items()))
         
-        results = {}
+        return dict(
+            self._batched_freshness(check_name, config, table_metrics)
+            for check_name, config in FRESHNESS_CHECKS.items()
+        )
+    
+    def _freshness_result(self, check_name: str, config: Dict[str, Any], latest_date, hours_old) -> Dict[str, Any]:
+        """Evaluate one table's latest date and age against its configured delay"""
+        is_fresh = hours_old <= config['max_delay_hours']
         
-        for check_name, config in freshness_checks.items():
-            try:
-                query = f"""
-                SELECT MAX({config['date_column']}) as latest_date,
-                       DATEDIFF('hour', MAX({config['date_column']}), CURRENT_TIMESTAMP()) as hours_old
-                FROM {config['table']}
-                """
-                
-                cursor = self.snowflake_conn.cursor(DictCursor)
-                cursor.execute(query)
-                result = cursor.fetchone()
-                
-                is_fresh = result['hours_old'] <= config['max_delay_hours']
-                
-                results[check_name] = {
-                    'latest_date': str(result['latest_date']),
-                    'hours_old': result['hours_old'],
-                    'max_delay_hours': config['max_delay_hours'],
-                    'is_fresh': is_fresh,
-                    'status': 'PASS' if is_fresh else 'FAIL'
-                }
-                
-                logger.info(f"{check_name}: {'PASS' if is_fresh else 'FAIL'} - "
-                          f"Latest data: {result['latest_date']}, "
-                          f"Age: {result['hours_old']} hours")
-                
-            except Exception as e:
-                logger.error(f"Failed to check freshness for {check_name}: {e}")
-                results[check_name] = {
-                    'status': 'ERROR',
-                    'error': str(e)
-                }
+        logger.info(f"{check_name}: {'PASS' if is_fresh else 'FAIL'} - "
+                  f"Latest data: {latest_date}, "
+                  f"Age: {hours_old} hours")
         
-        return results
+        return {
+            'latest_date': str(latest_date),
+            'hours_old': hours_old,
+            'max_delay_hours': config['max_delay_hours'],
+            'is_fresh': is_fresh,
+            'status': 'PASS' if is_fresh else 'FAIL'
+        }
     
-    def check_data_volume(self) -> Dict[str, Any]:
+    def _batched_freshness(self, check_name: str, config: Dict[str, Any],
+                           table_metrics: Dict[str, Tuple]) -> Tuple[str, Dict[str, Any]]:
+        """Check one table's freshness from the batched table metrics"""
+        try:
+            latest_date, hours_old, _ = table_metrics[config['table']]
+            # An empty table has no latest date to age
+            if hours_old is None:
+                raise ValueError(f"no rows in {config['table']}")
+            
+            return check_name, self._freshness_result(check_name, config, latest_date, hours_old)
+            
+        except Exception as e:
+            logger.error(f"Failed to check freshness for {check_name}: {e}")
+            return check_name, {
+                'status': 'ERROR',
+                'error': str(e)
+            }
+    
+    def _run_single_freshness(self, check_name: str, config: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Check one table's freshness on the calling thread's connection"""
+        try:
+            query = f"""
+            SELECT MAX({config['date_column']}) as latest_date,
+                   DATEDIFF('hour', MAX({config['date_column']}), CURRENT_TIMESTAMP()) as hours_old
+            FROM {config['table']}
+            """
+            
+            cursor = self._worker_cursor()
+            cursor.execute(query)
+            
+            latest_date, hours_old = cursor.fetchone()
+            
+            return check_name, self._freshness_result(check_name, config, latest_date, hours_old)
+            
+        except Exception as e:
+            logger.error(f"Failed to check freshness for {check_name}: {e}")
+            return check_name, {
+                'status': 'ERROR',
+                'error': str(e)
+            }
+    
+    def check_data_volume(self, table_metrics: Dict[str, Tuple] = None) -> Dict[str, Any]:
         """Check data volume anomalies"""
         logger.info("Checking data volume...")
         
-        volume_checks = {
-            'stg_tpch_orders': {
-                'table': 'stg_tpch_orders',
-                'expected_min_rows': 1000,
-                'expected_max_rows': 1000000
-            },
-            'fct_orders': {
-                'table': 'fct_orders',
-                'expected_min_rows': 1000,
-                'expected_max_rows': 1000000
-            }
-        }
+        if table_metrics is None:
+            table_metrics = self._query_table_metrics()
+        # An empty result means the batched query failed
+        if not table_metrics:
+            return dict(self._pool.map(lambda item: self._run_single_volume(*item), VOLUME_CHECKS.items()))
         
-        results = {}
+        return dict(
+            self._batched_volume(check_name, config, table_metrics)
+            for check_name, config in VOLUME_CHECKS.items()
+        )
+    
+    def _volume_result(self, check_name: str, config: Dict[str, Any], row_count: int) -> Dict[str, Any]:
+        """Evaluate one table's row count against its expected range"""
+        is_valid = config['expected_min_rows'] <= row_count <= config['expected_max_rows']
         
-        for check_name, config in volume_checks.items():
-            try:
-                query = f"SELECT COUNT(*) as row_count FROM {config['table']}"
-                
-                cursor = self.snowflake_conn.cursor(DictCursor)
-                cursor.execute(query)
-                result = cursor.fetchone()
-                
-                row_count = result['row_count']
-                is_valid = config['expected_min_rows'] <= row_count <= config['expected_max_rows']
-                
-                results[check_name] = {
-                    'row_count': row_count,
-                    'expected_min': config['expected_min_rows'],
-                    'expected_max': config['expected_max_rows'],
-                    'is_valid': is_valid,
-                    'status': 'PASS' if is_valid else 'FAIL'
-                }
-                
-                logger.info(f"{check_name}: {'PASS' if is_valid else 'FAIL'} - "
-                          f"Row count: {row_count}")
-                
-            except Exception as e:
-                logger.error(f"Failed to check volume for {check_name}: {e}")
-                results[check_name] = {
-                    'status': 'ERROR',
-                    'error': str(e)
-                }
+        logger.info(f"{check_name}: {'PASS' if is_valid else 'FAIL'} - "
+                  f"Row count: {row_count}")
         
-        return results
+        return {
+            'row_count': row_count,
+            'expected_min': config['expected_min_rows'],
+            'expected_max': config['expected_max_rows'],
+            'is_valid': is_valid,
+            'status': 'PASS' if is_valid else 'FAIL'
+        }
+    
+    def _batched_volume(self, check_name: str, config: Dict[str, Any],
+                        table_metrics: Dict[str, Tuple]) -> Tuple[str, Dict[str, Any]]:
+        """Check one table's row count from the batched table metrics"""
+        try:
+            _, _, row_count = table_metrics[config['table']]
+            
+            return check_name, self._volume_result(check_name, config, row_count)
+            
+        except Exception as e:
+            logger.error(f"Failed to check volume for {check_name}: {e}")
+            return check_name, {
+                'status': 'ERROR',
+                'error': str(e)
+            }
+    
+    def _run_single_volume(self, check_name: str, config: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Check one table's row count on the calling thread's connection"""
+        try:
+            query = f"SELECT COUNT(*) as row_count FROM {config['table']}"
+            
+            cursor = self._worker_cursor()
+            cursor.execute(query)
+            
+            row_count, = cursor.fetchone()
+            
+            return check_name, self._volume_result(check_name, config, row_count)
+            
+        except Exception as e:
+            logger.error(f"Failed to check volume for {check_name}: {e}")
+            return check_name, {
+                'status': 'ERROR',
+                'error': str(e)
+            }
     
     def check_data_quality_with_great_expectations(self) -> Dict[str, Any]:
         """Run comprehensive data quality checks using Great Expectations"""
         logger.info("Running Great Expectations data quality checks...")
+        from great_expectations.core.batch import RuntimeBatchRequest
         
-        # Define data quality checks for each table
+        # Define data quality checks for each table. Each table is validated on a sample
+        # that lets Snowflake skip micro-partitions; a sample of None validates the full table
         quality_checks = {
-            'fct_orders': [
-                {
-                    'expectation': 'expect_column_to_exist',
-                    'column': 'order_key',
-                    'kwargs': {}
-                },
-                {
-                    'expectation': 'expect_column_values_to_not_be_null',
-                    'column': 'order_key',
-                    'kwargs': {}
-                },
-                {
-                    'expectation': 'expect_column_values_to_be_unique',
-                    'column': 'order_key',
-                    'kwargs': {}
-                },
-                {
-                    'expectation': 'expect_column_values_to_be_in_set',
-                    'column': 'status_code',
-                    'kwargs': {'value_set': ['P', 'O', 'F']}
-                },
-                {
-                    'expectation': 'expect_column_values_to_be_between',
-                    'column': 'total_price',
-                    'kwargs': {'min_value': 0, 'max_value': 1000000}
-                }
-            ]
+            'fct_orders': {
+                'sample': 'SAMPLE (10000 ROWS)',
+                'expectations': [
+                    {
+                        'expectation': 'expect_column_to_exist',
+                        'column': 'order_key',
+                        'kwargs': {}
+                    },
+                    {
+                        'expectation': 'expect_column_values_to_not_be_null',
+                        'column': 'order_key',
+                        'kwargs': {}
+                    },
+                    {
+                        'expectation': 'expect_column_values_to_be_unique',
+                        'column': 'order_key',
+                        'kwargs': {}
+                    },
+                    {
+                        'expectation': 'expect_column_values_to_be_in_set',
+                        'column': 'status_code',
+                        'kwargs': {'value_set': ['P', 'O', 'F']}
+                    },
+                    {
+                        'expectation': 'expect_column_values_to_be_between',
+                        'column': 'total_price',
+                        'kwargs': {'min_value': 0, 'max_value': 1000000}
+                    }
+                ]
+            }
         }
         
         results = {}
         
-        for table_name, expectations in quality_checks.items():
+        # Suites saved by an earlier run are validated as stored, without re-registering
+        # (and so re-running) every expectation against the batch first
+        saved_suites = set() if self.rebuild_suites else set(self.context.list_expectation_suite_names())
+        
+        for table_name, table_checks in quality_checks.items():
+            # Tables whose expectations all have SQL equivalents are checked with one
+            # aggregate query in Snowflake; Great Expectations validates the rest
+            native_results = self._run_native_quality_checks(table_name, table_checks)
+            if native_results is not None:
+                results[table_name] = native_results
+                continue
+            
             try:
+                suite_name = f"{table_name}_suite"
+                sample_clause = table_checks['sample']
+                query = f"SELECT * FROM {table_name} {sample_clause}" if sample_clause else f"SELECT * FROM {table_name}"
+                
+                # Fetch the sample as Arrow batches straight into a DataFrame and validate
+                # it in memory, instead of Great Expectations materializing Python rows
+                self._cursor.execute(query)
+                sample_frame = self._cursor.fetch_pandas_all()
+                
                 # Create batch request
                 batch_request = RuntimeBatchRequest(
-                    datasource_name="snowflake_datasource",
+                    datasource_name="pandas_datasource",
                     data_connector_name="default_runtime_data_connector",
                     data_asset_name=table_name,
                     runtime_parameters={
-                        "query": f"SELECT * FROM {table_name} LIMIT 10000"
+                        "batch_data": sample_frame
                     },
                     batch_identifiers={"default_identifier_name": "default_identifier"}
                 )
@@ -288,16 +466,18 @@ class DataQualityMonitor:
                 # Create validator
                 validator = self.context.get_validator(
                     batch_request=batch_request,
-                    expectation_suite_name=f"{table_name}_suite"
+                    expectation_suite_name=suite_name
                 )
                 
                 # Add expectations
-                for expectation_config in expectations:
-                    expectation_method = getattr(validator, expectation_config['expectation'])
-                    expectation_method(
-                        column=expectation_config['column'],
-                        **expectation_config['kwargs']
-                    )
+                if suite_name not in saved_suites:
+                    for expectation_config in table_checks['expectations']:
+                        expectation_method = getattr(validator, expectation_config['expectation'])
+                        expectation_method(
+                            column=expectation_config['column'],
+                            **expectation_config['kwargs']
+                        )
+                    validator.save_expectation_suite(discard_failed_expectations=False)
                 
                 # Run validation
                 validation_result = validator.validate()
@@ -305,6 +485,8 @@ class DataQualityMonitor:
                 results[table_name] = {
                     'success': validation_result.success,
                     'statistics': validation_result.statistics,
+                    'sample': sample_clause,
+                    'sampled_rows': len(sample_frame),
                     'results': [
                         {
                             'expectation_type': result.expectation_config.expectation_type,
@@ -326,28 +508,128 @@ class DataQualityMonitor:
         
         return results
     
+    @staticmethod
+    def _sql_literal(value) -> str:
+        """Render a Python scalar as a SQL literal"""
+        if isinstance(value, str):
+            return "'" + value.replace("'", "''") + "'"
+        return str(value)
+    
+    def _native_expectation_sql(self, expectation_config: Dict[str, Any]) -> Optional[str]:
+        """SQL aggregate counting the rows that violate an expectation, if it has one"""
+        column = expectation_config['column']
+        kwargs = expectation_config['kwargs']
+        expectation = expectation_config['expectation']
+        
+        if expectation == 'expect_column_to_exist':
+            # Nothing to count; referencing the column fails the query if it is missing
+            return f"0 * COUNT({column})"
+        if expectation == 'expect_column_values_to_not_be_null':
+            return f"COUNT_IF({column} IS NULL)"
+        if expectation == 'expect_column_values_to_be_unique':
+            return f"COUNT({column}) - COUNT(DISTINCT {column})"
+        if expectation == 'expect_column_values_to_be_in_set':
+            value_set = ", ".join(self._sql_literal(value) for value in kwargs['value_set'])
+            return f"COUNT_IF({column} IS NOT NULL AND {column} NOT IN ({value_set}))"
+        if expectation == 'expect_column_values_to_be_between':
+            bounds = []
+            if kwargs.get('min_value') is not None:
+                bounds.append(f"{column} < {self._sql_literal(kwargs['min_value'])}")
+            if kwargs.get('max_value') is not None:
+                bounds.append(f"{column} > {self._sql_literal(kwargs['max_value'])}")
+            return f"COUNT_IF({' OR '.join(bounds)})" if bounds else "0"
+        return None
+    
+    def _run_native_quality_checks(self, table_name: str, table_checks: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Evaluate a table's expectations as one pushed-down aggregate query"""
+        expectations = table_checks['expectations']
+        aggregates = [self._native_expectation_sql(expectation_config) for expectation_config in expectations]
+        if any(aggregate is None for aggregate in aggregates):
+            return None
+        
+        sample_clause = table_checks['sample']
+        columns = ", ".join(
+            ["COUNT(*) as element_count"] +
+            [f"{aggregate} as unexpected_{position}" for position, aggregate in enumerate(aggregates)]
+        )
+        query = f"SELECT {columns} FROM {table_name} {sample_clause}" if sample_clause else f"SELECT {columns} FROM {table_name}"
+        
+        try:
+            cursor = self._cursor
+            cursor.execute(query)
+            element_count, *unexpected_counts = cursor.fetchone()
+        except Exception as e:
+            # Great Expectations reports the failure per expectation
+            logger.warning(f"Native quality query failed for {table_name}, using Great Expectations: {e}")
+            return None
+        
+        expectation_results = []
+        for expectation_config, unexpected_count in zip(expectations, unexpected_counts):
+            if expectation_config['expectation'] == 'expect_column_to_exist':
+                result = {}
+            else:
+                result = {
+                    'element_count': element_count,
+                    'unexpected_count': unexpected_count,
+                    'unexpected_percent': 100.0 * unexpected_count / element_count if element_count else 0.0
+                }
+            expectation_results.append({
+                'expectation_type': expectation_config['expectation'],
+                'success': unexpected_count == 0,
+                'result': result
+            })
+        
+        successful = sum(1 for result in expectation_results if result['success'])
+        success = successful == len(expectation_results)
+        logger.info(f"{table_name}: {'PASS' if success else 'FAIL'}")
+        
+        return {
+            'success': success,
+            'statistics': {
+                'evaluated_expectations': len(expectation_results),
+                'successful_expectations': successful,
+                'unsuccessful_expectations': len(expectation_results) - successful,
+                'success_percent': 100.0 * successful / len(expectation_results) if expectation_results else None
+            },
+            'sample': sample_clause,
+            'sampled_rows': element_count,
+            'results': expectation_results
+        }
+    
     def run_all_checks(self) -> Dict[str, Any]:
         """Run all data quality checks"""
         logger.info("Starting comprehensive data quality monitoring...")
         
         start_time = datetime.now()
         
+        # Freshness and volume share one scan of each table. It is submitted without
+        # waiting, so the warehouse runs it while the quality queries execute on the same
+        # cursor; its rows are fetched by query id afterwards
+        query_id = self._submit_table_metrics()
+        quality_results = self.check_data_quality_with_great_expectations()
+        table_metrics = self._collect_table_metrics(query_id)
+        
         results = {
             'timestamp': start_time.isoformat(),
-            'freshness': self.check_data_freshness(),
-            'volume': self.check_data_volume(),
-            'quality': self.check_data_quality_with_great_expectations()
+            'freshness': self.check_data_freshness(table_metrics),
+            'volume': self.check_data_volume(table_metrics),
+            'quality': quality_results
         }
         
-        # Calculate overall status
-        all_checks_passed = True
-        for category in ['freshness', 'volume', 'quality']:
-            for check_name, check_result in results[category].items():
-                if check_result.get('status') == 'FAIL' or not check_result.get('success', True):
-                    all_checks_passed = False
-                    break
+        # Calculate overall status, stopping at the first failing check
+        first_failure = next(
+            (
+                f"{category}.{check_name}"
+                for category in ('freshness', 'volume', 'quality')
+                for check_name, check_result in results[category].items()
+                if check_result.get('status') == 'FAIL' or not check_result.get('success', True)
+            ),
+            None
+        )
+        if first_failure is not None:
+            logger.warning(f"First failing check: {first_failure}")
         
-        results['overall_status'] = 'PASS' if all_checks_passed else 'FAIL'
+        results['overall_status'] = 'PASS' if first_failure is None else 'FAIL'
         results['execution_time_seconds'] = (datetime.now() - start_time).total_seconds()
         
         logger.info(f"Data quality monitoring completed. Overall status: {results['overall_status']}")
@@ -356,35 +638,52 @@ class DataQualityMonitor:
     
     def close_connections(self):
         """Close database connections"""
+        self._pool.shutdown(wait=True)
+        with self._worker_conns_lock:
+            for conn, cursor in self._worker_conns:
+                cursor.close()
+                conn.close()
+            self._worker_conns.clear()
+        
         if self.snowflake_conn:
+            self._cursor.close()
             self.snowflake_conn.close()
             logger.info("Snowflake connection closed")
 
-def main():
-    """Main execution function"""
+def run_quality_checks(rebuild_suites: bool = False) -> Dict[str, Any]:
+    """Run all checks in-process, save the results and raise if any check failed"""
+    monitor = DataQualityMonitor(rebuild_suites=rebuild_suites)
     try:
-        monitor = DataQualityMonitor()
         results = monitor.run_all_checks()
         
         # Save results to file
-        import json
-        with open('logs/data_quality_results.json', 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        with open('logs/data_quality_results.json', 'wb') as f:
+            f.write(_dumps_pretty(results))
         
-        # Exit with error code if any checks failed
         if results['overall_status'] == 'FAIL':
-            logger.error("Data quality checks failed!")
-            sys.exit(1)
-        else:
-            logger.info("All data quality checks passed!")
-            sys.exit(0)
-            
+            raise RuntimeError("Data quality checks failed!")
+        
+        logger.info("All data quality checks passed!")
+        return results
+    finally:
+        monitor.close_connections()
+
+def main():
+    """Main execution function"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Data Quality Monitoring')
+    parser.add_argument('--rebuild-suite', action='store_true',
+                       help='Re-register expectations and overwrite the saved expectation suites')
+    
+    args = parser.parse_args()
+    
+    try:
+        run_quality_checks(rebuild_suites=args.rebuild_suite)
+        sys.exit(0)
     except Exception as e:
         logger.error(f"Data quality monitoring failed: {e}")
         sys.exit(1)
-    finally:
-        if 'monitor' in locals():
-            monitor.close_connections()
 
 if __name__ == "__main__":
     main()
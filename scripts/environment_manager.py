@@ -8,21 +8,54 @@ import os
 import sys
 import yaml
 import logging
-from typing import Dict, Any, Optional
+import logging.handlers
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 import subprocess
 import json
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/environment_manager.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# libyaml's C parser when PyYAML was built with it, else the pure-Python one
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Lines of dbt output repeated in the error log when a command fails
+DBT_ERROR_TAIL_LINES = 50
+
+# Configure logging on this module's logger only, and only once. Handlers are attached
+# directly rather than through dictConfig, which would close every other handler in
+# the process (e.g. Airflow's task log handlers when imported into a worker)
 logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    for _log_handler in (
+        logging.handlers.RotatingFileHandler('logs/environment_manager.log', maxBytes=10 * 1024 * 1024, backupCount=5),
+        logging.StreamHandler(sys.stdout)
+    ):
+        _log_handler.setFormatter(_log_formatter)
+        logger.addHandler(_log_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+@lru_cache(maxsize=16)
+def _load_yaml(path: str, mtime: float) -> Dict[str, Any]:
+    """Parse a YAML file once per path and modification time"""
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+def _dumps_pretty(value) -> str:
+    """Serialize a value to indented JSON text, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value, indent=2, default=str)
 
 class EnvironmentManager:
     """Manages different environments and their configurations"""
@@ -31,12 +64,14 @@ class EnvironmentManager:
         self.config_file = config_file
         self.config = self._load_config()
         self.current_env = os.getenv('ENVIRONMENT', 'development')
+        # Merged configuration per environment, built on first lookup
+        self._env_cache: Dict[str, Dict[str, Any]] = {}
         
     def _load_config(self) -> Dict[str, Any]:
         """Load environment configuration from YAML file"""
         try:
-            with open(self.config_file, 'r') as f:
-                config = yaml.safe_load(f)
+            # Unchanged files are parsed once per process, however many managers load them
+            config = _load_yaml(self.config_file, os.path.getmtime(self.config_file))
             logger.info(f"Loaded configuration from {self.config_file}")
             return config
         except FileNotFoundError:
@@ -46,10 +81,19 @@ class EnvironmentManager:
             logger.error(f"Failed to parse configuration file: {e}")
             return {}
     
+    def reload(self) -> None:
+        """Re-read the configuration file and drop merged environment configs"""
+        self.config = self._load_config()
+        self._env_cache.clear()
+    
     def get_environment_config(self, env_name: Optional[str] = None) -> Dict[str, Any]:
         """Get configuration for a specific environment"""
         env_name = env_name or self.current_env
         
+        cached = self._env_cache.get(env_name)
+        if cached is not None:
+            return cached
+        
         if env_name not in self.config.get('environments', {}):
             logger.error(f"Environment '{env_name}' not found in configuration")
             return {}
@@ -61,17 +105,26 @@ class EnvironmentManager:
             common_config = self.config['global']['common']
             env_config = self._deep_merge(env_config, common_config)
         
+        self._env_cache[env_name] = env_config
         return env_config
     
-    def _deep_merge(self, base: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _deep_merge(base: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
         """Deep merge two dictionaries"""
         result = base.copy()
         
-        for key, value in update.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._deep_merge(result[key], value)
-            else:
-                result[key] = value
+        # Walk nested dicts with an explicit stack, copying only the dicts on merged
+        # paths so the loaded configuration itself is never modified
+        stack = [(result, update)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                current = target.get(key)
+                if isinstance(current, dict) and isinstance(value, dict):
+                    target[key] = current = current.copy()
+                    stack.append((current, value))
+                else:
+                    target[key] = value
         
         return result
     
@@ -111,14 +164,8 @@ class EnvironmentManager:
         if not env_config:
             return False
         
-        required_vars = [
-            f'SNOWFLAKE_ACCOUNT_{env_name.upper()}',
-            f'SNOWFLAKE_USER_{env_name.upper()}',
-            f'SNOWFLAKE_PASSWORD_{env_name.upper()}'
-        ]
-        
         missing_vars = []
-        for var in required_vars:
+        for var in self._required_variables(env_name):
             if not os.getenv(var):
                 missing_vars.append(var)
         
@@ -129,6 +176,15 @@ class EnvironmentManager:
         logger.info(f"Environment '{env_name}' validation passed")
         return True
     
+    @staticmethod
+    def _required_variables(env_name: str) -> List[str]:
+        """Environment variables that must be set to use an environment"""
+        return [
+            f'SNOWFLAKE_ACCOUNT_{env_name.upper()}',
+            f'SNOWFLAKE_USER_{env_name.upper()}',
+            f'SNOWFLAKE_PASSWORD_{env_name.upper()}'
+        ]
+    
     def run_dbt_command(self, command: str, env_name: Optional[str] = None) -> bool:
         """Run dbt command for specific environment"""
         env_name = env_name or self.current_env
@@ -138,27 +194,37 @@ class EnvironmentManager:
         
         self.set_environment_variables(env_name)
         
-        # Build dbt command
-        dbt_cmd = f"dbt {command} --target {env_name}"
-        
-        try:
-            logger.info(f"Running dbt command: {dbt_cmd}")
-            result = subprocess.run(
-                dbt_cmd.split(),
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            logger.info("dbt command completed successfully")
-            logger.info(f"Output: {result.stdout}")
-            
-            return True
-            
-        except subprocess.CalledProcessError as e:
-            logger.error(f"dbt command failed: {e}")
-            logger.error(f"Error output: {e.stderr}")
+        return self._run_dbt_argv(["dbt", *command.split(), "--target", env_name])
+    
+    def _run_dbt_argv(self, argv: List[str]) -> bool:
+        """Run a dbt command line in an already validated and configured environment"""
+        dbt_cmd = " ".join(argv)
+        
+        logger.info(f"Running dbt command: {dbt_cmd}")
+        
+        # Stream output line by line as dbt writes it rather than buffering all of it;
+        # only the tail is kept, for the failure report
+        output_tail = deque(maxlen=DBT_ERROR_TAIL_LINES)
+        with subprocess.Popen(
+            argv,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
+        ) as process:
+            for line in process.stdout:
+                line = line.rstrip()
+                logger.info(f"dbt: {line}")
+                output_tail.append(line)
+            returncode = process.wait()
+        
+        if returncode != 0:
+            logger.error(f"dbt command failed with exit code {returncode}: {dbt_cmd}")
+            logger.error("Error output: " + "\n".join(output_tail))
             return False
+        
+        logger.info("dbt command completed successfully")
+        return True
     
     def deploy_to_environment(self, env_name: str) -> bool:
         """Deploy the project to a specific environment"""
@@ -180,8 +246,10 @@ class EnvironmentManager:
             "docs generate"  # Generate documentation
         ]
         
+        # Validation and environment variables above hold for every command
+        target_args = ["--target", env_name]
         for cmd in commands:
-            if not self.run_dbt_command(cmd, env_name):
+            if not self._run_dbt_argv(["dbt", *cmd.split(), *target_args]):
                 logger.error(f"Deployment failed at command: {cmd}")
                 return False
         
@@ -195,8 +263,12 @@ class EnvironmentManager:
         print("\nAvailable Environments:")
         print("=" * 50)
         
+        # Only name and description are shown, so the raw entries are read without
+        # merging, and variables are checked against one snapshot of the environment
+        set_vars = {name for name, value in os.environ.items() if value}
+        
         for env_name, env_config in environments.items():
-            status = "✓" if self.validate_environment(env_name) else "✗"
+            status = "✓" if set_vars.issuperset(self._required_variables(env_name)) else "✗"
             name = env_config.get('name', env_name)
             description = env_config.get('description', 'No description')
             
@@ -318,7 +390,7 @@ def main():
         elif args.action == 'status':
             env_name = args.env or manager.current_env
             status = manager.get_environment_status(env_name)
-            print(json.dumps(status, indent=2, default=str))
+            print(_dumps_pretty(status))
             
         elif args.action == 'script':
             env_name = args.env or manager.current_env
@@ -6,30 +6,79 @@ Provides centralized error handling, logging, and monitoring capabilities
 
 import os
 import sys
+import re
 import json
+import queue
+import atexit
+import asyncio
 import logging
+import logging.handlers
 import traceback
 import functools
+from collections import Counter, OrderedDict, deque
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Callable, Union
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 import threading
-import queue
 import time
+import secrets
+import itertools
 from pathlib import Path
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/error_handler.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Configure logging. Callers only put records on a queue; a listener thread formats
+# them and does the file and console writes, so logging never blocks on I/O
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_file_handler = logging.FileHandler('logs/error_handler.log')
+_log_file_handler.setFormatter(_log_formatter)
+_log_console_handler = logging.StreamHandler(sys.stdout)
+_log_console_handler.setFormatter(_log_formatter)
+
+_log_queue = queue.SimpleQueue()
+_log_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_log_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, _log_file_handler, _log_console_handler, respect_handler_level=True
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+logging.basicConfig(level=logging.INFO, handlers=[_log_queue_handler])
 logger = logging.getLogger(__name__)
 
+# Errors beyond this many waiting to be processed are dropped rather than buffered
+ERROR_QUEUE_SIZE = 10000
+
+# How often changed error patterns are written back to disk
+PATTERN_FLUSH_SECONDS = 5
+
+# Notifications are coalesced and sent together once this many are waiting, or this
+# long after the first of them, whichever comes first
+NOTIFICATION_BATCH_SIZE = 25
+NOTIFICATION_BATCH_SECONDS = 2
+
+# Longest the exit hook waits on the processing loop for each step of its final flush
+EXIT_FLUSH_SECONDS = 10
+
+# Severities with an hourly alert threshold, and the config key holding it
+ALERT_THRESHOLD_KEYS = {
+    'critical': 'critical_errors_per_hour',
+    'high': 'high_errors_per_hour',
+    'medium': 'medium_errors_per_hour'
+}
+
+# Trailing windows reported under recent_errors in the error statistics, in seconds
+STATISTICS_WINDOWS = {
+    'last_hour': 3600,
+    'last_day': 86400,
+    'last_week': 604800
+}
+
 class ErrorSeverity(Enum):
     """Error severity levels"""
     LOW = "low"
@@ -50,6 +99,39 @@ class ErrorCategory(Enum):
     EXTERNAL_SERVICE = "external_service"
     PERFORMANCE = "performance"
 
+# Message keywords for each category, in the order they take precedence when a message
+# mentions several. The lookahead lets one scan find keywords even where they overlap
+CATEGORY_KEYWORDS = [
+    (ErrorCategory.NETWORK, ['connection', 'network']),
+    (ErrorCategory.DATABASE, ['database', 'sql']),
+    (ErrorCategory.AUTHENTICATION, ['auth', 'login']),
+    (ErrorCategory.AUTHORIZATION, ['permission', 'access']),
+    (ErrorCategory.CONFIGURATION, ['config', 'setting']),
+    (ErrorCategory.DATA_QUALITY, ['data', 'quality']),
+    (ErrorCategory.PERFORMANCE, ['performance', 'timeout']),
+    (ErrorCategory.EXTERNAL_SERVICE, ['external', 'api'])
+]
+CATEGORY_PATTERN = re.compile(
+    "(?=" + "|".join(f"({'|'.join(keywords)})" for _, keywords in CATEGORY_KEYWORDS) + ")",
+    re.IGNORECASE
+)
+
+# Severity by exception class name; anything not listed, directly or through a base
+# class, is LOW
+SEVERITY_BY_ERROR_TYPE = {
+    'SystemExit': ErrorSeverity.CRITICAL,
+    'KeyboardInterrupt': ErrorSeverity.CRITICAL,
+    'MemoryError': ErrorSeverity.CRITICAL,
+    'ConnectionError': ErrorSeverity.HIGH,
+    'TimeoutError': ErrorSeverity.HIGH,
+    'PermissionError': ErrorSeverity.HIGH,
+    'FileNotFoundError': ErrorSeverity.HIGH,
+    'ValueError': ErrorSeverity.MEDIUM,
+    'TypeError': ErrorSeverity.MEDIUM,
+    'KeyError': ErrorSeverity.MEDIUM,
+    'AttributeError': ErrorSeverity.MEDIUM
+}
+
 @dataclass
 class ErrorContext:
     """Context information for errors"""
@@ -79,6 +161,39 @@ class ErrorRecord:
     assigned_to: Optional[str] = None
     tags: List[str] = None
     metadata: Dict[str, Any] = None
+    # The raised exception, held only until the processing loop formats stack_trace
+    exception: Optional[BaseException] = field(default=None, repr=False, compare=False)
+
+class WindowCounter:
+    """Count of events over a trailing window of time.monotonic() seconds
+
+    Events are tallied in per-minute buckets, so memory is bounded by the window's
+    length in minutes and a count may include up to a minute of just-expired events.
+    """
+    
+    def __init__(self, length: float):
+        self.length = length
+        self._buckets = deque()  # [minute, count] pairs, oldest first
+        self._total = 0
+        self._lock = threading.Lock()
+    
+    def add(self, now: float):
+        """Count one event at monotonic time now"""
+        minute = int(now // 60)
+        with self._lock:
+            if self._buckets and self._buckets[-1][0] == minute:
+                self._buckets[-1][1] += 1
+            else:
+                self._buckets.append([minute, 1])
+            self._total += 1
+    
+    def count(self, now: float) -> int:
+        """Number of events in the window ending at monotonic time now"""
+        cutoff_minute = int((now - self.length) // 60)
+        with self._lock:
+            while self._buckets and self._buckets[0][0] < cutoff_minute:
+                self._total -= self._buckets.popleft()[1]
+            return self._total
 
 class ErrorHandler:
     """Comprehensive error handling and logging system"""
@@ -86,18 +201,48 @@ class ErrorHandler:
     def __init__(self, config_file: str = "config/error_handling.yml"):
         self.config_file = config_file
         self.config = self._load_config()
-        self.error_queue = queue.Queue()
-        self.error_records: Dict[str, ErrorRecord] = {}
+        # Records are kept in arrival order, so the oldest are always at the front
+        self.error_records: OrderedDict[str, ErrorRecord] = OrderedDict()
         self.error_patterns: Dict[str, Dict[str, Any]] = {}
         self.alert_thresholds = self.config.get('alert_thresholds', {})
         self.retry_configs = self.config.get('retry_configs', {})
         
-        # Initialize error processing thread
-        self.processing_thread = threading.Thread(target=self._process_errors, daemon=True)
-        self.processing_thread.start()
+        # Error ids are a per-handler random prefix plus a sequence number: unique even
+        # when errors arrive in the same second, and across restarts
+        self._error_id_prefix = f"ERR_{secrets.token_hex(4)}_"
+        self._error_ids = itertools.count(1)
+        
+        # The last hour's errors for each thresholded severity
+        self._recent_errors = {severity: WindowCounter(3600) for severity in ALERT_THRESHOLD_KEYS}
+        
+        # Running totals behind get_error_statistics, kept in step with error_records
+        self._severity_counts = Counter()
+        self._category_counts = Counter()
+        self._statistics_windows = {window: WindowCounter(length) for window, length in STATISTICS_WINDOWS.items()}
         
-        # Load existing error patterns
+        # Load existing error patterns. Updates only mark them dirty; a background task
+        # on the processing loop writes them out at most every PATTERN_FLUSH_SECONDS
         self._load_error_patterns()
+        self._patterns_dirty = False
+        
+        # Errors are processed on an asyncio loop in a dedicated thread: the worker parks
+        # on the queue instead of polling it, and notifications run in worker threads
+        # so their HTTP/SMTP calls overlap rather than stalling the next error
+        self._loop = asyncio.new_event_loop()
+        self._background_tasks = set()
+        self._alert_manager = None
+        self._pending_alerts = []
+        self._alert_flush_timer = None
+        self._exiting = False
+        self.processing_thread = threading.Thread(target=self._loop.run_forever, daemon=True, name="error-handler")
+        self.processing_thread.start()
+        self.error_queue = asyncio.run_coroutine_threadsafe(self._create_queue(), self._loop).result()
+        asyncio.run_coroutine_threadsafe(self._process_errors(), self._loop)
+        asyncio.run_coroutine_threadsafe(self._flush_error_patterns(), self._loop)
+        
+        # The loop thread is a daemon and batches wait on timers, so whatever is still
+        # queued or batched when the interpreter exits is finished by this hook
+        atexit.register(self._flush_on_exit)
         
         logger.info("Error handler initialized successfully")
     
@@ -160,41 +305,112 @@ class ErrorHandler:
         patterns_file = "data/error_patterns.json"
         try:
             if os.path.exists(patterns_file):
-                with open(patterns_file, 'r') as f:
-                    self.error_patterns = json.load(f)
+                with open(patterns_file, 'rb') as f:
+                    self.error_patterns = orjson.loads(f.read()) if orjson is not None else json.load(f)
+                
+                # Older files list contexts as [{'context': ..., 'count': ...}]; they are
+                # now a mapping of context to count
+                for pattern in self.error_patterns.values():
+                    contexts = pattern.get('common_contexts')
+                    if isinstance(contexts, list):
+                        pattern['common_contexts'] = {ctx['context']: ctx['count'] for ctx in contexts}
             else:
                 self.error_patterns = {}
         except Exception as e:
             logger.error(f"Failed to load error patterns: {e}")
             self.error_patterns = {}
     
-    def _save_error_patterns(self):
-        """Save error patterns"""
+    def _serialize_error_patterns(self) -> bytes:
+        """Serialize error patterns to compact JSON"""
+        if orjson is not None:
+            return orjson.dumps(self.error_patterns, default=str)
+        return json.dumps(self.error_patterns, separators=(',', ':'), default=str).encode()
+    
+    def _save_error_patterns(self, data: bytes):
+        """Save serialized error patterns"""
         patterns_file = "data/error_patterns.json"
         try:
             os.makedirs(os.path.dirname(patterns_file), exist_ok=True)
-            with open(patterns_file, 'w') as f:
-                json.dump(self.error_patterns, f, indent=2, default=str)
+            # Written to a temporary file and swapped into place, so a crash mid-write
+            # leaves the previous file intact
+            tmp_file = patterns_file + ".tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_file, patterns_file)
         except Exception as e:
             logger.error(f"Failed to save error patterns: {e}")
     
-    def _process_errors(self):
+    def _take_dirty_patterns(self) -> Optional[bytes]:
+        """Serialize the error patterns if they changed since the last flush; runs on the loop"""
+        # Serialized on the loop, where the patterns are updated, so the snapshot is consistent
+        if not self._patterns_dirty:
+            return None
+        self._patterns_dirty = False
+        return self._serialize_error_patterns()
+    
+    async def _flush_error_patterns(self):
+        """Write error patterns to disk whenever they changed since the last flush"""
+        while True:
+            await asyncio.sleep(PATTERN_FLUSH_SECONDS)
+            # The exit hook does the final flush; worker threads can't start by then
+            if self._exiting:
+                return
+            
+            try:
+                data = self._take_dirty_patterns()
+                if data is not None:
+                    # Only the file write moves to a worker thread
+                    await asyncio.to_thread(self._save_error_patterns, data)
+            except Exception as e:
+                logger.error(f"Failed to flush error patterns: {e}")
+    
+    async def _create_queue(self) -> asyncio.Queue:
+        """Create the error queue on the processing loop it belongs to"""
+        return asyncio.Queue(maxsize=ERROR_QUEUE_SIZE)
+    
+    def _enqueue(self, error_record: ErrorRecord):
+        """Put an error record on the queue; runs on the processing loop"""
+        try:
+            self.error_queue.put_nowait(error_record)
+        except asyncio.QueueFull:
+            logger.warning(f"Error queue full, dropping error record {error_record.id}")
+    
+    def _spawn(self, coro):
+        """Schedule a coroutine on the processing loop, keeping it referenced until done"""
+        task = self._loop.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    async def _process_errors(self):
         """Process errors from the queue"""
+        # The worker parks on the queue until a record arrives; _handle_error_record
+        # logs its own failures, so nothing here needs to catch them
         while True:
+            error_record = await self.error_queue.get()
             try:
-                error_record = self.error_queue.get(timeout=1)
                 self._handle_error_record(error_record)
+            finally:
                 self.error_queue.task_done()
-            except queue.Empty:
-                continue
-            except Exception as e:
-                logger.error(f"Error processing error record: {e}")
     
     def _handle_error_record(self, error_record: ErrorRecord):
         """Handle a single error record"""
         try:
+            self._format_stack_trace(error_record)
+            
             # Store error record
+            replaced = self.error_records.get(error_record.id)
+            if replaced is not None:
+                self._uncount_record(replaced)
             self.error_records[error_record.id] = error_record
+            self.error_records.move_to_end(error_record.id)
+            self._severity_counts[error_record.severity] += 1
+            self._category_counts[error_record.category] += 1
+            now = time.monotonic()
+            for window in self._statistics_windows.values():
+                window.add(now)
+            recent = self._recent_errors.get(error_record.severity.value)
+            if recent is not None:
+                recent.add(now)
             
             # Update error patterns
             self._update_error_patterns(error_record)
@@ -215,6 +431,13 @@ class ErrorHandler:
         except Exception as e:
             logger.error(f"Failed to handle error record: {e}")
     
+    def _format_stack_trace(self, error_record: ErrorRecord):
+        """Format a record's stack trace and release the exception it came from"""
+        error = error_record.exception
+        if error is not None:
+            error_record.stack_trace = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+            error_record.exception = None
+    
     def _update_error_patterns(self, error_record: ErrorRecord):
         """Update error patterns for analysis"""
         pattern_key = f"{error_record.category.value}_{error_record.error_type}"
@@ -227,7 +450,7 @@ class ErrorHandler:
                 'severity': error_record.severity.value,
                 'category': error_record.category.value,
                 'error_type': error_record.error_type,
-                'common_contexts': []
+                'common_contexts': {}
             }
         
         pattern = self.error_patterns[pattern_key]
@@ -236,49 +459,21 @@ class ErrorHandler:
         
         # Track common contexts
         context_key = f"{error_record.context.component}_{error_record.context.operation}"
-        context_found = False
-        for ctx in pattern['common_contexts']:
-            if ctx['context'] == context_key:
-                ctx['count'] += 1
-                context_found = True
-                break
-        
-        if not context_found:
-            pattern['common_contexts'].append({
-                'context': context_key,
-                'count': 1
-            })
+        contexts = pattern['common_contexts']
+        contexts[context_key] = contexts.get(context_key, 0) + 1
         
-        # Save patterns periodically
-        if pattern['count'] % 10 == 0:
-            self._save_error_patterns()
+        self._patterns_dirty = True
     
     def _check_alert_thresholds(self, error_record: ErrorRecord):
         """Check if error thresholds are exceeded"""
         try:
-            # Count errors in the last hour
-            cutoff_time = datetime.now() - timedelta(hours=1)
-            recent_errors = [
-                record for record in self.error_records.values()
-                if record.timestamp > cutoff_time
-            ]
-            
-            # Count by severity
-            severity_counts = {}
-            for record in recent_errors:
-                severity = record.severity.value
-                severity_counts[severity] = severity_counts.get(severity, 0) + 1
-            
-            # Check thresholds
-            for severity, threshold_key in [
-                ('critical', 'critical_errors_per_hour'),
-                ('high', 'high_errors_per_hour'),
-                ('medium', 'medium_errors_per_hour')
-            ]:
-                if severity in severity_counts:
+            now = time.monotonic()
+            for severity, threshold_key in ALERT_THRESHOLD_KEYS.items():
+                count = self._recent_errors[severity].count(now)
+                if count:
                     threshold = self.alert_thresholds.get(threshold_key, float('inf'))
-                    if severity_counts[severity] >= threshold:
-                        self._trigger_threshold_alert(severity, severity_counts[severity], threshold)
+                    if count >= threshold:
+                        self._trigger_threshold_alert(severity, count, threshold)
                         
         except Exception as e:
             logger.error(f"Failed to check alert thresholds: {e}")
@@ -323,9 +518,7 @@ class ErrorHandler:
         """Send error notifications"""
         try:
             # Import notification modules
-            from send_alerts import AlertManager, Alert, AlertType, AlertSeverity
-            
-            alert_manager = AlertManager()
+            from send_alerts import Alert, AlertType, AlertSeverity
             
             # Map error severity to alert severity
             severity_mapping = {
@@ -350,7 +543,7 @@ class ErrorHandler:
                 }
             )
             
-            alert_manager.send_alert(alert)
+            self._queue_alert(alert)
             
         except Exception as e:
             logger.error(f"Failed to send error notifications: {e}")
@@ -358,9 +551,7 @@ class ErrorHandler:
     def _send_alert_notification(self, severity: str, message: str, count: int, threshold: int):
         """Send threshold alert notification"""
         try:
-            from send_alerts import AlertManager, Alert, AlertType, AlertSeverity
-            
-            alert_manager = AlertManager()
+            from send_alerts import Alert, AlertType, AlertSeverity
             
             alert = Alert(
                 type=AlertType.SYSTEM,
@@ -376,31 +567,103 @@ class ErrorHandler:
                 }
             )
             
-            alert_manager.send_alert(alert)
+            self._queue_alert(alert)
             
         except Exception as e:
             logger.error(f"Failed to send threshold alert: {e}")
     
+    def _queue_alert(self, alert):
+        """Hold an alert for the next batch; runs on the processing loop"""
+        if self._alert_manager is None:
+            from send_alerts import AlertManager
+            self._alert_manager = AlertManager()
+        
+        self._pending_alerts.append(alert)
+        if len(self._pending_alerts) >= NOTIFICATION_BATCH_SIZE:
+            self._flush_alerts()
+        elif self._alert_flush_timer is None:
+            self._alert_flush_timer = self._loop.call_later(NOTIFICATION_BATCH_SECONDS, self._flush_alerts)
+    
+    def _take_pending_alerts(self) -> List[Any]:
+        """Remove and return the pending alerts; runs on the processing loop"""
+        if self._alert_flush_timer is not None:
+            self._alert_flush_timer.cancel()
+            self._alert_flush_timer = None
+        
+        alerts, self._pending_alerts = self._pending_alerts, []
+        return alerts
+    
+    def _flush_alerts(self):
+        """Send the pending alerts as one batch from a worker thread"""
+        # Worker threads can't be started once the interpreter is exiting; the exit
+        # hook sends whatever is still pending itself
+        if self._exiting:
+            return
+        
+        alerts = self._take_pending_alerts()
+        if alerts:
+            self._spawn(asyncio.to_thread(self._deliver_alerts, alerts))
+    
+    def _deliver_alerts(self, alerts: List[Any]):
+        """Send a batch of alerts through every configured channel"""
+        try:
+            # Executors refuse new work once the interpreter is exiting
+            self._alert_manager.send_alerts(alerts, concurrent=not self._exiting)
+        except Exception as e:
+            logger.error(f"Failed to send {len(alerts)} error alerts: {e}")
+    
+    def _call_on_loop(self, func: Callable, *args):
+        """Run a function on the processing loop from another thread and return its result"""
+        async def call():
+            return func(*args)
+        return asyncio.run_coroutine_threadsafe(call(), self._loop).result(EXIT_FLUSH_SECONDS)
+    
+    def _flush_on_exit(self):
+        """Finish queued errors, send pending alerts and save patterns before the interpreter exits"""
+        self._exiting = True
+        try:
+            asyncio.run_coroutine_threadsafe(self.error_queue.join(), self._loop).result(EXIT_FLUSH_SECONDS)
+            
+            alerts = self._call_on_loop(self._take_pending_alerts)
+            if alerts:
+                self._deliver_alerts(alerts)
+            
+            data = self._call_on_loop(self._take_dirty_patterns)
+            if data is not None:
+                self._save_error_patterns(data)
+                
+        except Exception as e:
+            logger.error(f"Failed to flush pending errors at exit: {e}")
+    
     def _cleanup_old_records(self):
         """Clean up old error records"""
         try:
+            now = datetime.now()
             retention_days = self.config.get('error_retention_days', 30)
-            cutoff_date = datetime.now() - timedelta(days=retention_days)
-            
-            old_records = [
-                record_id for record_id, record in self.error_records.items()
-                if record.timestamp < cutoff_date
-            ]
-            
-            for record_id in old_records:
-                del self.error_records[record_id]
-            
-            if old_records:
-                logger.info(f"Cleaned up {len(old_records)} old error records")
+            max_records = self.config.get('max_error_records', 10000)
+            cutoff_date = now - timedelta(days=retention_days)
+            
+            # Evict from the front until the oldest record is in retention and under the cap
+            removed = 0
+            while self.error_records:
+                oldest = next(iter(self.error_records.values()))
+                if oldest.timestamp >= cutoff_date and len(self.error_records) <= max_records:
+                    break
+                self.error_records.popitem(last=False)
+                self._uncount_record(oldest)
+                removed += 1
+            
+            if removed:
+                logger.info(f"Cleaned up {removed} old error records")
                 
         except Exception as e:
             logger.error(f"Failed to cleanup old records: {e}")
     
+    def _uncount_record(self, error_record: ErrorRecord):
+        """Take a record leaving error_records out of the running totals"""
+        self._severity_counts[error_record.severity] -= 1
+        self._category_counts[error_record.category] -= 1
+    
     def handle_error(self, error: Exception, context: ErrorContext = None, 
                     severity: ErrorSeverity = None, category: ErrorCategory = None) -> str:
         """Handle an error and return error ID"""
@@ -413,7 +676,7 @@ class ErrorHandler:
                 category = self._determine_category(error)
             
             # Create error record
-            error_id = f"ERR_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{id(error)}"
+            error_id = f"{self._error_id_prefix}{next(self._error_ids):x}"
             
             error_record = ErrorRecord(
                 id=error_id,
@@ -422,14 +685,16 @@ class ErrorHandler:
                 category=category,
                 error_type=type(error).__name__,
                 message=str(error),
-                stack_trace=traceback.format_exc(),
+                # Formatted later on the processing loop, off the caller's thread
+                stack_trace='',
                 context=context or ErrorContext(),
                 tags=[],
-                metadata={}
+                metadata={},
+                exception=error
             )
             
             # Add to processing queue
-            self.error_queue.put(error_record)
+            self._loop.call_soon_threadsafe(self._enqueue, error_record)
             
             return error_id
             
@@ -439,136 +704,118 @@ class ErrorHandler:
     
     def _determine_severity(self, error: Exception) -> ErrorSeverity:
         """Determine error severity based on error type"""
-        error_type = type(error).__name__
-        
-        critical_errors = ['SystemExit', 'KeyboardInterrupt', 'MemoryError']
-        high_errors = ['ConnectionError', 'TimeoutError', 'PermissionError', 'FileNotFoundError']
-        medium_errors = ['ValueError', 'TypeError', 'KeyError', 'AttributeError']
-        
-        if error_type in critical_errors:
-            return ErrorSeverity.CRITICAL
-        elif error_type in high_errors:
-            return ErrorSeverity.HIGH
-        elif error_type in medium_errors:
-            return ErrorSeverity.MEDIUM
-        else:
-            return ErrorSeverity.LOW
+        # The most specific listed class wins, so e.g. ConnectionResetError is HIGH
+        for error_class in type(error).__mro__:
+            severity = SEVERITY_BY_ERROR_TYPE.get(error_class.__name__)
+            if severity is not None:
+                return severity
+        return ErrorSeverity.LOW
     
     def _determine_category(self, error: Exception) -> ErrorCategory:
         """Determine error category based on error type"""
-        error_type = type(error).__name__
-        error_message = str(error).lower()
-        
-        if 'connection' in error_message or 'network' in error_message:
-            return ErrorCategory.NETWORK
-        elif 'database' in error_message or 'sql' in error_message:
-            return ErrorCategory.DATABASE
-        elif 'auth' in error_message or 'login' in error_message:
-            return ErrorCategory.AUTHENTICATION
-        elif 'permission' in error_message or 'access' in error_message:
-            return ErrorCategory.AUTHORIZATION
-        elif 'config' in error_message or 'setting' in error_message:
-            return ErrorCategory.CONFIGURATION
-        elif 'data' in error_message or 'quality' in error_message:
-            return ErrorCategory.DATA_QUALITY
-        elif 'performance' in error_message or 'timeout' in error_message:
-            return ErrorCategory.PERFORMANCE
-        elif 'external' in error_message or 'api' in error_message:
-            return ErrorCategory.EXTERNAL_SERVICE
-        else:
+        # Each match's group number is its category's position in CATEGORY_KEYWORDS
+        group = min((match.lastindex for match in CATEGORY_PATTERN.finditer(str(error))), default=None)
+        if group is None:
             return ErrorCategory.SYSTEM
+        return CATEGORY_KEYWORDS[group - 1][0]
     
     def retry_on_error(self, max_retries: int = None, delay: float = None, 
                       backoff: bool = None, exceptions: tuple = None):
         """Decorator for retrying functions on error"""
+        # The retry schedule is fixed when the function is decorated, not on every call
+        retry_config = self.retry_configs.copy()
+        if max_retries is not None:
+            retry_config['max_retries'] = max_retries
+        if delay is not None:
+            retry_config['base_delay'] = delay
+        if backoff is not None:
+            retry_config['exponential_backoff'] = backoff
+        
+        retry_exceptions = exceptions or (Exception,)
+        delays = [
+            min(retry_config['base_delay'] * (2 ** attempt if retry_config['exponential_backoff'] else 1),
+                retry_config['max_delay'])
+            for attempt in range(retry_config['max_retries'])
+        ]
+        
         def decorator(func: Callable) -> Callable:
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    for attempt, delay_time in enumerate(delays):
+                        try:
+                            return await func(*args, **kwargs)
+                        except retry_exceptions as e:
+                            logger.warning(f"Attempt {attempt + 1} failed for {func.__name__}: {e}. Retrying in {delay_time}s...")
+                            await asyncio.sleep(delay_time)
+                    
+                    # Final attempt
+                    try:
+                        return await func(*args, **kwargs)
+                    except retry_exceptions as e:
+                        self._report_retries_exhausted(func, e, len(delays))
+                        raise
+                
+                return async_wrapper
+            
             @functools.wraps(func)
             def wrapper(*args, **kwargs):
-                retry_config = self.retry_configs.copy()
-                if max_retries is not None:
-                    retry_config['max_retries'] = max_retries
-                if delay is not None:
-                    retry_config['base_delay'] = delay
-                if backoff is not None:
-                    retry_config['exponential_backoff'] = backoff
-                
-                retry_exceptions = exceptions or (Exception,)
-                last_error = None
-                
-                for attempt in range(retry_config['max_retries'] + 1):
+                for attempt, delay_time in enumerate(delays):
                     try:
                         return func(*args, **kwargs)
                     except retry_exceptions as e:
-                        last_error = e
-                        
-                        if attempt == retry_config['max_retries']:
-                            # Final attempt failed
-                            context = ErrorContext(
-                                component=func.__module__,
-                                operation=func.__name__,
-                                metadata={'attempts': attempt + 1, 'max_retries': retry_config['max_retries']}
-                            )
-                            error_id = self.handle_error(e, context, ErrorSeverity.HIGH, ErrorCategory.SYSTEM)
-                            raise e
-                        
-                        # Calculate delay
-                        if retry_config['exponential_backoff']:
-                            delay_time = retry_config['base_delay'] * (2 ** attempt)
-                        else:
-                            delay_time = retry_config['base_delay']
-                        
-                        delay_time = min(delay_time, retry_config['max_delay'])
-                        
                         logger.warning(f"Attempt {attempt + 1} failed for {func.__name__}: {e}. Retrying in {delay_time}s...")
                         time.sleep(delay_time)
                 
-                # This should never be reached
-                raise last_error
+                # Final attempt
+                try:
+                    return func(*args, **kwargs)
+                except retry_exceptions as e:
+                    self._report_retries_exhausted(func, e, len(delays))
+                    raise
             
             return wrapper
         return decorator
     
+    def _report_retries_exhausted(self, func: Callable, error: Exception, retries: int):
+        """Record the error from a retried function's final failed attempt"""
+        context = ErrorContext(
+            component=func.__module__,
+            operation=func.__name__,
+            metadata={'attempts': retries + 1, 'max_retries': retries}
+        )
+        self.handle_error(error, context, ErrorSeverity.HIGH, ErrorCategory.SYSTEM)
+    
     def get_error_statistics(self) -> Dict[str, Any]:
         """Get error statistics"""
         try:
             now = datetime.now()
-            last_hour = now - timedelta(hours=1)
-            last_day = now - timedelta(days=1)
-            last_week = now - timedelta(weeks=1)
+            monotonic_now = time.monotonic()
             
-            # Filter errors by time period
-            recent_errors = [r for r in self.error_records.values() if r.timestamp > last_hour]
-            daily_errors = [r for r in self.error_records.values() if r.timestamp > last_day]
-            weekly_errors = [r for r in self.error_records.values() if r.timestamp > last_week]
+            # Only the processing loop writes the patterns; callers on other threads
+            # sort a snapshot of them so the loop never has to wait
+            patterns = list(self.error_patterns.items())
             
             # Calculate statistics
             stats = {
                 'timestamp': now.isoformat(),
                 'total_errors': len(self.error_records),
                 'recent_errors': {
-                    'last_hour': len(recent_errors),
-                    'last_day': len(daily_errors),
-                    'last_week': len(weekly_errors)
+                    window: counter.count(monotonic_now) for window, counter in self._statistics_windows.items()
+                },
+                'errors_by_severity': {
+                    severity.value: self._severity_counts[severity] for severity in ErrorSeverity
+                },
+                'errors_by_category': {
+                    category.value: self._category_counts[category] for category in ErrorCategory
                 },
-                'errors_by_severity': {},
-                'errors_by_category': {},
                 'top_error_patterns': [],
                 'error_trends': {}
             }
             
-            # Count by severity
-            for severity in ErrorSeverity:
-                count = len([r for r in self.error_records.values() if r.severity == severity])
-                stats['errors_by_severity'][severity.value] = count
-            
-            # Count by category
-            for category in ErrorCategory:
-                count = len([r for r in self.error_records.values() if r.category == category])
-                stats['errors_by_category'][category.value] = count
-            
             # Top error patterns
             sorted_patterns = sorted(
-                self.error_patterns.items(),
+                patterns,
                 key=lambda x: x[1]['count'],
                 reverse=True
             )
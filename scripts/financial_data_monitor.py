@@ -7,8 +7,9 @@ Monitors Bosch company stock data and integrates with ETL pipeline
 import os
 import sys
 import logging
+import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Callable, Tuple
 import json
 import pandas as pd
 import numpy as np
@@ -18,6 +19,10 @@ import seaborn as sns
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from numba import njit, prange
 
 # Configure logging
 logging.basicConfig(
@@ -30,6 +35,132 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Numba's on-disk cache records the importing module name, so only cache the
+# kernels under the name Airflow workers import (tests and the CLI compile in memory)
+_CACHE_KERNELS = __name__ == 'financial_data_monitor'
+
+@njit(cache=_CACHE_KERNELS, nogil=True)
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean over a full window (NaN until the window is complete)"""
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    total = 0.0
+    valid = 0
+    for i in range(n):
+        value = values[i]
+        if not np.isnan(value):
+            total += value
+            valid += 1
+        if i >= window:
+            dropped = values[i - window]
+            if not np.isnan(dropped):
+                total -= dropped
+                valid -= 1
+        if i >= window - 1 and valid == window:
+            out[i] = total / window
+    return out
+
+@njit(cache=_CACHE_KERNELS, nogil=True)
+def _rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling sample standard deviation over a full window"""
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    for i in range(window - 1, n):
+        total = 0.0
+        complete = True
+        for j in range(i - window + 1, i + 1):
+            if np.isnan(values[j]):
+                complete = False
+                break
+            total += values[j]
+        if not complete:
+            continue
+        mean = total / window
+        squares = 0.0
+        for j in range(i - window + 1, i + 1):
+            squares += (values[j] - mean) ** 2
+        out[i] = np.sqrt(squares / (window - 1))
+    return out
+
+@njit(cache=_CACHE_KERNELS, nogil=True)
+def _rsi(close: np.ndarray, period: int) -> np.ndarray:
+    """Relative Strength Index from rolling average gains and losses"""
+    n = close.shape[0]
+    gains = np.full(n, np.nan)
+    losses = np.full(n, np.nan)
+    for i in range(n):
+        if np.isnan(close[i]):
+            continue
+        gains[i] = 0.0
+        losses[i] = 0.0
+        if i > 0 and not np.isnan(close[i - 1]):
+            delta = close[i] - close[i - 1]
+            if delta > 0:
+                gains[i] = delta
+            elif delta < 0:
+                losses[i] = -delta
+    
+    avg_gain = _rolling_mean(gains, period)
+    avg_loss = _rolling_mean(losses, period)
+    out = np.full(n, np.nan)
+    for i in range(n):
+        if np.isnan(avg_gain[i]) or np.isnan(avg_loss[i]):
+            continue
+        if avg_loss[i] > 0:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain[i] / avg_loss[i])
+        elif avg_gain[i] > 0:
+            out[i] = 100.0
+    return out
+
+@njit(cache=_CACHE_KERNELS, nogil=True, parallel=True)
+def _rolling_mean_2d(values: np.ndarray, window: int) -> np.ndarray:
+    """Row-wise rolling mean of a (n_symbols, n_timesteps) matrix"""
+    out = np.empty_like(values)
+    for row in prange(values.shape[0]):
+        out[row] = _rolling_mean(values[row], window)
+    return out
+
+@njit(cache=_CACHE_KERNELS, nogil=True, parallel=True)
+def _rolling_std_2d(values: np.ndarray, window: int) -> np.ndarray:
+    """Row-wise rolling sample standard deviation of a (n_symbols, n_timesteps) matrix"""
+    out = np.empty_like(values)
+    for row in prange(values.shape[0]):
+        out[row] = _rolling_std(values[row], window)
+    return out
+
+@njit(cache=_CACHE_KERNELS, nogil=True, parallel=True)
+def _rsi_2d(close: np.ndarray, period: int) -> np.ndarray:
+    """Row-wise RSI of a (n_symbols, n_timesteps) matrix"""
+    out = np.empty_like(close)
+    for row in prange(close.shape[0]):
+        out[row] = _rsi(close[row], period)
+    return out
+
+def _stack_padded(series: List[np.ndarray]) -> np.ndarray:
+    """Right-align series into one NaN-padded (n_series, n_timesteps) matrix
+
+    The kernels treat leading NaNs as incomplete windows, so each row's
+    trailing values match what the 1-D kernels give for the unpadded series.
+    """
+    width = max((len(values) for values in series), default=0)
+    matrix = np.full((len(series), width), np.nan)
+    for row, values in enumerate(series):
+        if len(values):
+            matrix[row, width - len(values):] = values
+    return matrix
+
+def _warmup_kernels():
+    """Compile (or load from cache) the indicator kernels ahead of first use"""
+    sample = np.arange(64, dtype=np.float64)
+    _rolling_mean(sample, 5)
+    _rolling_std(sample, 5)
+    _rsi(sample, 14)
+    
+    matrix = _stack_padded([sample, sample[:32]])
+    _rolling_mean_2d(matrix, 5)
+    _rolling_std_2d(matrix, 5)
+    _rsi_2d(matrix, 14)
+
 class BoschStockMonitor:
     """Comprehensive Bosch stock monitoring system"""
     
@@ -57,13 +188,70 @@ class BoschStockMonitor:
             'rsi_overbought': 70,
             'rsi_oversold': 30
         }
+        
+        # On-disk cache for yfinance metadata and HTTP responses
+        self.cache_dir = os.getenv('YFINANCE_CACHE_DIR', os.path.expanduser('~/.cache/bosch_monitor'))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        yf.set_tz_cache_location(self.cache_dir)
+        
+        # Shared HTTP session and per-symbol caches for yfinance lookups
+        self.session = self._create_session()
+        self._tickers: Dict[str, yf.Ticker] = {}
+        self._company_info_cache: Dict[str, Dict[str, Any]] = {}
+    
+    @staticmethod
+    def warmup():
+        """Compile the indicator kernels and write them to the Numba cache"""
+        _warmup_kernels()
+        logger.info("Indicator kernels compiled")
+    
+    def _create_session(self):
+        """Create a pooled HTTP session shared by all yfinance calls"""
+        try:
+            # Recent yfinance releases require a curl_cffi session, which keeps
+            # connections (HTTP/2 where available) alive across requests
+            from curl_cffi import requests as curl_requests
+            return curl_requests.Session(impersonate="chrome")
+        except ImportError:
+            pass
+        
+        try:
+            # Cache unchanged responses on disk when requests-cache is installed
+            import requests_cache
+            session = requests_cache.CachedSession(
+                os.path.join(self.cache_dir, 'http_cache'),
+                backend='sqlite',
+                expire_after=3600,
+                allowable_methods=['GET']
+            )
+        except ImportError:
+            session = requests.Session()
+        
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retries)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
+    def _run_concurrently(self, *calls: Tuple[Callable, ...]) -> List[Any]:
+        """Run blocking (func, *args) calls concurrently on worker threads, in order"""
+        async def gather():
+            return await asyncio.gather(*(asyncio.to_thread(func, *args) for func, *args in calls))
+        
+        return asyncio.run(gather())
+    
+    def _get_ticker(self, symbol: str) -> yf.Ticker:
+        """Get a cached yfinance Ticker bound to the shared session"""
+        if symbol not in self._tickers:
+            self._tickers[symbol] = yf.Ticker(symbol, session=self.session)
+        return self._tickers[symbol]
     
     def get_stock_data(self, symbol: str, period: str = "1mo", interval: str = "1d") -> Optional[pd.DataFrame]:
         """Fetch stock data from yfinance"""
         try:
             logger.info(f"Fetching data for {symbol} - Period: {period}, Interval: {interval}")
             
-            ticker = yf.Ticker(symbol)
+            ticker = self._get_ticker(symbol)
             data = ticker.history(period=period, interval=interval)
             
             if data.empty:
@@ -81,10 +269,65 @@ class BoschStockMonitor:
             logger.error(f"Failed to fetch data for {symbol}: {e}")
             return None
     
+    def get_stock_data_batch(self, symbols: List[str], period: str = "1mo", interval: str = "1d") -> Dict[str, pd.DataFrame]:
+        """Fetch stock data for several symbols with a single threaded yfinance download"""
+        try:
+            logger.info(f"Fetching data for {len(symbols)} symbols - Period: {period}, Interval: {interval}")
+            
+            batch = yf.download(
+                symbols,
+                period=period,
+                interval=interval,
+                actions=True,
+                auto_adjust=True,
+                ignore_tz=False,
+                threads=True,
+                progress=False,
+                group_by='ticker',
+                session=self.session
+            )
+            
+            if batch is None or batch.empty:
+                logger.warning(f"No data returned for {', '.join(symbols)}")
+                return {}
+            
+            fetched_at = datetime.now()
+            frames = {}
+            for symbol in symbols:
+                if isinstance(batch.columns, pd.MultiIndex):
+                    if symbol not in batch.columns.get_level_values(0):
+                        logger.warning(f"No data returned for {symbol}")
+                        continue
+                    data = batch[symbol]
+                else:
+                    data = batch
+                
+                # Drop rows introduced by aligning the symbols on a shared index
+                data = data.dropna(how='all').copy()
+                if data.empty:
+                    logger.warning(f"No data returned for {symbol}")
+                    continue
+                
+                # Add metadata
+                data.columns.name = None
+                data['symbol'] = symbol
+                data['data_fetched_at'] = fetched_at
+                frames[symbol] = data
+            
+            logger.info(f"Successfully fetched data for {len(frames)} of {len(symbols)} symbols")
+            return frames
+            
+        except Exception as e:
+            logger.error(f"Failed to fetch batch data: {e}")
+            return {}
+    
     def get_company_info(self, symbol: str) -> Dict[str, Any]:
         """Get company information"""
+        if symbol in self._company_info_cache:
+            return self._company_info_cache[symbol]
+        
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = self._get_ticker(symbol)
             info = ticker.info
             
             # Extract relevant information
@@ -104,6 +347,7 @@ class BoschStockMonitor:
             }
             
             logger.info(f"Retrieved company info for {symbol}")
+            self._company_info_cache[symbol] = company_info
             return company_info
             
         except Exception as e:
@@ -112,49 +356,70 @@ class BoschStockMonitor:
     
     def calculate_technical_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         """Calculate technical indicators"""
+        return self.calculate_technical_indicators_batch({'_': data})['_']
+    
+    def calculate_technical_indicators_batch(self, symbol_data: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """Calculate technical indicators for several symbols in one vectorized pass"""
         try:
-            df = data.copy()
+            frames = {symbol: data.copy() for symbol, data in symbol_data.items()}
+            if not frames:
+                return {}
+            
+            # Stack closes/volumes into (n_symbols, n_timesteps) matrices
+            closes = _stack_padded([df['Close'].to_numpy(np.float64) for df in frames.values()])
+            volumes = _stack_padded([df['Volume'].to_numpy(np.float64) for df in frames.values()])
+            price_change = np.full_like(closes, np.nan)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                price_change[:, 1:] = closes[:, 1:] / closes[:, :-1] - 1
             
             # Moving averages
-            df['MA_5'] = df['Close'].rolling(window=5).mean()
-            df['MA_20'] = df['Close'].rolling(window=20).mean()
-            df['MA_50'] = df['Close'].rolling(window=50).mean()
+            ma_5 = _rolling_mean_2d(closes, 5)
+            ma_20 = _rolling_mean_2d(closes, 20)
+            ma_50 = _rolling_mean_2d(closes, 50)
             
             # RSI (Relative Strength Index)
-            delta = df['Close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            df['RSI'] = 100 - (100 / (1 + rs))
+            rsi = _rsi_2d(closes, 14)
             
-            # Bollinger Bands
-            df['BB_Middle'] = df['Close'].rolling(window=20).mean()
-            bb_std = df['Close'].rolling(window=20).std()
-            df['BB_Upper'] = df['BB_Middle'] + (bb_std * 2)
-            df['BB_Lower'] = df['BB_Middle'] - (bb_std * 2)
-            
-            # MACD
-            exp1 = df['Close'].ewm(span=12).mean()
-            exp2 = df['Close'].ewm(span=26).mean()
-            df['MACD'] = exp1 - exp2
-            df['MACD_Signal'] = df['MACD'].ewm(span=9).mean()
-            df['MACD_Histogram'] = df['MACD'] - df['MACD_Signal']
-            
-            # Volume indicators
-            df['Volume_MA'] = df['Volume'].rolling(window=20).mean()
-            df['Volume_Ratio'] = df['Volume'] / df['Volume_MA']
-            
-            # Price change indicators
-            df['Price_Change'] = df['Close'].pct_change()
-            df['Price_Change_5d'] = df['Close'].pct_change(periods=5)
-            df['Volatility'] = df['Price_Change'].rolling(window=20).std()
+            # Bollinger Bands, volume and volatility
+            bb_std = _rolling_std_2d(closes, 20)
+            volume_ma = _rolling_mean_2d(volumes, 20)
+            volatility = _rolling_std_2d(price_change, 20)
+            
+            for row, df in enumerate(frames.values()):
+                # Padding is on the left, so each symbol owns the last len(df) columns
+                tail = slice(closes.shape[1] - len(df), None)
+                
+                df['MA_5'] = ma_5[row, tail]
+                df['MA_20'] = ma_20[row, tail]
+                df['MA_50'] = ma_50[row, tail]
+                df['RSI'] = rsi[row, tail]
+                
+                df['BB_Middle'] = df['MA_20']
+                df['BB_Upper'] = df['BB_Middle'] + (bb_std[row, tail] * 2)
+                df['BB_Lower'] = df['BB_Middle'] - (bb_std[row, tail] * 2)
+                
+                # MACD
+                exp1 = df['Close'].ewm(span=12).mean()
+                exp2 = df['Close'].ewm(span=26).mean()
+                df['MACD'] = exp1 - exp2
+                df['MACD_Signal'] = df['MACD'].ewm(span=9).mean()
+                df['MACD_Histogram'] = df['MACD'] - df['MACD_Signal']
+                
+                # Volume indicators
+                df['Volume_MA'] = volume_ma[row, tail]
+                df['Volume_Ratio'] = df['Volume'] / df['Volume_MA']
+                
+                # Price change indicators
+                df['Price_Change'] = df['Close'].pct_change()
+                df['Price_Change_5d'] = df['Close'].pct_change(periods=5)
+                df['Volatility'] = volatility[row, tail]
             
             logger.info("Technical indicators calculated successfully")
-            return df
+            return frames
             
         except Exception as e:
             logger.error(f"Failed to calculate technical indicators: {e}")
-            return data
+            return dict(symbol_data)
     
     def detect_anomalies(self, data: pd.DataFrame) -> Dict[str, Any]:
         """Detect anomalies and alert conditions"""
@@ -450,59 +715,92 @@ class BoschStockMonitor:
                 'overall_summary': {}
             }
             
+            # Fetch all Bosch symbols in one batched download, with the
+            # company info requests in flight at the same time
+            symbols = list(self.bosch_symbols)
+            symbol_data = self._run_concurrently(
+                (self.get_stock_data_batch, symbols, "3mo"),
+                *((self.get_company_info, symbol) for symbol in symbols)
+            )[0]
+            
+            # Calculate indicators for all symbols in one pass
+            symbol_data = self.calculate_technical_indicators_batch(symbol_data)
+            
             # Analyze each Bosch symbol
-            for symbol, description in self.bosch_symbols.items():
-                logger.info(f"Analyzing {symbol} - {description}")
-                
-                # Get stock data
-                data = self.get_stock_data(symbol, period="3mo")
-                if data is None:
+            for symbol in self.bosch_symbols:
+                if symbol not in symbol_data:
                     logger.warning(f"Skipping {symbol} - no data available")
                     continue
                 
-                # Calculate technical indicators
-                data_with_indicators = self.calculate_technical_indicators(data)
-                
-                # Get company info
-                company_info = self.get_company_info(symbol)
-                
-                # Detect anomalies
-                anomalies = self.detect_anomalies(data_with_indicators)
-                
-                # Generate analysis report
-                analysis_report = self.generate_analysis_report(data_with_indicators, company_info, anomalies)
-                
-                # Create charts
-                chart_path = self.create_price_chart(data_with_indicators, symbol)
-                
-                # Save data
-                csv_path = self.save_data(data_with_indicators, symbol)
+                symbol_result = self.analyze_symbol(symbol, data=symbol_data[symbol], indicators_ready=True)
+                if symbol_result is None:
+                    continue
                 
                 # Store results
                 results['symbols_analyzed'].append(symbol)
-                results['analysis_results'][symbol] = {
-                    'description': description,
-                    'analysis_report': analysis_report,
-                    'chart_path': chart_path,
-                    'data_path': csv_path,
-                    'anomalies': anomalies
-                }
-            
-            # Generate overall summary
-            results['overall_summary'] = self._generate_overall_summary(results['analysis_results'])
-            
-            # Save complete results
-            results_path = os.path.join(self.data_dir, f"bosch_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-            with open(results_path, 'w') as f:
-                json.dump(results, f, indent=2, default=str)
+                results['analysis_results'][symbol] = symbol_result
             
-            logger.info(f"Complete analysis finished. Results saved to: {results_path}")
-            return results
+            return self.finalize_results(results)
             
         except Exception as e:
             logger.error(f"Failed to run complete analysis: {e}")
             return {'error': str(e), 'timestamp': datetime.now().isoformat()}
     
+    def analyze_symbol(self, symbol: str, period: str = "3mo", data: Optional[pd.DataFrame] = None,
+                       indicators_ready: bool = False) -> Optional[Dict[str, Any]]:
+        """Run the full analysis for a single symbol"""
+        description = self.bosch_symbols.get(symbol, symbol)
+        logger.info(f"Analyzing {symbol} - {description}")
+        
+        # Get stock data unless it was already fetched, with company info alongside
+        if data is None:
+            data, company_info = self._run_concurrently(
+                (self.get_stock_data, symbol, period),
+                (self.get_company_info, symbol)
+            )
+        else:
+            company_info = self.get_company_info(symbol)
+        if data is None:
+            logger.warning(f"Skipping {symbol} - no data available")
+            return None
+        
+        # Calculate technical indicators unless the batch pass already did
+        data_with_indicators = data if indicators_ready else self.calculate_technical_indicators(data)
+        
+        # Detect anomalies
+        anomalies = self.detect_anomalies(data_with_indicators)
+        
+        # Generate analysis report
+        analysis_report = self.generate_analysis_report(data_with_indicators, company_info, anomalies)
+        
+        # Create charts
+        chart_path = self.create_price_chart(data_with_indicators, symbol)
+        
+        # Save data
+        csv_path = self.save_data(data_with_indicators, symbol)
+        
+        return {
+            'description': description,
+            'analysis_report': analysis_report,
+            'chart_path': chart_path,
+            'data_path': csv_path,
+            'anomalies': anomalies
+        }
+    
+    def finalize_results(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Attach the overall summary and persist the combined results"""
+        # Generate overall summary
+        results['overall_summary'] = self._generate_overall_summary(results['analysis_results'])
+        
+        # Save complete results
+        results_path = os.path.join(self.data_dir, f"bosch_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(results_path, 'w') as f:
+            json.dump(results, f, indent=2, default=str)
+        
+        logger.info(f"Complete analysis finished. Results saved to: {results_path}")
+        results['results_path'] = os.path.abspath(results_path)
+        return results
+    
     def _generate_overall_summary(self, analysis_results: Dict[str, Any]) -> Dict[str, Any]:
         """Generate overall summary across all symbols"""
         try:
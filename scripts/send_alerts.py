@@ -11,6 +11,7 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
 
 import smtplib
 import requests
@@ -30,6 +31,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Slack rejects messages with more than 100 attachments
+SLACK_MAX_ATTACHMENTS = 100
+
 class AlertSeverity(Enum):
     """Alert severity levels"""
     LOW = "low"
@@ -82,6 +86,9 @@ class AlertManager:
                 email.strip() for email in self.default_recipients[severity] 
                 if email.strip()
             ]
+        
+        # Keep-alive session shared by all webhook and PagerDuty requests
+        self.session = requests.Session()
     
     def send_email_alert(self, alert: Alert) -> bool:
         """Send email alert"""
@@ -95,44 +102,92 @@ class AlertManager:
                 logger.warning(f"No recipients configured for severity {alert.severity.value}")
                 return False
             
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = self.smtp_username
-            msg['To'] = ', '.join(recipients)
-            msg['Subject'] = f"[{alert.severity.value.upper()}] {alert.title}"
+            subject = f"[{alert.severity.value.upper()}] {alert.title}"
             
-            # Create email body
-            body = f"""
-            Alert Type: {alert.type.value}
-            Severity: {alert.severity.value.upper()}
-            Timestamp: {alert.timestamp.isoformat()}
+            # Send email
+            server = self._connect_smtp()
+            self._send_email(server, recipients, subject, self._email_body(alert))
+            server.quit()
             
-            {alert.message}
+            logger.info(f"Email alert sent successfully to {len(recipients)} recipients")
+            return True
             
-            """
+        except Exception as e:
+            logger.error(f"Failed to send email alert: {e}")
+            return False
+    
+    def send_email_alerts(self, alerts: List[Alert]) -> bool:
+        """Send one digest email per recipient list over a single SMTP connection"""
+        try:
+            if not self.smtp_username or not self.smtp_password:
+                logger.warning("SMTP credentials not configured, skipping email alerts")
+                return False
             
-            if alert.metadata:
-                body += "\nMetadata:\n"
-                for key, value in alert.metadata.items():
-                    body += f"  {key}: {value}\n"
+            # Group alerts by their recipient list
+            alerts_by_recipients: Dict[tuple, List[Alert]] = {}
+            for alert in alerts:
+                recipients = alert.recipients or self.default_recipients.get(alert.severity, [])
+                if recipients:
+                    alerts_by_recipients.setdefault(tuple(recipients), []).append(alert)
             
-            msg.attach(MIMEText(body, 'plain'))
+            if not alerts_by_recipients:
+                logger.warning("No recipients configured for the alert severities")
+                return False
             
-            # Send email
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.smtp_username, self.smtp_password)
-            text = msg.as_string()
-            server.sendmail(self.smtp_username, recipients, text)
+            server = self._connect_smtp()
+            for recipients, group in alerts_by_recipients.items():
+                severity = max((alert.severity for alert in group), key=self._severity_rank)
+                subject = f"[{severity.value.upper()}] {len(group)} alerts: {group[0].title}"
+                body = "\n".join(self._email_body(alert) for alert in group)
+                self._send_email(server, list(recipients), subject, body)
             server.quit()
             
-            logger.info(f"Email alert sent successfully to {len(recipients)} recipients")
+            logger.info(f"Email digest sent for {len(alerts)} alerts to {len(alerts_by_recipients)} recipient groups")
             return True
             
         except Exception as e:
-            logger.error(f"Failed to send email alert: {e}")
+            logger.error(f"Failed to send email alerts: {e}")
             return False
     
+    def _connect_smtp(self) -> smtplib.SMTP:
+        """Open an authenticated SMTP connection"""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        server.starttls()
+        server.login(self.smtp_username, self.smtp_password)
+        return server
+    
+    def _send_email(self, server: smtplib.SMTP, recipients: List[str], subject: str, body: str):
+        """Send one plain-text email over an open SMTP connection"""
+        msg = MIMEMultipart()
+        msg['From'] = self.smtp_username
+        msg['To'] = ', '.join(recipients)
+        msg['Subject'] = subject
+        msg.attach(MIMEText(body, 'plain'))
+        server.sendmail(self.smtp_username, recipients, msg.as_string())
+    
+    def _email_body(self, alert: Alert) -> str:
+        """Create the email body for an alert"""
+        body = f"""
+            Alert Type: {alert.type.value}
+            Severity: {alert.severity.value.upper()}
+            Timestamp: {alert.timestamp.isoformat()}
+            
+            {alert.message}
+            
+            """
+        
+        if alert.metadata:
+            body += "\nMetadata:\n"
+            for key, value in alert.metadata.items():
+                body += f"  {key}: {value}\n"
+        
+        return body
+    
+    @staticmethod
+    def _severity_rank(severity: AlertSeverity) -> int:
+        """Order severities from LOW to CRITICAL"""
+        return list(AlertSeverity).index(severity)
+    
     def send_slack_alert(self, alert: Alert) -> bool:
         """Send Slack alert"""
         try:
@@ -140,52 +195,9 @@ class AlertManager:
                 logger.warning("Slack webhook URL not configured, skipping Slack alert")
                 return False
             
-            # Determine color based on severity
-            color_map = {
-                AlertSeverity.LOW: "#36a64f",      # Green
-                AlertSeverity.MEDIUM: "#ffaa00",    # Yellow
-                AlertSeverity.HIGH: "#ff6600",      # Orange
-                AlertSeverity.CRITICAL: "#ff0000"   # Red
-            }
-            
-            payload = {
-                "attachments": [
-                    {
-                        "color": color_map.get(alert.severity, "#36a64f"),
-                        "title": alert.title,
-                        "text": alert.message,
-                        "fields": [
-                            {
-                                "title": "Type",
-                                "value": alert.type.value,
-                                "short": True
-                            },
-                            {
-                                "title": "Severity",
-                                "value": alert.severity.value.upper(),
-                                "short": True
-                            },
-                            {
-                                "title": "Timestamp",
-                                "value": alert.timestamp.strftime("%Y-%m-%d %H:%M:%S UTC"),
-                                "short": True
-                            }
-                        ],
-                        "footer": "ETL Pipeline Monitoring",
-                        "ts": int(alert.timestamp.timestamp())
-                    }
-                ]
-            }
-            
-            if alert.metadata:
-                for key, value in alert.metadata.items():
-                    payload["attachments"][0]["fields"].append({
-                        "title": key.replace('_', ' ').title(),
-                        "value": str(value),
-                        "short": True
-                    })
+            payload = {"attachments": [self._slack_attachment(alert)]}
             
-            response = requests.post(self.slack_webhook_url, json=payload, timeout=10)
+            response = self.session.post(self.slack_webhook_url, json=payload, timeout=10)
             response.raise_for_status()
             
             logger.info("Slack alert sent successfully")
@@ -195,6 +207,71 @@ class AlertManager:
             logger.error(f"Failed to send Slack alert: {e}")
             return False
     
+    def send_slack_alerts(self, alerts: List[Alert]) -> bool:
+        """Send alerts as attachments of as few Slack messages as possible"""
+        try:
+            if not self.slack_webhook_url:
+                logger.warning("Slack webhook URL not configured, skipping Slack alerts")
+                return False
+            
+            attachments = [self._slack_attachment(alert) for alert in alerts]
+            for start in range(0, len(attachments), SLACK_MAX_ATTACHMENTS):
+                payload = {"attachments": attachments[start:start + SLACK_MAX_ATTACHMENTS]}
+                response = self.session.post(self.slack_webhook_url, json=payload, timeout=10)
+                response.raise_for_status()
+            
+            logger.info(f"Slack message sent for {len(alerts)} alerts")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to send Slack alerts: {e}")
+            return False
+    
+    def _slack_attachment(self, alert: Alert) -> Dict[str, Any]:
+        """Create the Slack attachment for an alert"""
+        # Determine color based on severity
+        color_map = {
+            AlertSeverity.LOW: "#36a64f",      # Green
+            AlertSeverity.MEDIUM: "#ffaa00",    # Yellow
+            AlertSeverity.HIGH: "#ff6600",      # Orange
+            AlertSeverity.CRITICAL: "#ff0000"   # Red
+        }
+        
+        attachment = {
+            "color": color_map.get(alert.severity, "#36a64f"),
+            "title": alert.title,
+            "text": alert.message,
+            "fields": [
+                {
+                    "title": "Type",
+                    "value": alert.type.value,
+                    "short": True
+                },
+                {
+                    "title": "Severity",
+                    "value": alert.severity.value.upper(),
+                    "short": True
+                },
+                {
+                    "title": "Timestamp",
+                    "value": alert.timestamp.strftime("%Y-%m-%d %H:%M:%S UTC"),
+                    "short": True
+                }
+            ],
+            "footer": "ETL Pipeline Monitoring",
+            "ts": int(alert.timestamp.timestamp())
+        }
+        
+        if alert.metadata:
+            for key, value in alert.metadata.items():
+                attachment["fields"].append({
+                    "title": key.replace('_', ' ').title(),
+                    "value": str(value),
+                    "short": True
+                })
+        
+        return attachment
+    
     def send_teams_alert(self, alert: Alert) -> bool:
         """Send Microsoft Teams alert"""
         try:
@@ -202,51 +279,79 @@ class AlertManager:
                 logger.warning("Teams webhook URL not configured, skipping Teams alert")
                 return False
             
-            # Determine color based on severity
-            color_map = {
-                AlertSeverity.LOW: "00ff00",        # Green
-                AlertSeverity.MEDIUM: "ffaa00",     # Yellow
-                AlertSeverity.HIGH: "ff6600",       # Orange
-                AlertSeverity.CRITICAL: "ff0000"    # Red
-            }
+            payload = self._teams_card(alert.title, [alert])
             
-            payload = {
-                "@type": "MessageCard",
-                "@context": "http://schema.org/extensions",
-                "themeColor": color_map.get(alert.severity, "00ff00"),
-                "summary": alert.title,
-                "sections": [
+            response = self.session.post(self.teams_webhook_url, json=payload, timeout=10)
+            response.raise_for_status()
+            
+            logger.info("Teams alert sent successfully")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to send Teams alert: {e}")
+            return False
+    
+    def send_teams_alerts(self, alerts: List[Alert]) -> bool:
+        """Send alerts as sections of a single Teams message card"""
+        try:
+            if not self.teams_webhook_url:
+                logger.warning("Teams webhook URL not configured, skipping Teams alerts")
+                return False
+            
+            payload = self._teams_card(f"{len(alerts)} ETL pipeline alerts", alerts)
+            
+            response = self.session.post(self.teams_webhook_url, json=payload, timeout=10)
+            response.raise_for_status()
+            
+            logger.info(f"Teams message sent for {len(alerts)} alerts")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to send Teams alerts: {e}")
+            return False
+    
+    def _teams_card(self, summary: str, alerts: List[Alert]) -> Dict[str, Any]:
+        """Create a Teams message card with one section per alert"""
+        # Determine color based on the highest severity
+        color_map = {
+            AlertSeverity.LOW: "00ff00",        # Green
+            AlertSeverity.MEDIUM: "ffaa00",     # Yellow
+            AlertSeverity.HIGH: "ff6600",       # Orange
+            AlertSeverity.CRITICAL: "ff0000"    # Red
+        }
+        severity = max((alert.severity for alert in alerts), key=self._severity_rank)
+        
+        sections = []
+        for alert in alerts:
+            section = {
+                "activityTitle": alert.title,
+                "activitySubtitle": f"Type: {alert.type.value} | Severity: {alert.severity.value.upper()}",
+                "activityImage": "https://img.icons8.com/color/48/000000/warning-shield.png",
+                "text": alert.message,
+                "facts": [
                     {
-                        "activityTitle": alert.title,
-                        "activitySubtitle": f"Type: {alert.type.value} | Severity: {alert.severity.value.upper()}",
-                        "activityImage": "https://img.icons8.com/color/48/000000/warning-shield.png",
-                        "text": alert.message,
-                        "facts": [
-                            {
-                                "name": "Timestamp",
-                                "value": alert.timestamp.strftime("%Y-%m-%d %H:%M:%S UTC")
-                            }
-                        ]
+                        "name": "Timestamp",
+                        "value": alert.timestamp.strftime("%Y-%m-%d %H:%M:%S UTC")
                     }
                 ]
             }
             
             if alert.metadata:
                 for key, value in alert.metadata.items():
-                    payload["sections"][0]["facts"].append({
+                    section["facts"].append({
                         "name": key.replace('_', ' ').title(),
                         "value": str(value)
                     })
             
-            response = requests.post(self.teams_webhook_url, json=payload, timeout=10)
-            response.raise_for_status()
-            
-            logger.info("Teams alert sent successfully")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to send Teams alert: {e}")
-            return False
+            sections.append(section)
+        
+        return {
+            "@type": "MessageCard",
+            "@context": "http://schema.org/extensions",
+            "themeColor": color_map.get(severity, "00ff00"),
+            "summary": summary,
+            "sections": sections
+        }
     
     def send_pagerduty_alert(self, alert: Alert) -> bool:
         """Send PagerDuty alert for critical issues"""
@@ -271,12 +376,12 @@ class AlertManager:
                         "message": alert.message,
                         "type": alert.type.value,
                         "timestamp": alert.timestamp.isoformat(),
-                        **alert.metadata or {}
+                        **(alert.metadata or {})
                     }
                 }
             }
             
-            response = requests.post(
+            response = self.session.post(
                 "https://events.pagerduty.com/v2/enqueue",
                 json=payload,
                 headers={"Content-Type": "application/json"},
@@ -309,6 +414,46 @@ class AlertManager:
         
         return results
     
+    def send_alerts(self, alerts: List[Alert], concurrent: bool = True) -> List[Dict[str, bool]]:
+        """Send several alerts with one message per channel
+
+        Email, Slack and Teams each receive a single grouped notification;
+        PagerDuty events are sent one per alert, concurrently unless
+        concurrent is False (no new threads can be started while the
+        interpreter is exiting). Returns the per-channel results for each
+        alert, in the same format as send_alert.
+        """
+        if not alerts:
+            return []
+        
+        channel_results = {
+            'email': self.send_email_alerts(alerts),
+            'slack': self.send_slack_alerts(alerts),
+            'teams': self.send_teams_alerts(alerts)
+        }
+        
+        if concurrent:
+            with ThreadPoolExecutor(max_workers=min(len(alerts), 8)) as executor:
+                pagerduty_results = list(executor.map(self.send_pagerduty_alert, alerts))
+        else:
+            pagerduty_results = [self.send_pagerduty_alert(alert) for alert in alerts]
+        
+        results = [
+            {**channel_results, 'pagerduty': pagerduty_result}
+            for pagerduty_result in pagerduty_results
+        ]
+        
+        # Log overall result
+        successful_channels = [channel for channel, success in channel_results.items() if success]
+        if any(pagerduty_results):
+            successful_channels.append('pagerduty')
+        if successful_channels:
+            logger.info(f"{len(alerts)} alerts sent successfully via: {', '.join(successful_channels)}")
+        else:
+            logger.error(f"Failed to send {len(alerts)} alerts through any channel")
+        
+        return results
+    
     def create_data_quality_alert(self, check_results: Dict[str, Any]) -> Alert:
         """Create data quality alert from check results"""
         failed_checks = []
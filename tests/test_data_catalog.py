@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for the Data Catalog Manager
+Tests opening catalogs created by earlier versions of the schema
+"""
+
+import os
+import sys
+import sqlite3
+import pytest
+from datetime import datetime
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.data_catalog_manager import DataCatalogManager, DataAccess
+
+# Catalog schema before metrics were keyed by (asset_id, metric_name) and timestamps
+# stored as epoch microseconds; foreign keys were declared but never enforced
+LEGACY_SCHEMA = '''
+    CREATE TABLE data_assets (
+        id TEXT PRIMARY KEY, name TEXT NOT NULL, description TEXT, schema_name TEXT,
+        table_name TEXT, classification TEXT, owner TEXT, steward TEXT, created_at TEXT,
+        updated_at TEXT, last_accessed TEXT, quality_level TEXT, quality_score REAL,
+        columns TEXT, tags TEXT, business_glossary TEXT, usage_statistics TEXT,
+        lineage TEXT, compliance_info TEXT, metadata TEXT
+    );
+    CREATE TABLE data_users (
+        id TEXT PRIMARY KEY, name TEXT NOT NULL, email TEXT UNIQUE, role TEXT, department TEXT,
+        access_level TEXT, created_at TEXT, last_login TEXT, permissions TEXT, metadata TEXT
+    );
+    CREATE TABLE data_access (
+        id TEXT PRIMARY KEY, user_id TEXT, asset_id TEXT, access_type TEXT, granted_at TEXT,
+        expires_at TEXT, granted_by TEXT, purpose TEXT, metadata TEXT,
+        FOREIGN KEY (user_id) REFERENCES data_users (id),
+        FOREIGN KEY (asset_id) REFERENCES data_assets (id)
+    );
+    CREATE TABLE data_quality_metrics (
+        id TEXT PRIMARY KEY, asset_id TEXT, metric_name TEXT, metric_value REAL, threshold REAL,
+        status TEXT, measured_at TEXT, metadata TEXT,
+        FOREIGN KEY (asset_id) REFERENCES data_assets (id)
+    );
+    INSERT INTO data_assets VALUES (
+        'a1', 'Orders', 'Orders fact', 'marts', 'fct_orders', 'internal', 'data_team', 'steward',
+        '2024-05-01T12:00:00', '2024-05-01T12:00:00', '2024-05-01T12:00:00', 'good', 0.9,
+        '[]', '["orders"]', '{}', '{}', '{}', '{}', '{}'
+    );
+    INSERT INTO data_users VALUES (
+        'u1', 'Analyst', 'analyst@example.com', 'analyst', 'finance', 'read',
+        '2024-05-01T12:00:00', '2024-05-01T12:00:00', '["read"]', '{}'
+    );
+    INSERT INTO data_access VALUES
+        ('g1', 'u1', 'a1', 'read', '2024-05-01T12:00:00', NULL, 'admin', 'reporting', '{}'),
+        ('g2', 'deleted_user', 'a1', 'read', '2024-05-01T12:00:00', NULL, 'admin', 'reporting', '{}');
+    INSERT INTO data_quality_metrics VALUES
+        ('a1_completeness_1', 'a1', 'completeness', 0.9, 0.8, 'pass', '2024-05-01T12:00:00', '{}'),
+        ('a1_completeness_2', 'a1', 'completeness', 0.95, 0.8, 'pass', '2024-05-02T12:00:00', '{}'),
+        ('gone_completeness_1', 'deleted_asset', 'completeness', 0.5, 0.8, 'fail', '2024-05-01T12:00:00', '{}');
+'''
+
+class TestCatalogMigration:
+    """Test opening a catalog written with the legacy schema"""
+    
+    @pytest.fixture(autouse=True)
+    def setup_legacy_catalog(self, tmp_path):
+        """Create a legacy catalog database holding orphaned rows"""
+        self.catalog_db_path = str(tmp_path / 'catalog.db')
+        conn = sqlite3.connect(self.catalog_db_path)
+        conn.executescript(LEGACY_SCHEMA)
+        conn.close()
+        
+        self.catalog = DataCatalogManager(self.catalog_db_path)
+        yield
+        self.catalog.close()
+    
+    def _metrics(self, catalog: DataCatalogManager):
+        """Stored metrics as (asset_id, metric_name, metric_value) rows"""
+        return catalog._conn.execute(
+            'SELECT asset_id, metric_name, metric_value FROM data_quality_metrics ORDER BY asset_id, metric_name'
+        ).fetchall()
+    
+    def test_metrics_rekeyed_without_orphans(self):
+        """Test that legacy metrics keep the latest value per metric and drop unknown assets"""
+        columns = [row[1] for row in self.catalog._conn.execute("PRAGMA table_info('data_quality_metrics')")]
+        assert 'id' not in columns
+        
+        assert self._metrics(self.catalog) == [('a1', 'completeness', 0.95)]
+        assert not self.catalog._conn.execute("PRAGMA foreign_key_check('data_quality_metrics')").fetchall()
+        
+        # Reopening an already migrated catalog leaves it as it is
+        self.catalog.close()
+        self.catalog = DataCatalogManager(self.catalog_db_path)
+        assert self._metrics(self.catalog) == [('a1', 'completeness', 0.95)]
+    
+    def test_legacy_timestamps_read_back(self):
+        """Test that ISO timestamps written by the legacy schema load as datetimes"""
+        asset = self.catalog.get_data_asset('a1')
+        assert asset.created_at == datetime(2024, 5, 1, 12)
+        assert asset.last_accessed == datetime(2024, 5, 1, 12)
+        assert asset.tags == ['orders']
+    
+    def test_writes_enforce_foreign_keys_after_migration(self):
+        """Test that the migrated catalog accepts valid writes and rejects orphaned ones"""
+        assert self.catalog.update_quality_metrics('a1', {'accuracy': {'value': 0.8}})
+        assert self._metrics(self.catalog) == [('a1', 'accuracy', 0.8)]
+        assert self.catalog.get_data_asset('a1').quality_score == 0.8
+        
+        now = datetime.now()
+        assert self.catalog.grant_data_access(DataAccess(
+            id='g3', user_id='u1', asset_id='a1', access_type='write', granted_at=now,
+            expires_at=None, granted_by='admin', purpose='backfill', metadata={}
+        ))
+        assert not self.catalog.grant_data_access(DataAccess(
+            id='g4', user_id='deleted_user', asset_id='a1', access_type='write', granted_at=now,
+            expires_at=None, granted_by='admin', purpose='backfill', metadata={}
+        ))
+        
+        report = self.catalog.generate_catalog_report()
+        assert report['summary']['total_access_records'] == 3
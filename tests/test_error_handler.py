@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Tests for the Error Handling System
+Tests asynchronous error processing, batched alerts and the exit flush
+"""
+
+import os
+import sys
+import json
+import textwrap
+import asyncio
+import threading
+import subprocess
+import pytest
+
+# Add project root to path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+# Raises one HIGH error and exits while its alert is still waiting for the batch timer.
+# PagerDuty requests are recorded instead of sent, and printed once everything has exited
+EXIT_SCRIPT = textwrap.dedent('''
+    import atexit, time, requests
+    
+    POSTS = []
+    
+    class Response:
+        def raise_for_status(self):
+            pass
+    
+    def record_post(session, url, **kwargs):
+        POSTS.append(url)
+        return Response()
+    
+    requests.Session.post = record_post
+    atexit.register(lambda: print("POSTS=" + str(len(POSTS))))
+    
+    import error_handler
+    
+    try:
+        raise ConnectionError("warehouse unreachable")
+    except ConnectionError as e:
+        error_handler.handle_error(e, severity=error_handler.ErrorSeverity.HIGH)
+    time.sleep(0.5)
+''')
+
+@pytest.fixture(scope='module')
+def error_handler_module(tmp_path_factory):
+    """Import the error handler and send_alerts from a scratch directory, where they open their log files"""
+    workdir = tmp_path_factory.mktemp('error_handler')
+    (workdir / 'logs').mkdir()
+    sys.path.append(os.path.join(PROJECT_ROOT, 'scripts'))
+    
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        import error_handler
+        import send_alerts
+    finally:
+        os.chdir(cwd)
+    return error_handler
+
+class RecordingAlertManager:
+    """Alert manager that records each batch instead of sending it"""
+    
+    def __init__(self):
+        self.batches = []
+    
+    def send_alerts(self, alerts, concurrent=True):
+        self.batches.append((list(alerts), concurrent))
+        return [{} for _ in alerts]
+
+class TestErrorProcessing:
+    """Test the asyncio error queue and its processing loop"""
+    
+    @pytest.fixture(autouse=True)
+    def setup_error_handler(self, error_handler_module, tmp_path, monkeypatch):
+        """Run a fresh handler in a scratch directory, recording its alerts"""
+        monkeypatch.chdir(tmp_path)
+        self.module = error_handler_module
+        self.handler = error_handler_module.ErrorHandler(str(tmp_path / 'config' / 'error_handling.yml'))
+        self.alert_manager = RecordingAlertManager()
+        self.handler._alert_manager = self.alert_manager
+        yield
+        # Finish the handler's work here rather than in the exit hook, after the scratch directory is gone
+        self.handler._flush_on_exit()
+    
+    def _drain(self):
+        """Wait until the processing loop has handled every queued error"""
+        asyncio.run_coroutine_threadsafe(self.handler.error_queue.join(), self.handler._loop).result(10)
+    
+    def _raise_errors(self, count: int, severity=None):
+        """Report count ValueErrors through the handler"""
+        for i in range(count):
+            try:
+                raise ValueError(f"bad record {i}")
+            except ValueError as e:
+                self.handler.handle_error(e, severity=severity)
+    
+    def test_errors_from_many_threads_are_all_processed(self):
+        """Test that errors reported concurrently are all drained from the queue"""
+        threads = [threading.Thread(target=self._raise_errors, args=(50,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self._drain()
+        
+        assert len(self.handler.error_records) == 200
+        assert all(record.stack_trace for record in self.handler.error_records.values())
+        
+        stats = self.handler.get_error_statistics()
+        assert stats['total_errors'] == 200
+        assert stats['recent_errors']['last_hour'] == 200
+        assert sum(stats['errors_by_severity'].values()) == 200
+        assert stats['top_error_patterns'][0]['count'] == 200
+    
+    def test_exit_flush_delivers_alerts_and_saves_patterns(self):
+        """Test that the exit hook drains the queue, sends batched alerts and saves patterns"""
+        self._raise_errors(3, severity=self.module.ErrorSeverity.HIGH)
+        self.handler._flush_on_exit()
+        
+        assert len(self.handler.error_records) == 3
+        
+        # One batch, sent without starting new threads
+        assert len(self.alert_manager.batches) == 1
+        alerts, concurrent = self.alert_manager.batches[0]
+        assert len(alerts) == 3
+        assert concurrent is False
+        
+        with open(os.path.join('data', 'error_patterns.json')) as f:
+            assert json.load(f)['system_ValueError']['count'] == 3
+    
+    def test_threshold_alert_raised_once_threshold_is_reached(self):
+        """Test that every high error at or past the hourly threshold raises a threshold alert"""
+        self.handler.alert_thresholds = {'high_errors_per_hour': 3}
+        self._raise_errors(2, severity=self.module.ErrorSeverity.HIGH)
+        self._raise_errors(5, severity=self.module.ErrorSeverity.MEDIUM)
+        self._drain()
+        assert not self._threshold_alerts()
+        
+        self._raise_errors(2, severity=self.module.ErrorSeverity.HIGH)
+        self._drain()
+        
+        threshold_alerts = self._threshold_alerts()
+        assert [alert.metadata['count'] for alert in threshold_alerts] == [3, 4]
+        assert all(alert.metadata['severity'] == 'high' for alert in threshold_alerts)
+    
+    def _threshold_alerts(self):
+        """Threshold alerts waiting in the current notification batch"""
+        pending = self.handler._call_on_loop(list, self.handler._pending_alerts)
+        return [alert for alert in pending if alert.metadata.get('alert_type') == 'threshold_exceeded']
+
+class TestWindowCounter:
+    """Test the trailing-window counters behind thresholds and statistics"""
+    
+    def test_events_expire_after_the_window(self, error_handler_module):
+        """Test that counts drop events once their minute leaves the window"""
+        counter = error_handler_module.WindowCounter(3600)
+        for now in (0, 30, 59, 120):
+            counter.add(now)
+        
+        assert counter.count(120) == 4
+        assert counter.count(3600 + 60) == 1
+        assert counter.count(3600 + 120) == 1
+        assert counter.count(3600 + 180) == 0
+        
+        counter.add(3600 + 180)
+        assert counter.count(3600 + 180) == 1
+    
+    def test_concurrent_adds_are_all_counted(self, error_handler_module):
+        """Test that adds from several threads are not lost"""
+        counter = error_handler_module.WindowCounter(3600)
+        
+        def add_events():
+            for _ in range(1000):
+                counter.add(0)
+        
+        threads = [threading.Thread(target=add_events) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert counter.count(0) == 4000
+
+class TestErrorHandlerExit:
+    """Test that pending work is finished when the interpreter exits"""
+    
+    def test_pending_alert_sent_to_pagerduty_at_exit(self, tmp_path):
+        """Test that an alert still batched at exit reaches PagerDuty"""
+        (tmp_path / 'logs').mkdir()
+        env = dict(os.environ, PYTHONPATH=os.path.join(PROJECT_ROOT, 'scripts'),
+                   PAGERDUTY_INTEGRATION_KEY='test-key')
+        
+        result = subprocess.run(
+            [sys.executable, '-c', EXIT_SCRIPT], cwd=tmp_path, env=env,
+            capture_output=True, text=True, timeout=60
+        )
+        
+        assert result.returncode == 0, result.stderr
+        assert "POSTS=1" in result.stdout
+        assert "Failed to send" not in result.stdout
+        
+        # Patterns changed by the error are saved by the same exit hook
+        with open(tmp_path / 'data' / 'error_patterns.json') as f:
+            assert json.load(f)
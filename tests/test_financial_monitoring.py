@@ -16,7 +16,7 @@ import numpy as np
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from scripts.financial_data_monitor import BoschStockMonitor
+from scripts.financial_data_monitor import BoschStockMonitor, _rolling_mean, _rolling_std, _rsi
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -149,6 +149,41 @@ class TestFinancialDataMonitor:
         
         logger.info("Technical indicators calculated successfully")
     
+    def test_indicator_kernels_match_pandas(self):
+        """Test that the compiled indicator kernels match the pandas reference"""
+        close = pd.Series(np.random.uniform(1000, 1100, 60))
+        close[10:13] = 1050.0  # Flat stretch with zero price change
+        values = close.to_numpy(np.float64)
+        
+        np.testing.assert_allclose(_rolling_mean(values, 20), close.rolling(window=20).mean(), equal_nan=True)
+        np.testing.assert_allclose(_rolling_std(values, 20), close.rolling(window=20).std(), equal_nan=True)
+        
+        delta = close.diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+        expected_rsi = 100 - (100 / (1 + gain / loss))
+        np.testing.assert_allclose(_rsi(values, 14), expected_rsi, equal_nan=True)
+        
+        logger.info("Indicator kernels match pandas reference")
+    
+    def test_batch_indicators_match_single_symbol(self):
+        """Test that the batched indicator pass matches per-symbol calculation"""
+        symbol_data = {}
+        for symbol, periods in (('BOSCHLTD.BSE', 60), ('BOSCHLTD.NSE', 35)):
+            dates = pd.date_range(start='2024-01-01', periods=periods, freq='D')
+            symbol_data[symbol] = pd.DataFrame({
+                'Close': np.random.uniform(1000, 1100, periods),
+                'Volume': np.random.randint(100000, 200000, periods).astype(float)
+            }, index=dates)
+        
+        batch = self.monitor.calculate_technical_indicators_batch(symbol_data)
+        
+        for symbol, data in symbol_data.items():
+            pd.testing.assert_frame_equal(batch[symbol], self.monitor.calculate_technical_indicators(data))
+            assert len(batch[symbol]) == len(data)
+        
+        logger.info("Batched indicators match per-symbol calculation")
+    
     def test_anomaly_detection(self):
         """Test anomaly detection functionality"""
         # Create sample data with known anomalies
@@ -329,6 +329,23 @@ class TestDataQualityIntegration:
         finally:
             monitor.close_connections()
     
+    def test_empty_table_freshness_reports_error(self):
+        """Test that an empty table yields an ERROR result instead of aborting the checks"""
+        # Batched metrics are evaluated without touching Snowflake or Great Expectations
+        monitor = DataQualityMonitor.__new__(DataQualityMonitor)
+        table_metrics = {
+            'stg_tpch_orders': (None, None, 0),
+            'fct_orders': (datetime.now(), 3, 5000)
+        }
+        
+        freshness_results = monitor.check_data_freshness(table_metrics)
+        assert freshness_results['stg_tpch_orders']['status'] == 'ERROR'
+        assert freshness_results['fct_orders']['status'] == 'PASS'
+        
+        volume_results = monitor.check_data_volume(table_metrics)
+        assert volume_results['stg_tpch_orders']['status'] == 'FAIL'
+        assert volume_results['fct_orders']['status'] == 'PASS'
+    
     def test_data_quality_thresholds(self):
         """Test that data quality meets defined thresholds"""
         monitor = DataQualityMonitor()